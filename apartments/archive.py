@@ -0,0 +1,142 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from apartments.models import Address, Apartment, ArchivedApartment
+from images.models import ApartmentImage
+from visits.models import Visit
+
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 500
+# Derived from the archived columns, rebuilt if an apartment is ever restored.
+ARCHIVE_EXCLUDED_FIELDS = ("search_vector",)
+
+
+def archive_unavailable_apartments(
+    older_than: timedelta = timedelta(days=ARCHIVE_AFTER_DAYS),
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> int:
+    """
+    Move apartments unavailable for longer than ``older_than`` to the archive.
+
+    Each batch copies the apartments with their address, image metadata and
+    visits into ArchivedApartment and deletes the live rows in one
+    transaction. An apartment counts as unavailable since its last update.
+    """
+    cutoff = timezone.now() - older_than
+    archived = 0
+    while True:
+        with transaction.atomic():
+            apartment_ids = list(
+                Apartment.objects.select_for_update(
+                    skip_locked=connection.features.has_select_for_update_skip_locked
+                )
+                .filter(is_available=False, updated_at__lt=cutoff)
+                .order_by("updated_at", "id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not apartment_ids:
+                return archived
+            _archive_apartments(apartment_ids)
+        archived += len(apartment_ids)
+
+
+def get_archived_apartment(apartment_id) -> Apartment | None:
+    """
+    Rebuild an archived apartment as an unsaved Apartment, with its address
+    and images loaded like ``get_apartment_details`` loads them.
+    """
+    archived = ArchivedApartment.objects.filter(id=apartment_id).first()
+    if archived is None:
+        return None
+    return _restore_apartment(archived)
+
+
+async def aget_archived_apartment(apartment_id) -> Apartment | None:
+    archived = await ArchivedApartment.objects.filter(id=apartment_id).afirst()
+    if archived is None:
+        return None
+    return _restore_apartment(archived)
+
+
+def get_archived_apartment_version(apartment_id) -> int | None:
+    return (
+        ArchivedApartment.objects.filter(id=apartment_id)
+        .values_list("apartment__version", flat=True)
+        .first()
+    )
+
+
+async def aget_archived_apartment_version(apartment_id) -> int | None:
+    return (
+        await ArchivedApartment.objects.filter(id=apartment_id)
+        .values_list("apartment__version", flat=True)
+        .afirst()
+    )
+
+
+def _archive_apartments(apartment_ids: list) -> None:
+    apartments = list(
+        Apartment.objects.filter(id__in=apartment_ids).values(*_get_columns(Apartment))
+    )
+    addresses = Address.objects.in_bulk(
+        [apartment["address_id"] for apartment in apartments]
+    )
+    images, visits = {}, {}
+    for image in ApartmentImage.objects.filter(apartment_id__in=apartment_ids).values(
+        *_get_columns(ApartmentImage)
+    ):
+        images.setdefault(image["apartment_id"], []).append(image)
+    for visit in Visit.objects.filter(apartment_id__in=apartment_ids).values(
+        *_get_columns(Visit)
+    ):
+        visits.setdefault(visit["apartment_id"], []).append(visit)
+
+    ArchivedApartment.objects.bulk_create(
+        ArchivedApartment(
+            id=apartment["id"],
+            owner_id=apartment["owner_id"],
+            apartment=apartment,
+            address=_get_values(addresses[apartment["address_id"]]),
+            images=images.get(apartment["id"], []),
+            visits=visits.get(apartment["id"], []),
+        )
+        for apartment in apartments
+    )
+    # Deleting the addresses cascades to the apartments and from there to
+    # their images, visits and other dependent rows.
+    Address.objects.filter(id__in=addresses).delete()
+
+
+def _restore_apartment(archived: ArchivedApartment) -> Apartment:
+    apartment_obj = _build_instance(Apartment, archived.apartment)
+    apartment_obj.address = _build_instance(Address, archived.address)
+    apartment_obj.images = sorted(
+        (_build_instance(ApartmentImage, image) for image in archived.images),
+        key=lambda image: (not image.is_main, image.id),
+    )
+    return apartment_obj
+
+
+def _get_columns(model: type[Model]) -> list[str]:
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.name not in ARCHIVE_EXCLUDED_FIELDS
+    ]
+
+
+def _get_values(obj: Model) -> dict:
+    return {column: getattr(obj, column) for column in _get_columns(type(obj))}
+
+
+def _build_instance(model: type[Model], values: dict) -> Model:
+    return model(
+        **{
+            field.attname: field.to_python(values[field.attname])
+            for field in model._meta.concrete_fields
+            if field.attname in values
+        }
+    )
@@ -0,0 +1,87 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+DETAIL_CACHE_TIMEOUT = getattr(settings, "APARTMENT_DETAIL_CACHE_TIMEOUT", 60 * 15)
+REBUILD_LOCK_TIMEOUT = 10
+REBUILD_WAIT_TIMEOUT = 2
+REBUILD_POLL_INTERVAL = 0.05
+
+
+def get_apartment_detail_payload(
+    apartment_id: uuid.UUID,
+    version: int,
+    build: Callable[[], dict],
+    size: str | None = None,
+) -> dict:
+    """
+    Return the cached detail payload of an apartment, building it on a miss.
+
+    Entries are keyed by apartment id, image rendition ``size`` and
+    ``Apartment.version``, which every
+    write of the apartment bumps in its own transaction, so a committed edit
+    moves readers to a new entry and nothing needs invalidating; superseded
+    entries expire after DETAIL_CACHE_TIMEOUT. On a cold entry a single worker
+    takes the rebuild lock; the others wait for its result instead of all
+    hitting the database at once, and only rebuild themselves if the lock
+    holder is too slow.
+    """
+    payload_key = _payload_key(apartment_id, version, size)
+    payload = cache.get(payload_key)
+    if payload is not None:
+        return payload
+
+    lock_key = f"{payload_key}:lock"
+    if cache.add(lock_key, True, REBUILD_LOCK_TIMEOUT):
+        try:
+            payload = build()
+            cache.set(payload_key, payload, DETAIL_CACHE_TIMEOUT)
+            return payload
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + REBUILD_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(REBUILD_POLL_INTERVAL)
+        payload = cache.get(payload_key)
+        if payload is not None:
+            return payload
+    return build()
+
+
+async def aget_apartment_detail_payload(
+    apartment_id: uuid.UUID,
+    version: int,
+    build: Callable[[], Awaitable[dict]],
+    size: str | None = None,
+) -> dict:
+    """get_apartment_detail_payload for async views, with an awaitable ``build``."""
+    payload_key = _payload_key(apartment_id, version, size)
+    payload = await cache.aget(payload_key)
+    if payload is not None:
+        return payload
+
+    lock_key = f"{payload_key}:lock"
+    if await cache.aadd(lock_key, True, REBUILD_LOCK_TIMEOUT):
+        try:
+            payload = await build()
+            await cache.aset(payload_key, payload, DETAIL_CACHE_TIMEOUT)
+            return payload
+        finally:
+            await cache.adelete(lock_key)
+
+    deadline = time.monotonic() + REBUILD_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(REBUILD_POLL_INTERVAL)
+        payload = await cache.aget(payload_key)
+        if payload is not None:
+            return payload
+    return await build()
+
+
+def _payload_key(apartment_id: uuid.UUID, version: int, size: str | None = None) -> str:
+    return f"apartment-detail:{apartment_id}:{version}:{size or ''}"
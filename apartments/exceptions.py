@@ -0,0 +1,8 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ApartmentVersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The apartment was modified by another request, reload it."
+    default_code = "version_conflict"
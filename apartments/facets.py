@@ -0,0 +1,185 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+from typing import Iterator
+
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, Q, QuerySet, Value, When
+
+from apartments.models import Apartment, ApartmentFacetCount
+
+FACET_FIELDS = {
+    "country": "address__country",
+    "city": "address__city",
+    "currency": "currency",
+    "is_furnished": "is_furnished",
+}
+PRICE_BUCKET_EDGES = (500, 1000, 1500, 2000, 3000, 5000)
+UNKNOWN_PRICE_BUCKET = "unknown"
+# Facets whose values also get their own counts, so filtering on one of them
+# is answered from the maintained counts instead of aggregating live.
+SCOPE_FACETS = ("country", "currency")
+GLOBAL_SCOPE = ""
+
+
+def get_apartment_facets(apartment_obj: Apartment) -> dict[str, str]:
+    """Return the facet values an apartment contributes to, none if unavailable."""
+    if not apartment_obj.is_available:
+        return {}
+    return {
+        "country": apartment_obj.address.country,
+        "city": apartment_obj.address.city,
+        "currency": apartment_obj.currency,
+        "is_furnished": _format_facet_value(apartment_obj.is_furnished),
+        "price_bucket": _get_price_bucket(apartment_obj.price_eur),
+    }
+
+
+def apply_facet_changes(
+    removed: list[dict[str, str]], added: list[dict[str, str]]
+) -> None:
+    """
+    Move the maintained facet counts from ``removed`` to ``added`` facet values,
+    in the global scope and in the scope of each of their SCOPE_FACETS values.
+    """
+    deltas = Counter()
+    for facets in added:
+        deltas.update(_get_scoped_facets(facets))
+    for facets in removed:
+        deltas.subtract(_get_scoped_facets(facets))
+
+    with transaction.atomic():
+        for (scope, facet, value), delta in sorted(deltas.items()):
+            if delta == 0:
+                continue
+            ApartmentFacetCount.objects.get_or_create(
+                scope=scope, facet=facet, value=value
+            )
+            ApartmentFacetCount.objects.filter(
+                scope=scope, facet=facet, value=value
+            ).update(count=F("count") + delta)
+
+
+def get_facet_counts(scope: str = GLOBAL_SCOPE) -> dict[str, list[dict]]:
+    """
+    Return the maintained facet counts of all available apartments, or of
+    those in ``scope``, see ``get_facet_scope``.
+    """
+    facet_counts = {facet: [] for facet in [*FACET_FIELDS, "price_bucket"]}
+    rows = (
+        ApartmentFacetCount.objects.filter(scope=scope, count__gt=0)
+        .order_by("facet", "-count", "value")
+        .values_list("facet", "value", "count")
+    )
+    for facet, value, count in rows:
+        facet_counts[facet].append({"value": value, "count": count})
+    return facet_counts
+
+
+def get_facet_scope(facet: str, value: str) -> str:
+    """Scope of the counts of apartments whose ``facet``, one of SCOPE_FACETS, is ``value``."""
+    return f"{facet}={value}"
+
+
+def count_facets_live(apartments: QuerySet) -> dict[str, list[dict]]:
+    """Aggregate facet counts with one GROUP BY per facet over ``apartments``."""
+    facet_rows = defaultdict(list)
+    for _, facet, value, count in _count_facets(apartments):
+        facet_rows[facet].append((value, count))
+    return {
+        facet: _sorted_counts(facet_rows[facet])
+        for facet in [*FACET_FIELDS, "price_bucket"]
+    }
+
+
+@transaction.atomic
+def rebuild_facet_counts() -> None:
+    ApartmentFacetCount.objects.all().delete()
+    apartments = Apartment.objects.filter(is_available=True)
+    facet_counts = [
+        ApartmentFacetCount(scope=GLOBAL_SCOPE, facet=facet, value=value, count=count)
+        for _, facet, value, count in _count_facets(apartments)
+    ]
+    for scope_facet in SCOPE_FACETS:
+        facet_counts.extend(
+            ApartmentFacetCount(
+                scope=get_facet_scope(scope_facet, scope_value),
+                facet=facet,
+                value=value,
+                count=count,
+            )
+            for scope_value, facet, value, count in _count_facets(
+                apartments, group_by=FACET_FIELDS[scope_facet]
+            )
+        )
+    ApartmentFacetCount.objects.bulk_create(facet_counts)
+
+
+def _count_facets(
+    apartments: QuerySet, group_by: str | None = None
+) -> Iterator[tuple[str | None, str, str, int]]:
+    """
+    Yield ``(group, facet, value, count)`` rows counting ``apartments`` per
+    facet value, and per value of the ``group_by`` field when it is given.
+    """
+    apartments = apartments.order_by()
+    group_fields = [group_by] if group_by else []
+    for facet, field in FACET_FIELDS.items():
+        rows = apartments.values_list(*group_fields, field).annotate(count=Count("pk"))
+        for *group, value, count in rows:
+            yield _get_group(group), facet, _format_facet_value(value), count
+
+    rows = (
+        apartments.annotate(price_bucket=_price_bucket_expression())
+        .values_list(*group_fields, "price_bucket")
+        .annotate(count=Count("pk"))
+    )
+    for *group, value, count in rows:
+        yield _get_group(group), "price_bucket", value, count
+
+
+def _get_group(group: list) -> str | None:
+    return _format_facet_value(group[0]) if group else None
+
+
+def _get_scoped_facets(facets: dict[str, str]) -> list[tuple[str, str, str]]:
+    scopes = [GLOBAL_SCOPE] + [
+        get_facet_scope(scope_facet, facets[scope_facet])
+        for scope_facet in SCOPE_FACETS
+        if scope_facet in facets
+    ]
+    return [
+        (scope, facet, value) for scope in scopes for facet, value in facets.items()
+    ]
+
+
+def _sorted_counts(rows) -> list[dict]:
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(rows, key=lambda row: (-row[1], row[0]))
+    ]
+
+
+def _format_facet_value(value: object) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _get_price_bucket(price_eur: Decimal | None) -> str:
+    if price_eur is None:
+        return UNKNOWN_PRICE_BUCKET
+    lower = 0
+    for upper in PRICE_BUCKET_EDGES:
+        if price_eur < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+def _price_bucket_expression() -> Case:
+    whens = [When(price_eur__isnull=True, then=Value(UNKNOWN_PRICE_BUCKET))]
+    lower = 0
+    for upper in PRICE_BUCKET_EDGES:
+        whens.append(When(Q(price_eur__lt=upper), then=Value(f"{lower}-{upper}")))
+        lower = upper
+    return Case(*whens, default=Value(f"{lower}+"), output_field=CharField())
@@ -0,0 +1,146 @@
+import math
+from functools import reduce
+from operator import or_
+
+import django_filters
+from django import forms
+from django.db.models import F, OrderBy, Q, QuerySet, Value
+from django.db.models.functions import ACos, Cos, Least, Radians, Sin
+
+from apartments.choices import COUNTRY_CHOICES, CURRENCY_CHOICES
+from apartments.geo import EARTH_RADIUS_KM, bounding_box, geohash_cells
+from apartments.models import Apartment
+from apartments.search import search_apartments
+
+DEFAULT_RADIUS_KM = 5
+MAX_RADIUS_KM = 100
+COORDINATE_LIMITS = {"latitude": 90, "longitude": 180}
+# Filter -> the filter it refines; alone it leaves the queryset unchanged.
+DEPENDENT_FILTERS = {"radius": "near"}
+
+
+class CoordinatesField(forms.CharField):
+    """
+    Comma-separated coordinates, one per name in ``axes`` ("latitude" or
+    "longitude"). With four axes the value is a box: the first pair is its
+    minimum corner and must not exceed the second pair.
+    """
+
+    def __init__(self, *args, axes: tuple[str, ...], **kwargs) -> None:
+        self.axes = axes
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value: str) -> tuple[float, ...] | None:
+        value = super().to_python(value)
+        if not value:
+            return None
+        parts = value.split(",")
+        if len(parts) != len(self.axes):
+            raise forms.ValidationError(
+                f"Enter {len(self.axes)} comma-separated coordinates."
+            )
+        try:
+            coordinates = tuple(float(part) for part in parts)
+        except ValueError:
+            raise forms.ValidationError("Coordinates must be numbers.")
+        for axis, coordinate in zip(self.axes, coordinates):
+            limit = COORDINATE_LIMITS[axis]
+            if not math.isfinite(coordinate) or abs(coordinate) > limit:
+                raise forms.ValidationError(
+                    f"{axis.capitalize()} must be between {-limit} and {limit}."
+                )
+        if len(coordinates) == 4 and (
+            coordinates[0] > coordinates[2] or coordinates[1] > coordinates[3]
+        ):
+            raise forms.ValidationError(
+                "The minimum corner of the box must not exceed the maximum one."
+            )
+        return coordinates
+
+
+class CoordinatesFilter(django_filters.Filter):
+    field_class = CoordinatesField
+
+
+class NullsLastOrderingFilter(django_filters.OrderingFilter):
+    """
+    OrderingFilter putting rows without a value last in both directions and
+    breaking ties by id, so pages of equal values stay stable.
+    """
+
+    def get_ordering_value(self, param: str) -> OrderBy:
+        descending = param.startswith("-")
+        field = F(self.param_map[param.lstrip("-")])
+        return field.desc(nulls_last=True) if descending else field.asc(nulls_last=True)
+
+    def filter(self, qs: QuerySet, value: list[str] | None) -> QuerySet:
+        if not value:
+            return qs
+        return qs.order_by(*(self.get_ordering_value(param) for param in value), "id")
+
+
+class ApartmentFilter(django_filters.FilterSet):
+    near = CoordinatesFilter(axes=("latitude", "longitude"), method="filter_near")
+    radius = django_filters.NumberFilter(
+        method="filter_radius", min_value=0, max_value=MAX_RADIUS_KM
+    )
+    bbox = CoordinatesFilter(
+        axes=("longitude", "latitude", "longitude", "latitude"), method="filter_bbox"
+    )
+    q = django_filters.CharFilter(method="filter_q", max_length=200)
+    country = django_filters.ChoiceFilter(
+        field_name="address__country", choices=COUNTRY_CHOICES
+    )
+    currency = django_filters.ChoiceFilter(choices=CURRENCY_CHOICES)
+    ordering = NullsLastOrderingFilter(fields=["price_eur"])
+
+    class Meta:
+        model = Apartment
+        fields = {
+            "price": ["gte", "lte"],
+            "price_eur": ["gte", "lte"],
+            "surface": ["gte", "lte"],
+            "is_available": ["exact"],
+        }
+
+    def filter_near(
+        self, queryset: QuerySet, name: str, value: tuple[float, float]
+    ) -> QuerySet:
+        latitude, longitude = value
+        radius = float(self.form.cleaned_data.get("radius") or DEFAULT_RADIUS_KM)
+        queryset = _filter_bounding_box(
+            queryset, *bounding_box(latitude, longitude, radius)
+        )
+        distance = EARTH_RADIUS_KM * ACos(
+            Least(
+                Value(1.0),
+                Sin(Radians(Value(latitude))) * Sin(Radians("address__latitude"))
+                + Cos(Radians(Value(latitude)))
+                * Cos(Radians("address__latitude"))
+                * Cos(Radians("address__longitude") - Radians(Value(longitude))),
+            )
+        )
+        return queryset.annotate(distance=distance).filter(distance__lte=radius)
+
+    def filter_radius(self, queryset: QuerySet, name: str, value: float) -> QuerySet:
+        return queryset
+
+    def filter_bbox(
+        self, queryset: QuerySet, name: str, value: tuple[float, float, float, float]
+    ) -> QuerySet:
+        min_lon, min_lat, max_lon, max_lat = value
+        return _filter_bounding_box(queryset, min_lat, min_lon, max_lat, max_lon)
+
+    def filter_q(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        return search_apartments(queryset, value)
+
+
+def _filter_bounding_box(
+    queryset: QuerySet, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+) -> QuerySet:
+    cells = geohash_cells(min_lat, min_lon, max_lat, max_lon)
+    return queryset.filter(
+        reduce(or_, (Q(address__geohash__startswith=cell) for cell in cells)),
+        address__latitude__range=(min_lat, max_lat),
+        address__longitude__range=(min_lon, max_lon),
+    )
@@ -0,0 +1,123 @@
+import csv
+import math
+import unicodedata
+from functools import cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def encode_geohash(
+    latitude: float, longitude: float, precision: int = GEOHASH_PRECISION
+) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, char_index, even_bit = [], 0, 0, True
+    while len(geohash) < precision:
+        coordinate, bounds = (
+            (longitude, lon_range) if even_bit else (latitude, lat_range)
+        )
+        middle = (bounds[0] + bounds[1]) / 2
+        char_index <<= 1
+        if coordinate >= middle:
+            char_index |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even_bit = not even_bit
+        bits += 1
+        if bits == 5:
+            geohash.append(GEOHASH_ALPHABET[char_index])
+            bits, char_index = 0, 0
+    return "".join(geohash)
+
+
+def _geohash_cell_size(precision: int) -> tuple[float, float]:
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def geohash_cells(
+    min_lat: float, min_lon: float, max_lat: float, max_lon: float, max_cells: int = 32
+) -> list[str]:
+    """
+    Return the geohash prefixes covering a bounding box.
+
+    The longest precision that needs at most ``max_cells`` prefixes is used, so
+    the box can be answered with a handful of indexed ``LIKE 'prefix%'`` ranges.
+    """
+    max_lat, max_lon = min(max_lat, 90 - 1e-9), min(max_lon, 180 - 1e-9)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_height, cell_width = _geohash_cell_size(precision)
+        first_row = math.floor((min_lat + 90) / cell_height)
+        last_row = math.floor((max_lat + 90) / cell_height)
+        first_column = math.floor((min_lon + 180) / cell_width)
+        last_column = math.floor((max_lon + 180) / cell_width)
+        rows = range(first_row, last_row + 1)
+        columns = range(first_column, last_column + 1)
+        if len(rows) * len(columns) <= max_cells or precision == 1:
+            return sorted(
+                {
+                    encode_geohash(
+                        -90 + (row + 0.5) * cell_height,
+                        -180 + (column + 0.5) * cell_width,
+                        precision,
+                    )
+                    for row in rows
+                    for column in columns
+                }
+            )
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    lon_delta = 180.0 if cos_lat < 1e-6 else radius_km / (KM_PER_DEGREE * cos_lat)
+    return (
+        max(latitude - lat_delta, -90.0),
+        max(longitude - lon_delta, -180.0),
+        min(latitude + lat_delta, 90.0),
+        min(longitude + lon_delta, 180.0),
+    )
+
+
+def locate_address(
+    country: str, city: str, postal_code: str
+) -> tuple[float, float] | None:
+    """Look up approximate coordinates in the bundled offline gazetteer."""
+    cities, postal_codes = _load_gazetteer()
+    country_key = _normalize(country)
+    coordinates = cities.get((country_key, _normalize(city)))
+    if coordinates:
+        return coordinates
+
+    postal_key = "".join(char for char in postal_code if char.isalnum()).lower()
+    for length in range(len(postal_key), 0, -1):
+        coordinates = postal_codes.get((country_key, postal_key[:length]))
+        if coordinates:
+            return coordinates
+    return None
+
+
+def _normalize(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value.strip().casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@cache
+def _load_gazetteer() -> tuple[dict, dict]:
+    cities, postal_codes = {}, {}
+    with open(GAZETTEER_PATH, encoding="utf-8") as gazetteer_file:
+        for row in csv.DictReader(gazetteer_file):
+            coordinates = (float(row["latitude"]), float(row["longitude"]))
+            country = _normalize(row["country"])
+            cities[(country, _normalize(row["city"]))] = coordinates
+            if row["postal_code"]:
+                postal_codes[(country, row["postal_code"].lower())] = coordinates
+    return cities, postal_codes
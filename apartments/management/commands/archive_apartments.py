@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apartments.archive import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    archive_unavailable_apartments,
+)
+
+
+class Command(BaseCommand):
+    help = "Move apartments unavailable for a set time into the archive table."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ARCHIVE_AFTER_DAYS,
+            help="Archive apartments unavailable and unchanged for this many days.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help="Number of apartments moved per transaction.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        archived = archive_unavailable_apartments(
+            older_than=timedelta(days=options["days"]),
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} apartments."))
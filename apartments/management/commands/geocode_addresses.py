@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from apartments.services import fill_missing_address_coordinates
+
+
+class Command(BaseCommand):
+    help = "Fill missing address coordinates from the bundled gazetteer."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options) -> None:
+        located = fill_missing_address_coordinates(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Located {located} addresses."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from apartments.services import normalize_apartment_prices
+
+
+class Command(BaseCommand):
+    help = "Recompute Apartment.price_eur from the current exchange rates."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--currency",
+            action="append",
+            dest="currencies",
+            help="Only re-normalize apartments priced in this currency.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        normalized = normalize_apartment_prices(currencies=options["currencies"])
+        self.stdout.write(self.style.SUCCESS(f"Normalized {normalized} apartments."))
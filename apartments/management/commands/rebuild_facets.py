@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apartments.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Recount the apartment search facets from scratch."
+
+    def handle(self, *args, **options) -> None:
+        rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS("Rebuilt apartment facet counts."))
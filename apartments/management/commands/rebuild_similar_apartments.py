@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from apartments.similarity import SIMILAR_APARTMENTS_K, rebuild_similar_apartments
+
+
+class Command(BaseCommand):
+    help = "Precompute the most similar available apartments of every apartment."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "-k",
+            type=int,
+            default=SIMILAR_APARTMENTS_K,
+            help="Number of neighbours stored per apartment.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        indexed = rebuild_similar_apartments(k=options["k"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {indexed} apartments, k={options['k']}.")
+        )
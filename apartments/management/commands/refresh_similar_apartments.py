@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from apartments.similarity import (
+    SIMILAR_APARTMENTS_K,
+    SIMILARITY_REFRESH_BATCH_SIZE,
+    refresh_queued_similar_apartments,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the similar apartments of the apartments changed since the last run."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "-k",
+            type=int,
+            default=SIMILAR_APARTMENTS_K,
+            help="Number of neighbours stored per apartment.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=SIMILARITY_REFRESH_BATCH_SIZE,
+            help="Number of queued changes refreshed per transaction.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        processed = refresh_queued_similar_apartments(
+            batch_size=options["batch_size"], k=options["k"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed {processed} queued apartment changes.")
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0004_alter_address_id_alter_apartment_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartment",
+            name="main_image",
+            field=models.ImageField(
+                blank=True, editable=False, null=True, upload_to="images/"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0005_apartment_main_image"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("is_available", True)),
+                fields=["price", "id"],
+                name="apartment_avail_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("is_available", True)),
+                fields=["surface"],
+                name="apartment_avail_surface_idx",
+            ),
+        ),
+    ]
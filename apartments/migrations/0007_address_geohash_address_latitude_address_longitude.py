@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0006_apartment_apartment_avail_price_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="geohash",
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name="address",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="address",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
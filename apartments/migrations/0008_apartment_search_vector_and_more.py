@@ -0,0 +1,48 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from livehere.migration_operations import PostgresOnly
+
+BACKFILL_SEARCH_VECTOR_SQL = """
+UPDATE apartments_apartment AS apartment
+SET search_vector =
+    setweight(to_tsvector('simple', coalesce(address.city, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(address.province, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(address.street, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(apartment.description, '')), 'C')
+FROM apartments_address AS address
+WHERE apartment.address_id = address.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0007_address_geohash_address_latitude_address_longitude"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        PostgresOnly(
+            migrations.AddIndex(
+                model_name="apartment",
+                index=django.contrib.postgres.indexes.GinIndex(
+                    fields=["search_vector"], name="apartment_search_vector_idx"
+                ),
+            )
+        ),
+        PostgresOnly(
+            migrations.RunSQL(BACKFILL_SEARCH_VECTOR_SQL, migrations.RunSQL.noop)
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0008_apartment_search_vector_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "currency",
+                    models.CharField(
+                        choices=[
+                            ("ALL", "Albanian Lek"),
+                            ("EUR", "Euro"),
+                            ("BYN", "Belarusian Ruble"),
+                            ("BAM", "Bosnia and Herzegovina Convertible Mark"),
+                            ("BGN", "Bulgarian Lev"),
+                            ("HRK", "Croatian Kuna"),
+                            ("CZK", "Czech Koruna"),
+                            ("DKK", "Danish Krone"),
+                            ("GBP", "British Pound Sterling"),
+                            ("HUF", "Hungarian Forint"),
+                            ("ISK", "Icelandic Króna"),
+                            ("MDL", "Moldovan Leu"),
+                            ("NOK", "Norwegian Krone"),
+                            ("PLN", "Polish Złoty"),
+                            ("RON", "Romanian Leu"),
+                            ("RUB", "Russian Ruble"),
+                            ("RSD", "Serbian Dinar"),
+                            ("SEK", "Swedish Krona"),
+                            ("CHF", "Swiss Franc"),
+                            ("UAH", "Ukrainian Hryvnia"),
+                        ],
+                        max_length=3,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("eur_rate", models.DecimalField(decimal_places=8, max_digits=14)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="apartment",
+            name="price_eur",
+            field=models.DecimalField(
+                decimal_places=2, editable=False, max_digits=12, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("is_available", True)),
+                fields=["price_eur", "id"],
+                name="apartment_avail_price_eur_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import F
+
+INITIAL_EUR_RATES = {
+    "ALL": "0.00970000",
+    "EUR": "1.00000000",
+    "BYN": "0.28570000",
+    "BAM": "0.51129188",
+    "BGN": "0.51129188",
+    "HRK": "0.13272280",
+    "CZK": "0.04000000",
+    "DKK": "0.13404800",
+    "GBP": "1.16279070",
+    "HUF": "0.00256410",
+    "ISK": "0.00666670",
+    "MDL": "0.05181350",
+    "NOK": "0.08695650",
+    "PLN": "0.23255810",
+    "RON": "0.20120720",
+    "RUB": "0.01000000",
+    "RSD": "0.00853240",
+    "SEK": "0.08849560",
+    "CHF": "1.05263160",
+    "UAH": "0.02381000",
+}
+
+
+def seed_exchange_rates(apps, schema_editor):
+    ExchangeRate = apps.get_model("apartments", "ExchangeRate")
+    Apartment = apps.get_model("apartments", "Apartment")
+    for currency, eur_rate in INITIAL_EUR_RATES.items():
+        ExchangeRate.objects.update_or_create(
+            currency=currency, defaults={"eur_rate": Decimal(eur_rate)}
+        )
+        Apartment.objects.filter(currency=currency).update(
+            price_eur=F("price") * Decimal(eur_rate)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0009_exchangerate_apartment_price_eur_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_exchange_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0010_seed_exchange_rates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartment",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="apartment",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
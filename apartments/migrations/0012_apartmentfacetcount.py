@@ -0,0 +1,36 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0011_apartment_updated_at_apartment_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApartmentFacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("facet", models.CharField(max_length=16)),
+                ("value", models.CharField(max_length=64)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="apartmentfacetcount",
+            constraint=models.UniqueConstraint(
+                fields=("facet", "value"), name="apartment_facet_count_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+from django.db.models import Case, CharField, Count, Q, Value, When
+
+# Copied from apartments.facets as of this migration; migrations must not
+# depend on application code that may change later.
+FACET_FIELDS = {
+    "country": "address__country",
+    "city": "address__city",
+    "currency": "currency",
+    "is_furnished": "is_furnished",
+}
+PRICE_BUCKET_EDGES = (500, 1000, 1500, 2000, 3000, 5000)
+UNKNOWN_PRICE_BUCKET = "unknown"
+
+
+def _format_facet_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _price_bucket_expression():
+    whens = [When(price_eur__isnull=True, then=Value(UNKNOWN_PRICE_BUCKET))]
+    lower = 0
+    for upper in PRICE_BUCKET_EDGES:
+        whens.append(When(Q(price_eur__lt=upper), then=Value(f"{lower}-{upper}")))
+        lower = upper
+    return Case(*whens, default=Value(f"{lower}+"), output_field=CharField())
+
+
+def populate_facet_counts(apps, schema_editor):
+    Apartment = apps.get_model("apartments", "Apartment")
+    ApartmentFacetCount = apps.get_model("apartments", "ApartmentFacetCount")
+    apartments = Apartment.objects.filter(is_available=True).order_by()
+    facet_counts = []
+    for facet, field in FACET_FIELDS.items():
+        rows = apartments.values_list(field).annotate(count=Count("pk"))
+        facet_counts.extend(
+            ApartmentFacetCount(
+                facet=facet, value=_format_facet_value(value), count=count
+            )
+            for value, count in rows
+        )
+    rows = (
+        apartments.annotate(price_bucket=_price_bucket_expression())
+        .values_list("price_bucket")
+        .annotate(count=Count("pk"))
+    )
+    facet_counts.extend(
+        ApartmentFacetCount(facet="price_bucket", value=value, count=count)
+        for value, count in rows
+    )
+    ApartmentFacetCount.objects.bulk_create(facet_counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0012_apartmentfacetcount"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
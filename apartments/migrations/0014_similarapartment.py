@@ -0,0 +1,52 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0013_populate_facet_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarApartment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("distance", models.FloatField()),
+                (
+                    "apartment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_apartments",
+                        to="apartments.apartment",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to",
+                        to="apartments.apartment",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="similarapartment",
+            constraint=models.UniqueConstraint(
+                fields=("apartment", "rank"), name="similar_apartment_rank_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,163 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0014_similarapartment"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SavedSearch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("filters", models.JSONField(default=dict)),
+                (
+                    "country",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("Albania", "Albania"),
+                            ("Andorra", "Andorra"),
+                            ("Austria", "Austria"),
+                            ("Belarus", "Belarus"),
+                            ("Belgium", "Belgium"),
+                            ("Bosnia and Herzegovina", "Bosnia and Herzegovina"),
+                            ("Bulgaria", "Bulgaria"),
+                            ("Croatia", "Croatia"),
+                            ("Cyprus", "Cyprus"),
+                            ("Czech Republic", "Czech Republic"),
+                            ("Denmark", "Denmark"),
+                            ("Estonia", "Estonia"),
+                            ("Finland", "Finland"),
+                            ("France", "France"),
+                            ("Germany", "Germany"),
+                            ("Greece", "Greece"),
+                            ("Hungary", "Hungary"),
+                            ("Iceland", "Iceland"),
+                            ("Ireland", "Ireland"),
+                            ("Italy", "Italy"),
+                            ("Kosovo", "Kosovo"),
+                            ("Latvia", "Latvia"),
+                            ("Liechtenstein", "Liechtenstein"),
+                            ("Lithuania", "Lithuania"),
+                            ("Luxembourg", "Luxembourg"),
+                            ("Malta", "Malta"),
+                            ("Moldova", "Moldova"),
+                            ("Monaco", "Monaco"),
+                            ("Montenegro", "Montenegro"),
+                            ("Netherlands", "Netherlands"),
+                            ("North Macedonia", "North Macedonia"),
+                            ("Norway", "Norway"),
+                            ("Poland", "Poland"),
+                            ("Portugal", "Portugal"),
+                            ("Romania", "Romania"),
+                            ("Russia", "Russia"),
+                            ("San Marino", "San Marino"),
+                            ("Serbia", "Serbia"),
+                            ("Slovakia", "Slovakia"),
+                            ("Slovenia", "Slovenia"),
+                            ("Spain", "Spain"),
+                            ("Sweden", "Sweden"),
+                            ("Switzerland", "Switzerland"),
+                            ("Ukraine", "Ukraine"),
+                            ("United Kingdom", "United Kingdom"),
+                            ("Vatican City", "Vatican City"),
+                        ],
+                    ),
+                ),
+                ("price_min", models.DecimalField(decimal_places=2, max_digits=8)),
+                ("price_max", models.DecimalField(decimal_places=2, max_digits=8)),
+                ("price_eur_min", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("price_eur_max", models.DecimalField(decimal_places=2, max_digits=12)),
+                ("surface_min", models.DecimalField(decimal_places=2, max_digits=5)),
+                ("surface_max", models.DecimalField(decimal_places=2, max_digits=5)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="saved_searches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SavedSearchMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "apartment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="apartments.apartment",
+                    ),
+                ),
+                (
+                    "saved_search",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matches",
+                        to="apartments.savedsearch",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="savedsearch",
+            index=models.Index(
+                fields=["country", "price_eur_min", "price_eur_max"],
+                name="saved_search_price_eur_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savedsearch",
+            index=models.Index(
+                fields=["country", "surface_min", "surface_max"],
+                name="saved_search_surface_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savedsearchmatch",
+            index=models.Index(
+                fields=["user", "-created_at"], name="saved_search_match_inbox_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="savedsearchmatch",
+            constraint=models.UniqueConstraint(
+                fields=("saved_search", "apartment"), name="saved_search_match_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0016_archivedapartment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartment",
+            name="main_image_renditions",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
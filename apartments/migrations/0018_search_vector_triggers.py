@@ -0,0 +1,68 @@
+from django.db import migrations
+
+from livehere.migration_operations import PostgresOnly
+
+# Keep Apartment.search_vector in sync in the database, so every write path
+# (services, bulk_update(), queryset.update(), the admin, raw SQL) updates it.
+# Writing search_vector itself, e.g. setting it to NULL, recomputes it.
+CREATE_SEARCH_VECTOR_TRIGGERS_SQL = """
+CREATE FUNCTION apartments_apartment_search_vector() RETURNS trigger AS $$
+BEGIN
+    SELECT
+        setweight(to_tsvector('simple', coalesce(address.city, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(address.province, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(address.street, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C')
+    INTO NEW.search_vector
+    FROM apartments_address AS address
+    WHERE address.id = NEW.address_id;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER apartment_search_vector
+BEFORE INSERT OR UPDATE OF description, address_id, search_vector
+ON apartments_apartment
+FOR EACH ROW EXECUTE FUNCTION apartments_apartment_search_vector();
+
+CREATE FUNCTION apartments_address_search_vector() RETURNS trigger AS $$
+BEGIN
+    UPDATE apartments_apartment SET search_vector = NULL
+    WHERE address_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER address_search_vector
+AFTER UPDATE OF city, province, street ON apartments_address
+FOR EACH ROW
+WHEN (
+    (OLD.city, OLD.province, OLD.street)
+    IS DISTINCT FROM (NEW.city, NEW.province, NEW.street)
+)
+EXECUTE FUNCTION apartments_address_search_vector();
+
+UPDATE apartments_apartment SET search_vector = NULL;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGERS_SQL = """
+DROP TRIGGER address_search_vector ON apartments_address;
+DROP FUNCTION apartments_address_search_vector();
+DROP TRIGGER apartment_search_vector ON apartments_apartment;
+DROP FUNCTION apartments_apartment_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0017_apartment_main_image_renditions"),
+    ]
+
+    operations = [
+        PostgresOnly(
+            migrations.RunSQL(
+                CREATE_SEARCH_VECTOR_TRIGGERS_SQL, DROP_SEARCH_VECTOR_TRIGGERS_SQL
+            )
+        ),
+    ]
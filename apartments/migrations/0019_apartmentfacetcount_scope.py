@@ -0,0 +1,99 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:46
+
+from django.db import migrations, models
+from django.db.models import Case, CharField, Count, Q, Value, When
+
+# Copied from apartments.facets as of this migration; migrations must not
+# depend on application code that may change later.
+FACET_FIELDS = {
+    "country": "address__country",
+    "city": "address__city",
+    "currency": "currency",
+    "is_furnished": "is_furnished",
+}
+PRICE_BUCKET_EDGES = (500, 1000, 1500, 2000, 3000, 5000)
+UNKNOWN_PRICE_BUCKET = "unknown"
+SCOPE_FACETS = ("country", "currency")
+
+
+def _format_facet_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _price_bucket_expression():
+    whens = [When(price_eur__isnull=True, then=Value(UNKNOWN_PRICE_BUCKET))]
+    lower = 0
+    for upper in PRICE_BUCKET_EDGES:
+        whens.append(When(Q(price_eur__lt=upper), then=Value(f"{lower}-{upper}")))
+        lower = upper
+    return Case(*whens, default=Value(f"{lower}+"), output_field=CharField())
+
+
+def populate_scoped_facet_counts(apps, schema_editor):
+    Apartment = apps.get_model("apartments", "Apartment")
+    ApartmentFacetCount = apps.get_model("apartments", "ApartmentFacetCount")
+    apartments = Apartment.objects.filter(is_available=True).order_by()
+    facet_counts = []
+    for scope_facet in SCOPE_FACETS:
+        scope_field = FACET_FIELDS[scope_facet]
+        for facet, field in FACET_FIELDS.items():
+            rows = apartments.values_list(scope_field, field).annotate(
+                count=Count("pk")
+            )
+            facet_counts.extend(
+                ApartmentFacetCount(
+                    scope=f"{scope_facet}={scope_value}",
+                    facet=facet,
+                    value=_format_facet_value(value),
+                    count=count,
+                )
+                for scope_value, value, count in rows
+            )
+        rows = (
+            apartments.annotate(price_bucket=_price_bucket_expression())
+            .values_list(scope_field, "price_bucket")
+            .annotate(count=Count("pk"))
+        )
+        facet_counts.extend(
+            ApartmentFacetCount(
+                scope=f"{scope_facet}={scope_value}",
+                facet="price_bucket",
+                value=value,
+                count=count,
+            )
+            for scope_value, value, count in rows
+        )
+    ApartmentFacetCount.objects.bulk_create(facet_counts)
+
+
+def delete_scoped_facet_counts(apps, schema_editor):
+    ApartmentFacetCount = apps.get_model("apartments", "ApartmentFacetCount")
+    ApartmentFacetCount.objects.exclude(scope="").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0018_search_vector_triggers"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="apartmentfacetcount",
+            name="apartment_facet_count_unique",
+        ),
+        migrations.AddField(
+            model_name="apartmentfacetcount",
+            name="scope",
+            field=models.CharField(blank=True, default="", max_length=80),
+        ),
+        migrations.AddConstraint(
+            model_name="apartmentfacetcount",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "facet", "value"), name="apartment_facet_count_unique"
+            ),
+        ),
+        migrations.RunPython(populate_scoped_facet_counts, delete_scoped_facet_counts),
+    ]
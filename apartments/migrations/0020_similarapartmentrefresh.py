@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0019_apartmentfacetcount_scope"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarApartmentRefresh",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("apartment_id", models.UUIDField()),
+            ],
+        ),
+    ]
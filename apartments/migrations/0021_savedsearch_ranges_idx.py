@@ -0,0 +1,56 @@
+# Generated by Django 5.0.2 on 2026-10-18 15:28
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+from livehere.migration_operations import PostgresOnly
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0020_similarapartmentrefresh"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="savedsearch",
+            name="saved_search_price_eur_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="savedsearch",
+            name="saved_search_surface_idx",
+        ),
+        PostgresOnly(
+            migrations.AddIndex(
+                model_name="savedsearch",
+                index=django.contrib.postgres.indexes.GistIndex(
+                    models.Func(
+                        models.F("price_eur_min"),
+                        models.F("price_eur_max"),
+                        models.Value("[]"),
+                        function="numrange",
+                        output_field=django.contrib.postgres.fields.ranges.DecimalRangeField(),
+                    ),
+                    models.Func(
+                        models.F("surface_min"),
+                        models.F("surface_max"),
+                        models.Value("[]"),
+                        function="numrange",
+                        output_field=django.contrib.postgres.fields.ranges.DecimalRangeField(),
+                    ),
+                    models.Func(
+                        models.F("price_min"),
+                        models.F("price_max"),
+                        models.Value("[]"),
+                        function="numrange",
+                        output_field=django.contrib.postgres.fields.ranges.DecimalRangeField(),
+                    ),
+                    name="saved_search_ranges_idx",
+                ),
+            )
+        ),
+    ]
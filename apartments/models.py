@@ -1,5 +1,9 @@
 import uuid
 
+from django.contrib.postgres.fields import DecimalRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.contrib.auth.models import User
@@ -12,6 +16,9 @@ class Address(models.Model):
     city = models.CharField(max_length=64)
     province = models.CharField(max_length=64)
     postal_code = models.CharField(max_length=10)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True)
 
 
 class Apartment(models.Model):
@@ -31,3 +38,168 @@ class Apartment(models.Model):
     is_furnished = models.BooleanField(default=True)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     address = models.OneToOneField(Address, on_delete=models.CASCADE)
+    main_image = models.ImageField(
+        upload_to="images/", null=True, blank=True, editable=False
+    )
+    main_image_renditions = models.JSONField(null=True, blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    price_eur = models.DecimalField(
+        max_digits=12, decimal_places=2, null=True, editable=False
+    )
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["price", "id"],
+                condition=models.Q(is_available=True),
+                name="apartment_avail_price_idx",
+            ),
+            models.Index(
+                fields=["surface"],
+                condition=models.Q(is_available=True),
+                name="apartment_avail_surface_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="apartment_search_vector_idx"),
+            models.Index(
+                fields=["price_eur", "id"],
+                condition=models.Q(is_available=True),
+                name="apartment_avail_price_eur_idx",
+            ),
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(is_available=False),
+                name="apartment_unavail_updated_idx",
+            ),
+        ]
+
+
+class ExchangeRate(models.Model):
+    currency = models.CharField(
+        max_length=3, choices=CURRENCY_CHOICES, primary_key=True
+    )
+    eur_rate = models.DecimalField(max_digits=14, decimal_places=8)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class ApartmentFacetCount(models.Model):
+    scope = models.CharField(max_length=80, blank=True, default="")
+    facet = models.CharField(max_length=16)
+    value = models.CharField(max_length=64)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "facet", "value"],
+                name="apartment_facet_count_unique",
+            )
+        ]
+
+
+class SimilarApartment(models.Model):
+    apartment = models.ForeignKey(
+        Apartment, on_delete=models.CASCADE, related_name="similar_apartments"
+    )
+    similar = models.ForeignKey(
+        Apartment, on_delete=models.CASCADE, related_name="similar_to"
+    )
+    rank = models.PositiveSmallIntegerField()
+    distance = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["apartment", "rank"], name="similar_apartment_rank_unique"
+            )
+        ]
+
+
+class SimilarApartmentRefresh(models.Model):
+    """An apartment whose similar apartments await refresh_queued_similar_apartments."""
+
+    apartment_id = models.UUIDField()
+
+
+def get_saved_search_range(min_column: str, max_column: str) -> models.Func:
+    """
+    ``[min_column, max_column]`` as a numrange, the expression covered by
+    saved_search_ranges_idx; queries must repeat it to use the index.
+    """
+    return models.Func(
+        models.F(min_column),
+        models.F(max_column),
+        models.Value("[]"),
+        function="numrange",
+        output_field=DecimalRangeField(),
+    )
+
+
+class SavedSearch(models.Model):
+    """
+    A tenant's ApartmentView filters, with the range predicates copied into
+    columns so new apartments can be matched through an index.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="saved_searches"
+    )
+    filters = models.JSONField(default=dict)
+    country = models.CharField(choices=COUNTRY_CHOICES, blank=True)
+    price_min = models.DecimalField(max_digits=8, decimal_places=2)
+    price_max = models.DecimalField(max_digits=8, decimal_places=2)
+    price_eur_min = models.DecimalField(max_digits=12, decimal_places=2)
+    price_eur_max = models.DecimalField(max_digits=12, decimal_places=2)
+    surface_min = models.DecimalField(max_digits=5, decimal_places=2)
+    surface_max = models.DecimalField(max_digits=5, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            GistIndex(
+                get_saved_search_range("price_eur_min", "price_eur_max"),
+                get_saved_search_range("surface_min", "surface_max"),
+                get_saved_search_range("price_min", "price_max"),
+                name="saved_search_ranges_idx",
+            ),
+        ]
+
+
+class SavedSearchMatch(models.Model):
+    saved_search = models.ForeignKey(
+        SavedSearch, on_delete=models.CASCADE, related_name="matches"
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    apartment = models.ForeignKey(Apartment, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["saved_search", "apartment"],
+                name="saved_search_match_unique",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"], name="saved_search_match_inbox_idx"
+            )
+        ]
+
+
+class ArchivedApartment(models.Model):
+    """
+    An apartment moved out of the live tables by archive_apartments, stored
+    as the column values of its apartment, address, image and visit rows.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_apartments"
+    )
+    apartment = models.JSONField(encoder=DjangoJSONEncoder)
+    address = models.JSONField(encoder=DjangoJSONEncoder)
+    images = models.JSONField(encoder=DjangoJSONEncoder, default=list)
+    visits = models.JSONField(encoder=DjangoJSONEncoder, default=list)
+    archived_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,232 @@
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db.backends.postgresql.psycopg_any import NumericRange
+from django.db.models import IntegerField, Q, QuerySet, Value
+from django.shortcuts import get_object_or_404
+
+from apartments.filters import ApartmentFilter
+from apartments.models import (
+    Apartment,
+    SavedSearch,
+    SavedSearchMatch,
+    get_saved_search_range,
+)
+
+# Filter name -> SavedSearch columns holding its lower and upper bound.
+SAVED_SEARCH_RANGES = {
+    "price": ("price_min", "price_max"),
+    "price_eur": ("price_eur_min", "price_eur_max"),
+    "surface": ("surface_min", "surface_max"),
+}
+# Apartment and address fields read by the ApartmentFilter filters; edits of
+# other fields never change which saved searches an apartment matches.
+SAVED_SEARCH_FIELDS = (
+    "price",
+    "price_eur",
+    "surface",
+    "currency",
+    "is_available",
+    "description",
+)
+SAVED_SEARCH_ADDRESS_FIELDS = (
+    "country",
+    "city",
+    "province",
+    "street",
+    "latitude",
+    "longitude",
+    "geohash",
+)
+INDEXED_FILTERS = {
+    "country",
+    *(
+        f"{field}__{lookup}"
+        for field in SAVED_SEARCH_RANGES
+        for lookup in ("gte", "lte")
+    ),
+}
+# Saved searches whose filters are checked in one UNION query.
+FILTERED_SEARCH_BATCH_SIZE = 100
+
+
+def list_saved_searches(user_id: int) -> QuerySet:
+    return SavedSearch.objects.filter(user_id=user_id).order_by("-created_at", "-id")
+
+
+def get_saved_search(saved_search_id: int, user_id: int) -> SavedSearch:
+    return get_object_or_404(SavedSearch, id=saved_search_id, user_id=user_id)
+
+
+def create_saved_search(filters: dict[str, str], user_id: int) -> SavedSearch:
+    """
+    Save ``filters``, validated ApartmentView query params, for ``user_id``.
+
+    The country and the price/surface ranges are copied into indexed columns;
+    open ends are stored as the widest value the column holds.
+    """
+    filterset = ApartmentFilter(data=filters, queryset=Apartment.objects.none())
+    filterset.is_valid()
+    cleaned_data = filterset.form.cleaned_data
+    bounds = {}
+    for field, (min_column, max_column) in SAVED_SEARCH_RANGES.items():
+        limit = _get_column_limit(max_column)
+        bounds[min_column] = _clamp(cleaned_data.get(f"{field}__gte"), 0, limit)
+        bounds[max_column] = _clamp(cleaned_data.get(f"{field}__lte"), limit, limit)
+    return SavedSearch.objects.create(
+        user_id=user_id,
+        filters=filters,
+        country=cleaned_data.get("country") or "",
+        **bounds,
+    )
+
+
+def list_saved_search_matches(user_id: int) -> QuerySet:
+    return (
+        SavedSearchMatch.objects.filter(user_id=user_id)
+        .select_related("apartment__address")
+        .order_by("-created_at", "-id")
+    )
+
+
+def match_saved_searches(
+    apartments: list[Apartment], previous_matches: set[tuple] = frozenset()
+) -> None:
+    """
+    Put ``apartments`` into the inbox of every saved search they now match.
+
+    ``previous_matches``, the find_saved_search_matches of the apartments
+    before an edit, are left out, so an edit only delivers the apartment to
+    searches it did not match before. Apartments already in a search's inbox
+    are skipped, as are the owner's own searches.
+    """
+    SavedSearchMatch.objects.bulk_create(
+        [
+            SavedSearchMatch(
+                saved_search_id=search_id, user_id=user_id, apartment_id=apartment_id
+            )
+            for search_id, user_id, apartment_id in find_saved_search_matches(
+                apartments
+            )
+            - previous_matches
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def find_saved_search_matches(apartments: list[Apartment]) -> set[tuple]:
+    """
+    Return the ``(search id, user id, apartment id)`` of every saved search
+    matching one of ``apartments``.
+
+    Candidate searches come from one query on the country and the
+    saved_search_ranges_idx range expressions, so searches that cannot match
+    are never looked at. Searches with other filters (text, location, ...)
+    are then checked by running those filters against their candidate
+    apartments, FILTERED_SEARCH_BATCH_SIZE searches per query.
+    """
+    apartments = [
+        apartment_obj for apartment_obj in apartments if apartment_obj.is_available
+    ]
+    if not apartments:
+        return set()
+
+    bound_columns = [
+        column for columns in SAVED_SEARCH_RANGES.values() for column in columns
+    ]
+    searches = (
+        SavedSearch.objects.alias(
+            **{
+                f"{field}_range": get_saved_search_range(*columns)
+                for field, columns in SAVED_SEARCH_RANGES.items()
+            }
+        )
+        .filter(reduce(or_, (_get_range_predicate(obj) for obj in apartments)))
+        .values("id", "user_id", "filters", "country", *bound_columns)
+    )
+    matches = set()
+    filtered_searches = []
+    for search in searches:
+        apartment_ids = [
+            apartment_obj.id
+            for apartment_obj in apartments
+            if _is_search_candidate(search, apartment_obj)
+        ]
+        if apartment_ids and set(search["filters"]) - INDEXED_FILTERS:
+            filtered_searches.append((search, apartment_ids))
+            continue
+        matches.update(
+            (search["id"], search["user_id"], apartment_id)
+            for apartment_id in apartment_ids
+        )
+    for start in range(0, len(filtered_searches), FILTERED_SEARCH_BATCH_SIZE):
+        matches.update(
+            _filter_search_matches(
+                filtered_searches[start : start + FILTERED_SEARCH_BATCH_SIZE]
+            )
+        )
+    return matches
+
+
+def _get_range_predicate(apartment_obj: Apartment) -> Q:
+    predicate = Q(country__in=["", apartment_obj.address.country])
+    for field, (min_column, max_column) in SAVED_SEARCH_RANGES.items():
+        value = getattr(apartment_obj, field)
+        if value is None:
+            # Without a EUR price only searches with no EUR range can match.
+            predicate &= Q(**{min_column: 0, max_column: _get_column_limit(max_column)})
+        else:
+            value_range = NumericRange(Decimal(value), Decimal(value), "[]")
+            predicate &= Q(**{f"{field}_range__contains": value_range})
+    return predicate & ~Q(user_id=apartment_obj.owner_id)
+
+
+def _is_search_candidate(search: dict, apartment_obj: Apartment) -> bool:
+    """Evaluate _get_range_predicate for one apartment on a fetched search row."""
+    if search["user_id"] == apartment_obj.owner_id:
+        return False
+    if search["country"] not in ("", apartment_obj.address.country):
+        return False
+    for field, (min_column, max_column) in SAVED_SEARCH_RANGES.items():
+        value = getattr(apartment_obj, field)
+        if value is None:
+            if (search[min_column], search[max_column]) != (
+                0,
+                _get_column_limit(max_column),
+            ):
+                return False
+        elif not search[min_column] <= Decimal(value) <= search[max_column]:
+            return False
+    return True
+
+
+def _filter_search_matches(searches: list[tuple[dict, list]]) -> set[tuple]:
+    """
+    Run the filters of each ``(search, candidate apartment ids)`` pair, all
+    in one UNION query, and return the matches as find_saved_search_matches.
+    """
+    querysets = []
+    for search, apartment_ids in searches:
+        apartments = Apartment.objects.filter(id__in=apartment_ids, is_available=True)
+        filterset = ApartmentFilter(data=search["filters"], queryset=apartments)
+        querysets.append(
+            filterset.qs.order_by().values_list(
+                Value(search["id"], output_field=IntegerField()),
+                Value(search["user_id"], output_field=IntegerField()),
+                "id",
+            )
+        )
+    return set(querysets[0].union(*querysets[1:], all=True))
+
+
+def _get_column_limit(column: str) -> Decimal:
+    field = SavedSearch._meta.get_field(column)
+    digits = field.max_digits - field.decimal_places
+    return Decimal(10) ** digits - Decimal(10) ** -field.decimal_places
+
+
+def _clamp(value: Decimal | None, default: Decimal, limit: Decimal) -> Decimal:
+    if value is None:
+        return default
+    return min(max(value, Decimal(0)), limit)
@@ -0,0 +1,54 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q, QuerySet
+
+SEARCH_CONFIG = "simple"
+# Words of a search; anything else would be tsquery syntax.
+SEARCH_WORD_RE = re.compile(r"\w+")
+SEARCH_ADDRESS_FIELDS = ("city", "province", "street")
+SEARCH_APARTMENT_FIELDS = ("description",)
+
+
+def search_apartments(apartments: QuerySet, text: str) -> QuerySet:
+    """
+    Filter apartments matching every word of ``text`` and order them by relevance.
+
+    Words match as prefixes, so ``descr`` finds "description". PostgreSQL
+    answers from the GIN-indexed search vector, which database triggers keep
+    up to date (migration 0018). Other databases fall back to case-insensitive
+    substring matching of every word, without ranking.
+    """
+    if connection.vendor == "postgresql":
+        words = SEARCH_WORD_RE.findall(text)
+        if not words:
+            return apartments
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        return (
+            apartments.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "id")
+        )
+
+    fields = SEARCH_APARTMENT_FIELDS + tuple(
+        f"address__{field}" for field in SEARCH_ADDRESS_FIELDS
+    )
+    words = text.split()
+    if not words:
+        return apartments
+    return apartments.filter(
+        reduce(
+            and_,
+            (
+                reduce(or_, (Q(**{f"{field}__icontains": word}) for field in fields))
+                for word in words
+            ),
+        )
+    )
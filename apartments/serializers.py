@@ -1,9 +1,14 @@
 from rest_framework import serializers
 
 from apartments.choices import CURRENCY_CHOICES, COUNTRY_CHOICES
-from apartments.models import Apartment, Address
-from apartments.services import get_main_image_url
+from apartments.filters import ApartmentFilter
+from apartments.models import Apartment, Address, SavedSearch, SavedSearchMatch
 from images.serializers import ApartmentImageOutputSimpleSerializer
+from livehere.fieldsets import SparseFieldsetSerializerMixin
+from livehere.renditions import get_rendition_url
+from livehere.rows import RowSerializer, file_url
+
+BULK_CREATE_MAX_APARTMENTS = 200
 
 
 class AddressInputSerializer(serializers.Serializer):
@@ -14,16 +19,28 @@ class AddressInputSerializer(serializers.Serializer):
     postal_code = serializers.CharField(max_length=10)
 
 
-class AddressOutputSerializer(serializers.ModelSerializer):
+class AddressOutputSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Address
-        fields = ["country", "street", "city", "province", "postal_code"]
+        fields = [
+            "country",
+            "street",
+            "city",
+            "province",
+            "postal_code",
+            "latitude",
+            "longitude",
+        ]
 
 
-class AddressSimpleOutputSerializer(serializers.ModelSerializer):
+class AddressSimpleOutputSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Address
-        fields = ["country", "province", "city"]
+        fields = ["country", "province", "city", "latitude", "longitude"]
 
 
 class ApartmentInputSerializer(serializers.Serializer):
@@ -37,7 +54,9 @@ class ApartmentInputSerializer(serializers.Serializer):
     address = AddressInputSerializer()
 
 
-class ApartmentOutputSerializer(serializers.ModelSerializer):
+class ApartmentOutputSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     address = AddressSimpleOutputSerializer()
     main_image = serializers.SerializerMethodField()
 
@@ -55,14 +74,22 @@ class ApartmentOutputSerializer(serializers.ModelSerializer):
         ]
 
     def get_main_image(self, obj):
-        return get_main_image_url(apartment_id=obj.id)
+        return get_rendition_url(
+            obj.main_image, obj.main_image_renditions, self.context.get("size")
+        )
+
+
+class ApartmentOutputRowSerializer(RowSerializer):
+    serializer_class = ApartmentOutputSerializer
+    converters = {"main_image": ("main_image", file_url(Apartment, "main_image"))}
+    rendition_fields = {"main_image": ("main_image", "main_image_renditions")}
 
 
-class ApartmentDetailOutputSerializer(serializers.ModelSerializer):
+class ApartmentDetailOutputSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     address = AddressOutputSerializer()
-    images = ApartmentImageOutputSimpleSerializer(
-        many=True, source="apartmentimage_set", read_only=True
-    )
+    images = ApartmentImageOutputSimpleSerializer(many=True, read_only=True)
 
     class Meta:
         model = Apartment
@@ -79,3 +106,56 @@ class ApartmentDetailOutputSerializer(serializers.ModelSerializer):
             "owner",
             "address",
         ]
+
+
+class ApartmentExportSerializer(serializers.ModelSerializer):
+    address = AddressOutputSerializer()
+
+    class Meta:
+        model = Apartment
+        fields = [
+            "id",
+            "surface",
+            "is_furnished",
+            "price",
+            "currency",
+            "price_eur",
+            "deposit",
+            "is_available",
+            "description",
+            "address",
+            "updated_at",
+        ]
+
+
+class ApartmentExportRowSerializer(RowSerializer):
+    serializer_class = ApartmentExportSerializer
+
+
+class SavedSearchInputSerializer(serializers.Serializer):
+    filters = serializers.DictField(child=serializers.CharField(), allow_empty=False)
+
+    def validate_filters(self, value: dict[str, str]) -> dict[str, str]:
+        unknown = set(value) - set(ApartmentFilter.base_filters)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown filters: {', '.join(sorted(unknown))}."
+            )
+        filterset = ApartmentFilter(data=value, queryset=Apartment.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        return {name: value[name] for name in sorted(value) if name != "ordering"}
+
+
+class SavedSearchOutputSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = ["id", "filters", "created_at"]
+
+
+class SavedSearchMatchOutputSerializer(serializers.ModelSerializer):
+    apartment = ApartmentOutputSerializer()
+
+    class Meta:
+        model = SavedSearchMatch
+        fields = ["id", "saved_search", "apartment", "created_at"]
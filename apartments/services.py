@@ -1,56 +1,404 @@
-from django.db.models import QuerySet
+import uuid
+from decimal import Decimal
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F, Prefetch, QuerySet
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from apartments.models import Apartment, Address
+from django.utils import timezone
+from apartments.archive import (
+    aget_archived_apartment,
+    aget_archived_apartment_version,
+    get_archived_apartment,
+    get_archived_apartment_version,
+)
+from apartments.exceptions import ApartmentVersionConflict
+from apartments.facets import (
+    apply_facet_changes,
+    get_apartment_facets,
+    rebuild_facet_counts,
+)
+from apartments.geo import encode_geohash, locate_address
+from apartments.models import Apartment, Address, ExchangeRate, SimilarApartment
 from images.models import ApartmentImage
+from apartments.saved_searches import (
+    SAVED_SEARCH_ADDRESS_FIELDS,
+    SAVED_SEARCH_FIELDS,
+    find_saved_search_matches,
+    match_saved_searches,
+)
+from apartments.similarity import (
+    SIMILARITY_ADDRESS_FIELDS,
+    SIMILARITY_FIELDS,
+    queue_similar_apartments_refresh,
+)
+
+ADDRESS_LOCATION_FIELDS = ("country", "city", "postal_code")
+APARTMENT_IMAGES_ORDERING = ("-is_main", "id")
 
 
 def list_apartments() -> QuerySet:
-    return Apartment.objects.filter(is_available=True)
+    return Apartment.objects.filter(is_available=True).select_related("address")
 
 
 def get_apartment_details(apartment_id: int) -> Apartment:
-    apartment_obj = Apartment.objects.filter(id=apartment_id).select_related("address")
-    return get_object_or_404(apartment_obj)
+    """
+    The live apartment, or else its archived copy rebuilt as an unsaved
+    Apartment, see apartments.archive.
+    """
+    apartment_obj = _get_apartment_details_queryset().filter(id=apartment_id).first()
+    if apartment_obj is None:
+        apartment_obj = get_archived_apartment(apartment_id)
+    if apartment_obj is None:
+        raise Http404("No Apartment matches the given query.")
+    return apartment_obj
+
+
+def get_apartment_version(apartment_id: int) -> int:
+    version = (
+        Apartment.objects.filter(id=apartment_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    if version is None:
+        version = get_archived_apartment_version(apartment_id)
+    if version is None:
+        raise Http404("No Apartment matches the given query.")
+    return version
+
+
+async def aget_apartment_details(apartment_id: int) -> Apartment:
+    apartment_obj = (
+        await _get_apartment_details_queryset().filter(id=apartment_id).afirst()
+    )
+    if apartment_obj is None:
+        apartment_obj = await aget_archived_apartment(apartment_id)
+    if apartment_obj is None:
+        raise Http404("No Apartment matches the given query.")
+    return apartment_obj
+
+
+async def aget_apartment_version(apartment_id: int) -> int:
+    version = (
+        await Apartment.objects.filter(id=apartment_id)
+        .values_list("version", flat=True)
+        .afirst()
+    )
+    if version is None:
+        version = await aget_archived_apartment_version(apartment_id)
+    if version is None:
+        raise Http404("No Apartment matches the given query.")
+    return version
+
+
+def list_similar_apartments(apartment_id: int) -> QuerySet:
+    return (
+        Apartment.objects.filter(
+            similar_to__apartment_id=apartment_id, is_available=True
+        )
+        .select_related("address")
+        .order_by("similar_to__rank")
+    )
 
 
 def get_apartment_advertisement_details(apartment_id: int, owner_id: int) -> Apartment:
-    apartment_obj = Apartment.objects.filter(
+    apartment_obj = _get_apartment_details_queryset().filter(
         id=apartment_id, owner_id=owner_id
-    ).select_related("address")
+    )
     return get_object_or_404(apartment_obj)
 
 
+def _get_apartment_details_queryset() -> QuerySet:
+    """
+    Apartments with everything ApartmentDetailOutputSerializer reads: the
+    address is joined and the images, main image first, are fetched into an
+    ``images`` list in one extra query. The owner is rendered by primary key
+    and needs no query.
+    """
+    images = ApartmentImage.objects.order_by(*APARTMENT_IMAGES_ORDERING)
+    return Apartment.objects.select_related("address").prefetch_related(
+        Prefetch("apartmentimage_set", queryset=images, to_attr="images")
+    )
+
+
 def list_owner_apartments(owner_id: int) -> QuerySet:
     return Apartment.objects.filter(owner_id=owner_id).select_related("address")
 
 
+@transaction.atomic
 def create_apartment(data: dict[str, any], owner: int) -> Apartment:
     address_data = data.pop("address")
+    address_data.update(_get_address_coordinates(address_data))
     address_obj = Address.objects.create(**address_data)
     data["address"] = address_obj
     data["owner_id"] = owner
+    data["price_eur"] = _get_price_eur(price=data["price"], currency=data["currency"])
     apartment_obj = Apartment.objects.create(**data)
+    _on_apartments_written(
+        removed_facets=[],
+        apartments=[apartment_obj],
+        refresh_similar=True,
+    )
     return apartment_obj
 
 
+@transaction.atomic
+def bulk_create_apartments(data: list[dict[str, any]], owner: int) -> list[Apartment]:
+    eur_rates = dict(ExchangeRate.objects.values_list("currency", "eur_rate"))
+    addresses, apartments = [], []
+    for apartment_data in data:
+        address_data = apartment_data.pop("address")
+        address_data.update(_get_address_coordinates(address_data))
+        address_obj = Address(**address_data)
+        price_eur = _convert_to_eur(
+            price=apartment_data["price"],
+            eur_rate=eur_rates.get(apartment_data["currency"]),
+        )
+        addresses.append(address_obj)
+        apartments.append(
+            Apartment(
+                **apartment_data,
+                address=address_obj,
+                owner_id=owner,
+                price_eur=price_eur,
+            )
+        )
+    Address.objects.bulk_create(addresses)
+    Apartment.objects.bulk_create(apartments)
+    _on_apartments_written(
+        removed_facets=[], apartments=apartments, refresh_similar=True
+    )
+    return apartments
+
+
+@transaction.atomic
 def update_apartment(data: dict[str, any], apartment_obj: Apartment) -> None:
-    if "address" in data:
-        address_data = data.pop("address")
-        _update_apartment_data(apartment_obj.address, address_data)
+    """
+    Write only the fields of ``data`` that differ from ``apartment_obj``.
+
+    The apartment row is updated only while its version still matches the one
+    ``apartment_obj`` was read with, so a concurrent edit raises
+    ApartmentVersionConflict instead of being overwritten. Nothing is written
+    when no field changed.
+    """
+    old_facets = get_apartment_facets(apartment_obj)
+    address_obj = apartment_obj.address
+    address_changes = _get_changed_fields(address_obj, data.pop("address", {}))
+    if any(field in address_changes for field in ADDRESS_LOCATION_FIELDS):
+        location = {
+            field: address_changes.get(field, getattr(address_obj, field))
+            for field in ADDRESS_LOCATION_FIELDS
+        }
+        address_changes.update(
+            _get_changed_fields(address_obj, _get_address_coordinates(location))
+        )
+
+    apartment_changes = _get_changed_fields(apartment_obj, data)
+    if "price" in apartment_changes or "currency" in apartment_changes:
+        price_eur = _get_price_eur(
+            price=apartment_changes.get("price", apartment_obj.price),
+            currency=apartment_changes.get("currency", apartment_obj.currency),
+        )
+        apartment_changes.update(
+            _get_changed_fields(apartment_obj, {"price_eur": price_eur})
+        )
+    if not address_changes and not apartment_changes:
+        return
+    match_searches = any(
+        field in apartment_changes for field in SAVED_SEARCH_FIELDS
+    ) or any(field in address_changes for field in SAVED_SEARCH_ADDRESS_FIELDS)
+    # Read before the write, while the row still holds the old values.
+    previous_matches = (
+        find_saved_search_matches([apartment_obj]) if match_searches else set()
+    )
+
+    apartment_changes["updated_at"] = timezone.now()
+    updated = Apartment.objects.filter(
+        id=apartment_obj.id, version=apartment_obj.version
+    ).update(**apartment_changes, version=F("version") + 1)
+    if not updated:
+        raise ApartmentVersionConflict()
+    for key, value in apartment_changes.items():
+        setattr(apartment_obj, key, value)
+    apartment_obj.version += 1
+    _update_apartment_data(address_obj, address_changes)
+
+    _on_apartments_written(
+        removed_facets=[old_facets],
+        apartments=[apartment_obj],
+        refresh_similar=any(field in apartment_changes for field in SIMILARITY_FIELDS)
+        or any(field in address_changes for field in SIMILARITY_ADDRESS_FIELDS),
+        match_searches=match_searches,
+        previous_matches=previous_matches,
+    )
 
-    _update_apartment_data(apartment_obj, data)
+
+def delete_apartment(apartment_obj: Apartment) -> None:
+    facets = get_apartment_facets(apartment_obj)
+    # The deletion cascades to the lists holding the apartment; refill them.
+    queue_similar_apartments_refresh(
+        list(
+            SimilarApartment.objects.filter(similar_id=apartment_obj.id).values_list(
+                "apartment_id", flat=True
+            )
+        )
+    )
+    apartment_obj.delete()
+    apply_facet_changes(removed=[facets], added=[])
+
+
+def _on_apartments_written(
+    removed_facets: list[dict[str, str]],
+    apartments: list[Apartment],
+    refresh_similar: bool,
+    match_searches: bool = True,
+    previous_matches: set[tuple] = frozenset(),
+) -> None:
+    """
+    Queue the similar apartments refresh with the write of ``apartments``, and
+    update the facet counts and saved search inboxes once it commits, so they
+    never see an uncommitted or rolled back write and do not hold the write's
+    locks while they run.
+    """
+    if refresh_similar:
+        queue_similar_apartments_refresh(
+            [apartment_obj.id for apartment_obj in apartments]
+        )
+    added_facets = [get_apartment_facets(apartment_obj) for apartment_obj in apartments]
+    transaction.on_commit(
+        partial(apply_facet_changes, removed=removed_facets, added=added_facets)
+    )
+    if match_searches:
+        transaction.on_commit(
+            partial(match_saved_searches, apartments, previous_matches)
+        )
 
 
 def _update_apartment_data(obj: Apartment | Address, data: dict[str, any]) -> None:
-    for key, value in data.items():
+    changed_fields = _get_changed_fields(obj, data)
+    if not changed_fields:
+        return
+    for key, value in changed_fields.items():
         setattr(obj, key, value)
-    obj.save()
+    obj.save(update_fields=list(changed_fields))
+
+
+def _get_changed_fields(
+    obj: Apartment | Address, data: dict[str, any]
+) -> dict[str, any]:
+    return {key: value for key, value in data.items() if getattr(obj, key) != value}
+
+
+def _get_address_coordinates(address_data: dict[str, any]) -> dict[str, any]:
+    coordinates = locate_address(
+        country=address_data["country"],
+        city=address_data["city"],
+        postal_code=address_data["postal_code"],
+    )
+    if coordinates is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    latitude, longitude = coordinates
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": encode_geohash(latitude, longitude),
+    }
+
+
+def fill_missing_address_coordinates(batch_size: int = 1000) -> int:
+    addresses = Address.objects.filter(latitude__isnull=True).order_by("id")
+    located, last_id = 0, 0
+    while batch := list(addresses.filter(id__gt=last_id)[:batch_size]):
+        last_id = batch[-1].id
+        for address_obj in batch:
+            for key, value in _get_address_coordinates(vars(address_obj)).items():
+                setattr(address_obj, key, value)
+        batch = [address_obj for address_obj in batch if address_obj.geohash]
+        Address.objects.bulk_update(batch, ["latitude", "longitude", "geohash"])
+        located += len(batch)
+    return located
+
+
+def _get_price_eur(price: Decimal | str, currency: str) -> Decimal | None:
+    eur_rate = (
+        ExchangeRate.objects.filter(currency=currency)
+        .values_list("eur_rate", flat=True)
+        .first()
+    )
+    return _convert_to_eur(price=price, eur_rate=eur_rate)
+
+
+def _convert_to_eur(price: Decimal | str, eur_rate: Decimal | None) -> Decimal | None:
+    if eur_rate is None:
+        return None
+    return (Decimal(price) * eur_rate).quantize(Decimal("0.01"))
+
+
+@transaction.atomic
+def normalize_apartment_prices(currencies: list[str] | None = None) -> int:
+    """
+    Recompute ``price_eur`` from the current exchange rates.
+
+    Only apartments whose EUR price changes are written. Their version and
+    updated_at are bumped like on any edit, so cached details and ETags do not
+    serve the old price, and once the rewrite commits they are delivered to
+    the saved searches their new price makes them match.
+    """
+    exchange_rates = ExchangeRate.objects.all()
+    apartments = Apartment.objects.all()
+    if currencies:
+        exchange_rates = exchange_rates.filter(currency__in=currencies)
+        apartments = apartments.filter(currency__in=currencies)
+
+    # Apartments whose EUR price changes, with their new EUR price.
+    stale_prices = [
+        (
+            apartments.filter(currency=exchange_rate.currency).exclude(
+                price_eur=F("price") * exchange_rate.eur_rate
+            ),
+            F("price") * exchange_rate.eur_rate,
+        )
+        for exchange_rate in exchange_rates
+    ]
+    stale_prices.append(
+        (
+            apartments.exclude(
+                currency__in=ExchangeRate.objects.values("currency")
+            ).filter(price_eur__isnull=False),
+            None,
+        )
+    )
+    price_changes = [
+        (list(stale.values_list("id", flat=True)), price_eur)
+        for stale, price_eur in stale_prices
+    ]
+    changed_ids = [apartment_id for ids, _ in price_changes for apartment_id in ids]
+    # Read before the write, while the rows still hold the old prices.
+    previous_matches = find_saved_search_matches(_get_apartments(changed_ids))
+
+    updated_at = timezone.now()
+    normalized = 0
+    for ids, price_eur in price_changes:
+        updated = Apartment.objects.filter(id__in=ids).update(
+            price_eur=price_eur, version=F("version") + 1, updated_at=updated_at
+        )
+        if price_eur is not None:
+            normalized += updated
+    rebuild_facet_counts()
+    transaction.on_commit(
+        partial(_match_saved_searches_of, changed_ids, previous_matches)
+    )
+    return normalized
+
+
+def _match_saved_searches_of(
+    apartment_ids: list[uuid.UUID], previous_matches: set[tuple]
+) -> None:
+    match_saved_searches(_get_apartments(apartment_ids), previous_matches)
 
 
-def get_main_image_url(apartment_id: int) -> str | None:
-    main_image_instance = ApartmentImage.objects.filter(
-        apartment_id=apartment_id, is_main=True
-    ).first()
-    if main_image_instance:
-        return main_image_instance.image.url
-    return None
+def _get_apartments(apartment_ids: list[uuid.UUID]) -> list[Apartment]:
+    return list(
+        Apartment.objects.filter(id__in=apartment_ids).select_related("address")
+    )
@@ -0,0 +1,266 @@
+import math
+import uuid
+
+import numpy as np
+from django.db import transaction
+
+from apartments.models import Apartment, SimilarApartment, SimilarApartmentRefresh
+
+SIMILAR_APARTMENTS_K = 10
+SIMILARITY_BATCH_SIZE = 1024
+SIMILARITY_REFRESH_BATCH_SIZE = 1000
+SIMILARITY_FIELDS = ("price_eur", "surface", "is_furnished", "is_available")
+SIMILARITY_ADDRESS_FIELDS = ("latitude", "longitude")
+# Fixed weights rather than per-run standardization keep stored distances
+# comparable between the batch job and incremental refreshes. With them a
+# doubled price per m² (log 2 * 1.5 ~ 1) is about as far as a 60% larger
+# surface, an unfurnished flat, or 320 km (chord 0.05 on the unit sphere * 20).
+PRICE_PER_M2_WEIGHT = 1.5
+SURFACE_WEIGHT = 2.0
+FURNISHED_WEIGHT = 1.0
+LOCATION_WEIGHT = 20.0
+
+
+def rebuild_similar_apartments(k: int = SIMILAR_APARTMENTS_K) -> int:
+    """
+    Recompute the neighbours of every available apartment from scratch,
+    which also covers every refresh queued before it started.
+    """
+    queued = list(SimilarApartmentRefresh.objects.values_list("id", flat=True))
+    apartment_ids, features = _load_features()
+    neighbours = _nearest_neighbours(features, np.arange(len(apartment_ids)), k)
+    with transaction.atomic():
+        SimilarApartment.objects.all().delete()
+        _store_neighbours(apartment_ids, neighbours)
+        SimilarApartmentRefresh.objects.filter(id__in=queued).delete()
+    return len(apartment_ids)
+
+
+def queue_similar_apartments_refresh(apartment_ids: list[uuid.UUID]) -> None:
+    """
+    Queue the neighbour lists touched by a change of ``apartment_ids`` for the
+    next refresh_queued_similar_apartments run.
+
+    Queueing is one insert, so writes never pay for loading every apartment's
+    features; call it in the writing transaction so a committed change is
+    never lost.
+    """
+    SimilarApartmentRefresh.objects.bulk_create(
+        SimilarApartmentRefresh(apartment_id=apartment_id)
+        for apartment_id in apartment_ids
+    )
+
+
+def refresh_queued_similar_apartments(
+    batch_size: int = SIMILARITY_REFRESH_BATCH_SIZE, k: int = SIMILAR_APARTMENTS_K
+) -> int:
+    """
+    Run refresh_similar_apartments over the queued apartments, ``batch_size``
+    queue entries at a time, and return the number of entries processed.
+
+    Each batch loads the features once, however many writes it covers.
+    Entries queued while a batch runs are left for the next one.
+    """
+    processed = 0
+    while True:
+        queued = list(
+            SimilarApartmentRefresh.objects.order_by("id").values_list(
+                "id", "apartment_id"
+            )[:batch_size]
+        )
+        if not queued:
+            return processed
+        with transaction.atomic():
+            refresh_similar_apartments(
+                list(dict.fromkeys(apartment_id for _, apartment_id in queued)), k
+            )
+            SimilarApartmentRefresh.objects.filter(
+                id__in=[queue_id for queue_id, _ in queued]
+            ).delete()
+        processed += len(queued)
+
+
+def refresh_similar_apartments(
+    changed_ids: list[uuid.UUID], k: int = SIMILAR_APARTMENTS_K
+) -> None:
+    """
+    Update the neighbour lists touched by a change of ``changed_ids``.
+
+    Changed apartments, and the apartments whose list holds a changed one,
+    get a fresh list, so lists losing an apartment that is no longer close
+    or available are refilled. Every other list that a changed apartment now
+    beats is re-ranked with it.
+
+    This loads the features of every available apartment; writes should go
+    through queue_similar_apartments_refresh instead.
+    """
+    apartment_ids, features = _load_features()
+    positions = {
+        apartment_id: index for index, apartment_id in enumerate(apartment_ids)
+    }
+    listing_ids = set(
+        SimilarApartment.objects.filter(similar_id__in=changed_ids).values_list(
+            "apartment_id", flat=True
+        )
+    )
+    recomputed_ids = [*changed_ids, *(listing_ids - set(changed_ids))]
+    changed, recomputed = (
+        np.array(
+            [
+                positions[apartment_id]
+                for apartment_id in ids
+                if apartment_id in positions
+            ],
+            dtype=np.intp,
+        )
+        for ids in (changed_ids, recomputed_ids)
+    )
+
+    with transaction.atomic():
+        SimilarApartment.objects.filter(apartment_id__in=recomputed_ids).delete()
+        if not len(recomputed):
+            return
+        neighbours = _nearest_neighbours(features, recomputed, k)
+        _store_neighbours(apartment_ids, neighbours)
+        _insert_into_neighbour_lists(apartment_ids, features, changed, recomputed, k)
+
+
+def _load_features() -> tuple[list[uuid.UUID], np.ndarray]:
+    rows = list(
+        Apartment.objects.filter(is_available=True, price_eur__isnull=False)
+        .order_by("id")
+        .values_list(
+            "id",
+            "price_eur",
+            "surface",
+            "is_furnished",
+            "address__latitude",
+            "address__longitude",
+        )
+    )
+    apartment_ids = [row[0] for row in rows]
+    if not rows:
+        return apartment_ids, np.empty((0, 6))
+
+    values = np.array(
+        [
+            [float(price), float(surface), float(furnished)]
+            for _, price, surface, furnished, _, _ in rows
+        ]
+    )
+    attributes = np.column_stack(
+        [
+            np.log(values[:, 0] / values[:, 1]) * PRICE_PER_M2_WEIGHT,
+            np.log(values[:, 1]) * SURFACE_WEIGHT,
+            values[:, 2] * FURNISHED_WEIGHT,
+        ]
+    )
+
+    location = np.zeros((len(rows), 3))
+    for index, (*_, latitude, longitude) in enumerate(rows):
+        if latitude is None or longitude is None:
+            # Unlocated apartments sit at the centre, equally far from all others.
+            continue
+        lat, lon = math.radians(latitude), math.radians(longitude)
+        location[index] = (
+            math.cos(lat) * math.cos(lon),
+            math.cos(lat) * math.sin(lon),
+            math.sin(lat),
+        )
+    return apartment_ids, np.hstack([attributes, location * LOCATION_WEIGHT])
+
+
+def _pairwise_distances(features: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    squared_norms = np.einsum("ij,ij->i", features, features)
+    distances = (
+        squared_norms[rows, None]
+        + squared_norms[None, :]
+        - 2 * features[rows] @ features.T
+    )
+    return np.sqrt(np.maximum(distances, 0))
+
+
+def _nearest_neighbours(
+    features: np.ndarray, rows: np.ndarray, k: int
+) -> list[tuple[int, np.ndarray, np.ndarray]]:
+    """Return ``(row, neighbour rows, distances)`` for ``rows``, nearest first."""
+    k = min(k, len(features) - 1)
+    neighbours = []
+    if k <= 0:
+        return neighbours
+    for start in range(0, len(rows), SIMILARITY_BATCH_SIZE):
+        batch = rows[start : start + SIMILARITY_BATCH_SIZE]
+        distances = _pairwise_distances(features, batch)
+        distances[np.arange(len(batch)), batch] = np.inf
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind="stable")
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+        neighbours.extend(zip(batch, nearest, nearest_distances))
+    return neighbours
+
+
+def _insert_into_neighbour_lists(
+    apartment_ids: list[uuid.UUID],
+    features: np.ndarray,
+    changed: np.ndarray,
+    recomputed: np.ndarray,
+    k: int,
+) -> None:
+    positions = {apartment_id: row for row, apartment_id in enumerate(apartment_ids)}
+    # Lists shorter than k accept any candidate, full ones only closer ones.
+    worst = np.full(len(apartment_ids), np.inf)
+    for apartment_id, distance in SimilarApartment.objects.filter(
+        rank=k - 1
+    ).values_list("apartment_id", "distance"):
+        if apartment_id in positions:
+            worst[positions[apartment_id]] = distance
+    worst[recomputed] = -np.inf
+
+    candidates = {}
+    for changed_row, distances in zip(changed, _pairwise_distances(features, changed)):
+        for row in np.flatnonzero(distances < worst):
+            candidates.setdefault(apartment_ids[row], []).append(
+                (float(distances[row]), apartment_ids[changed_row])
+            )
+    if not candidates:
+        return
+
+    lists = {apartment_id: [] for apartment_id in candidates}
+    for apartment_id, similar_id, distance in SimilarApartment.objects.filter(
+        apartment_id__in=candidates
+    ).values_list("apartment_id", "similar_id", "distance"):
+        lists[apartment_id].append((distance, similar_id))
+    SimilarApartment.objects.filter(apartment_id__in=candidates).delete()
+    SimilarApartment.objects.bulk_create(
+        SimilarApartment(
+            apartment_id=apartment_id,
+            similar_id=similar_id,
+            rank=rank,
+            distance=distance,
+        )
+        for apartment_id, entries in lists.items()
+        for rank, (distance, similar_id) in enumerate(
+            sorted(entries + candidates[apartment_id])[:k]
+        )
+    )
+
+
+def _store_neighbours(
+    apartment_ids: list[uuid.UUID],
+    neighbours: list[tuple[int, np.ndarray, np.ndarray]],
+) -> None:
+    SimilarApartment.objects.bulk_create(
+        (
+            SimilarApartment(
+                apartment_id=apartment_ids[row],
+                similar_id=apartment_ids[similar_row],
+                rank=rank,
+                distance=float(distance),
+            )
+            for row, similar_rows, distances in neighbours
+            for rank, (similar_row, distance) in enumerate(zip(similar_rows, distances))
+        ),
+        batch_size=5000,
+    )
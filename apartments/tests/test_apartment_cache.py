@@ -0,0 +1,54 @@
+import uuid
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from apartments.cache import get_apartment_detail_payload, _payload_key
+
+
+class TestApartmentDetailCache:
+    def test_get_apartment_detail_payload_build_payload_once(self):
+        apartment_id = uuid.uuid4()
+        build = mock.Mock(return_value={"id": str(apartment_id)})
+
+        first = get_apartment_detail_payload(
+            apartment_id=apartment_id, version=1, build=build
+        )
+        second = get_apartment_detail_payload(
+            apartment_id=apartment_id, version=1, build=build
+        )
+
+        assert first == second == {"id": str(apartment_id)}
+        build.assert_called_once()
+
+    def test_get_apartment_detail_payload_rebuild_new_version(self):
+        apartment_id = uuid.uuid4()
+        get_apartment_detail_payload(
+            apartment_id=apartment_id, version=1, build=lambda: {"deposit": "500.00"}
+        )
+
+        payload = get_apartment_detail_payload(
+            apartment_id=apartment_id, version=2, build=lambda: {"deposit": "600.00"}
+        )
+
+        assert payload == {"deposit": "600.00"}
+
+    def test_get_apartment_detail_payload_wait_for_worker_holding_rebuild_lock(
+        self,
+    ):
+        apartment_id = uuid.uuid4()
+        payload_key = _payload_key(apartment_id, 1)
+        cache.add(f"{payload_key}:lock", True)
+        build = mock.Mock(return_value={"rebuilt": True})
+
+        def finish_rebuild(seconds: float) -> None:
+            cache.set(payload_key, {"rebuilt": False})
+
+        with mock.patch("apartments.cache.time.sleep", side_effect=finish_rebuild):
+            payload = get_apartment_detail_payload(
+                apartment_id=apartment_id, version=1, build=build
+            )
+
+        assert payload == {"rebuilt": False}
+        build.assert_not_called()
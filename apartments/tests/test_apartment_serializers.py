@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+
+from apartments.models import Apartment, Address
+from apartments.serializers import (
+    ApartmentOutputRowSerializer,
+    ApartmentOutputSerializer,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def apartments() -> list[Apartment]:
+    owner = User.objects.create_user(username="testuser123", password="testpassword123")
+    apartments = []
+    for i, (price, latitude, main_image) in enumerate(
+        [("1000", 52.2297, "images/test_0.jpg"), ("1234.5", None, None)]
+    ):
+        address_obj = Address.objects.create(
+            street="teststreet",
+            city="testcity",
+            province="testprovince",
+            postal_code="11-111",
+            country="Poland",
+            latitude=latitude,
+            longitude=latitude,
+        )
+        apartments.append(
+            Apartment.objects.create(
+                price=price,
+                currency="EUR",
+                deposit="500",
+                description="description",
+                address=address_obj,
+                owner=owner,
+                is_furnished=bool(i),
+                surface="99.5",
+                main_image=main_image,
+            )
+        )
+    return apartments
+
+
+@pytest.mark.django_db
+class TestApartmentOutputRowSerializer:
+    def test_row_serializer_render_same_json_as_model_serializer(
+        self, apartments: list[Apartment]
+    ):
+        row_serializer = ApartmentOutputRowSerializer()
+        queryset = Apartment.objects.order_by("price")
+        rows = queryset.values(*row_serializer.lookups)
+
+        expected = ApartmentOutputSerializer(
+            queryset.select_related("address"), many=True
+        ).data
+
+        assert JSONRenderer().render(row_serializer.serialize(rows)) == (
+            JSONRenderer().render(expected)
+        )
+
+    def test_row_serializer_render_selected_fields_only(
+        self, apartments: list[Apartment]
+    ):
+        row_serializer = ApartmentOutputRowSerializer(
+            fields={"price": None, "address": {"latitude": None}}
+        )
+        rows = Apartment.objects.order_by("price").values(*row_serializer.lookups)
+
+        assert row_serializer.lookups == ["price", "address__latitude"]
+        assert row_serializer.serialize(rows) == [
+            {"price": "1000.00", "address": {"latitude": 52.2297}},
+            {"price": "1234.50", "address": {"latitude": None}},
+        ]
+
+    @pytest.mark.parametrize("size", ["thumb", "card"])
+    def test_row_serializer_render_same_rendition_as_model_serializer(
+        self, size: str, apartments: list[Apartment]
+    ):
+        Apartment.objects.filter(id=apartments[0].id).update(
+            main_image_renditions={"thumb": "images/renditions/test_0_thumb.jpg"}
+        )
+        row_serializer = ApartmentOutputRowSerializer(size=size)
+        queryset = Apartment.objects.order_by("price")
+        rows = queryset.values(*row_serializer.lookups)
+
+        expected = ApartmentOutputSerializer(
+            queryset.select_related("address"), many=True, context={"size": size}
+        ).data
+        data = row_serializer.serialize(rows)
+
+        assert JSONRenderer().render(data) == JSONRenderer().render(expected)
+        assert data[0]["main_image"].endswith(
+            "test_0_thumb.jpg" if size == "thumb" else "test_0.jpg"
+        )
+        assert data[1]["main_image"] is None
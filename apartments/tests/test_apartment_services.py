@@ -1,18 +1,46 @@
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.http import Http404
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from apartments.models import Apartment, Address
+from apartments.exceptions import ApartmentVersionConflict
+from apartments.archive import archive_unavailable_apartments
+from apartments.models import (
+    Apartment,
+    Address,
+    ArchivedApartment,
+    ExchangeRate,
+    SavedSearchMatch,
+    SimilarApartment,
+    SimilarApartmentRefresh,
+)
 from apartments.services import (
     list_apartments,
     get_apartment_details,
+    get_apartment_version,
     list_owner_apartments,
     create_apartment,
+    delete_apartment,
     _update_apartment_data,
     update_apartment,
+    normalize_apartment_prices,
+)
+from apartments.saved_searches import (
+    create_saved_search,
+    find_saved_search_matches,
+    list_saved_search_matches,
 )
+from apartments.similarity import (
+    rebuild_similar_apartments,
+    refresh_queued_similar_apartments,
+)
+from images.models import ApartmentImage
+from visits.models import Visit
 
 User = get_user_model()
 
@@ -104,6 +132,125 @@ class TestApartmentServices:
         owner_apartments = Apartment.objects.filter(owner_id=user.id)
         assert created_apartment in owner_apartments
 
+    def test_create_apartment_locate_address_in_gazetteer(self, user: User):
+        data = {
+            "surface": "100.00",
+            "price": "2000.00",
+            "currency": "PLN",
+            "deposit": "1000.00",
+            "address": {
+                "country": "Poland",
+                "street": "teststreet",
+                "city": "Krakow",
+                "province": "testprovince",
+                "postal_code": "30-001",
+            },
+        }
+        created_apartment = create_apartment(data=data, owner=user.id)
+        address = Address.objects.get(id=created_apartment.address_id)
+
+        assert (address.latitude, address.longitude) == (50.0647, 19.945)
+        assert address.geohash.startswith("u2yhv")
+
+    def test_update_apartment_relocate_address_if_city_changed(
+        self, apartment: Apartment
+    ):
+        update_apartment(data={"address": {"city": "Gdańsk"}}, apartment_obj=apartment)
+        address = Address.objects.get(id=apartment.address_id)
+
+        assert (address.latitude, address.longitude) == (54.352, 18.6466)
+
+    def test_create_apartment_store_price_in_eur(self, user: User):
+        ExchangeRate.objects.update_or_create(
+            currency="PLN", defaults={"eur_rate": Decimal("0.25")}
+        )
+        data = {
+            "surface": "100.00",
+            "price": "2000.00",
+            "currency": "PLN",
+            "deposit": "1000.00",
+            "address": {
+                "country": "Poland",
+                "street": "teststreet",
+                "city": "testcity",
+                "province": "testprovince",
+                "postal_code": "22-222",
+            },
+        }
+        created_apartment = create_apartment(data=data, owner=user.id)
+        created_apartment.refresh_from_db()
+
+        assert created_apartment.price_eur == Decimal("500.00")
+
+    def test_normalize_apartment_prices_apply_new_exchange_rate(
+        self, apartment: Apartment
+    ):
+        ExchangeRate.objects.filter(currency="EUR").update(eur_rate=Decimal("2"))
+        normalize_apartment_prices(currencies=["EUR"])
+        updated_at = apartment.updated_at
+        apartment.refresh_from_db()
+
+        assert apartment.price_eur == Decimal("2000.00")
+        assert apartment.version == 2
+        assert apartment.updated_at > updated_at
+
+    def test_normalize_apartment_prices_leave_unchanged_prices_alone(
+        self, apartment: Apartment
+    ):
+        normalize_apartment_prices(currencies=["EUR"])
+        normalize_apartment_prices(currencies=["EUR"])
+        apartment.refresh_from_db()
+
+        assert apartment.version == 2
+
+    def test_update_apartment_bump_version(self, apartment: Apartment):
+        update_apartment(data={"deposit": Decimal("600")}, apartment_obj=apartment)
+
+        assert apartment.version == 2
+        assert Apartment.objects.get(id=apartment.id).version == 2
+
+    def test_update_apartment_write_only_changed_columns(self, apartment: Apartment):
+        with CaptureQueriesContext(connection) as queries:
+            update_apartment(
+                data={"deposit": Decimal("600"), "description": "description"},
+                apartment_obj=apartment,
+            )
+
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        apartment_update = next(sql for sql in updates if "apartments_apartment" in sql)
+        assert '"deposit"' in apartment_update
+        assert '"description"' not in apartment_update
+        assert not any("apartments_address" in sql for sql in updates)
+
+    def test_update_apartment_skip_writes_if_nothing_changed(
+        self, apartment: Apartment
+    ):
+        apartment = Apartment.objects.select_related("address").get(id=apartment.id)
+        with CaptureQueriesContext(connection) as queries:
+            update_apartment(
+                data={"deposit": Decimal("500.00"), "address": {"city": "testcity"}},
+                apartment_obj=apartment,
+            )
+
+        assert not any(
+            query["sql"].startswith(("UPDATE", "INSERT")) for query in queries
+        )
+        assert Apartment.objects.get(id=apartment.id).version == 1
+
+    def test_update_apartment_raise_conflict_for_stale_version(
+        self, apartment: Apartment
+    ):
+        stale_apartment = Apartment.objects.get(id=apartment.id)
+        update_apartment(data={"deposit": Decimal("600")}, apartment_obj=apartment)
+
+        with pytest.raises(ApartmentVersionConflict):
+            update_apartment(
+                data={"deposit": Decimal("700"), "address": {"city": "stalecity"}},
+                apartment_obj=stale_apartment,
+            )
+        assert Apartment.objects.get(id=apartment.id).deposit == Decimal("600")
+        assert Address.objects.get(id=apartment.address_id).city == "testcity"
+
     def test__update_apartment_data_update_apartment_if_data_is_valid(
         self, apartment: Apartment
     ):
@@ -124,6 +271,12 @@ class TestApartmentServices:
         updated_apartment.pop("address_id", None)
         updated_apartment.pop("id", None)
         updated_apartment.pop("owner_id", None)
+        updated_apartment.pop("main_image", None)
+        updated_apartment.pop("main_image_renditions", None)
+        updated_apartment.pop("search_vector", None)
+        updated_apartment.pop("price_eur", None)
+        updated_apartment.pop("version", None)
+        updated_apartment.pop("updated_at", None)
         assert updated_apartment == data
 
     def test_update_apartment_with_address_update_apartment_if_data_is_valid(
@@ -150,4 +303,316 @@ class TestApartmentServices:
         updated_apartment_data.pop("address_id", None)
         updated_apartment_data.pop("id")
         updated_apartment_data.pop("owner_id")
+        updated_apartment_data.pop("main_image")
+        updated_apartment_data.pop("main_image_renditions")
+        updated_apartment_data.pop("search_vector")
+        updated_apartment_data.pop("price_eur")
+        updated_apartment_data.pop("version")
+        updated_apartment_data.pop("updated_at")
         assert updated_apartment_data == data
+
+
+def similar_apartment_data(price: str, surface: str, city: str) -> dict:
+    return {
+        "surface": Decimal(surface),
+        "price": Decimal(price),
+        "currency": "EUR",
+        "deposit": Decimal("1000.00"),
+        "description": "description",
+        "address": {
+            "country": "Poland",
+            "street": "teststreet",
+            "city": city,
+            "province": "testprovince",
+            "postal_code": "00-001",
+        },
+    }
+
+
+def get_similar_ids() -> dict:
+    similar_ids = {}
+    for apartment_id, similar_id in SimilarApartment.objects.order_by(
+        "apartment_id", "rank"
+    ).values_list("apartment_id", "similar_id"):
+        similar_ids.setdefault(apartment_id, []).append(similar_id)
+    return similar_ids
+
+
+@pytest.mark.django_db
+class TestSimilarApartments:
+    def test_rebuild_similar_apartments_rank_closest_apartments_first(self, user: User):
+        listing, pricier, farther, different = [
+            create_apartment(data=similar_apartment_data(*row), owner=user.id)
+            for row in [
+                ("2000", "100", "Warsaw"),
+                ("2200", "100", "Warsaw"),
+                ("2000", "100", "Gdańsk"),
+                ("9000", "40", "Gdańsk"),
+            ]
+        ]
+
+        rebuild_similar_apartments(k=2)
+
+        assert get_similar_ids()[listing.id] == [pricier.id, farther.id]
+
+    @pytest.mark.parametrize("k", [2, 10])
+    def test_refresh_queued_similar_apartments_match_full_rebuild(
+        self, k: int, user: User
+    ):
+        apartments = [
+            create_apartment(data=similar_apartment_data(*row), owner=user.id)
+            for row in [
+                ("2000", "100", "Warsaw"),
+                ("2200", "100", "Warsaw"),
+                ("2000", "100", "Gdańsk"),
+                ("9000", "40", "Gdańsk"),
+                ("3000", "60", "Krakow"),
+            ]
+        ]
+        refresh_queued_similar_apartments(k=k)
+        update_apartment(
+            data={"price": Decimal("2100")},
+            apartment_obj=get_apartment_details(apartments[3].id),
+        )
+        refresh_queued_similar_apartments(k=k)
+        update_apartment(
+            data={"is_available": False},
+            apartment_obj=get_apartment_details(apartments[1].id),
+        )
+        delete_apartment(get_apartment_details(apartments[2].id))
+        refresh_queued_similar_apartments(k=k)
+        incremental = get_similar_ids()
+
+        rebuild_similar_apartments(k=k)
+
+        assert incremental == get_similar_ids()
+        assert len(incremental[apartments[0].id]) == 2
+        assert not SimilarApartmentRefresh.objects.exists()
+
+    def test_update_apartment_queue_similar_apartments_refresh_only(
+        self, apartment: Apartment
+    ):
+        with CaptureQueriesContext(connection) as update_queries:
+            update_apartment(
+                data={"price": Decimal("1200")},
+                apartment_obj=get_apartment_details(apartment.id),
+            )
+
+        assert (
+            SimilarApartmentRefresh.objects.get().apartment_id
+            == get_apartment_details(apartment.id).id
+        )
+        assert not any(
+            '"apartments_similarapartment"' in query["sql"] for query in update_queries
+        )
+
+
+@pytest.mark.django_db
+class TestSavedSearches:
+    @pytest.fixture
+    def tenant(self) -> User:
+        return User.objects.create_user(username="tenant", password="testpassword123")
+
+    def test_create_saved_search_store_open_ranges_as_column_limits(self, tenant: User):
+        saved_search = create_saved_search(
+            filters={"price_eur__lte": "2500", "country": "Poland"}, user_id=tenant.id
+        )
+
+        assert saved_search.country == "Poland"
+        assert saved_search.price_eur_min == 0
+        assert saved_search.price_eur_max == Decimal("2500")
+        assert saved_search.surface_max == Decimal("999.99")
+
+    def test_create_apartment_add_it_to_inbox_of_matching_searches_only(
+        self, user: User, tenant: User, django_capture_on_commit_callbacks
+    ):
+        matching = create_saved_search(
+            filters={"price_eur__lte": "2500", "surface__gte": "50"},
+            user_id=tenant.id,
+        )
+        text_matching = create_saved_search(
+            filters={"country": "Poland", "q": "balcony"}, user_id=tenant.id
+        )
+        create_saved_search(filters={"price_eur__gte": "3000"}, user_id=tenant.id)
+        create_saved_search(filters={"country": "Germany"}, user_id=tenant.id)
+        create_saved_search(filters={"q": "garden"}, user_id=tenant.id)
+        create_saved_search(filters={"surface__gte": "50"}, user_id=user.id)
+        data = similar_apartment_data("2000", "100", "Warsaw")
+        data["description"] = "Sunny flat with a balcony"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            apartment_obj = create_apartment(data=data, owner=user.id)
+
+        assert set(
+            SavedSearchMatch.objects.values_list("saved_search_id", "apartment_id")
+        ) == {(matching.id, apartment_obj.id), (text_matching.id, apartment_obj.id)}
+        assert list_saved_search_matches(user_id=tenant.id).count() == 2
+
+    def test_find_saved_search_matches_check_filtered_searches_in_one_query(
+        self, user: User, tenant: User
+    ):
+        data = similar_apartment_data("2000", "100", "Warsaw")
+        data["description"] = "Sunny flat with a balcony"
+        apartment_obj = create_apartment(data=data, owner=user.id)
+        searches = [
+            create_saved_search(
+                filters={"price_eur__lte": str(2000 + i), "q": word},
+                user_id=tenant.id,
+            )
+            for i in range(20)
+            for word in ["balcony", "garden"]
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            matches = find_saved_search_matches([apartment_obj])
+
+        assert len(queries) == 2
+        assert matches == {
+            (search.id, tenant.id, apartment_obj.id)
+            for search in searches
+            if search.filters["q"] == "balcony"
+        }
+
+    def test_update_apartment_match_searches_after_commit(
+        self, user: User, tenant: User, django_capture_on_commit_callbacks
+    ):
+        create_saved_search(filters={"price_eur__lte": "2500"}, user_id=tenant.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            apartment_obj = create_apartment(
+                data=similar_apartment_data("3000", "100", "Warsaw"), owner=user.id
+            )
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            update_apartment(
+                data={"price": Decimal("2400")},
+                apartment_obj=get_apartment_details(apartment_obj.id),
+            )
+        assert not SavedSearchMatch.objects.exists()
+
+        for callback in callbacks:
+            callback()
+        assert SavedSearchMatch.objects.filter(apartment_id=apartment_obj.id).exists()
+
+    def test_normalize_apartment_prices_match_searches_after_commit(
+        self, user: User, tenant: User, django_capture_on_commit_callbacks
+    ):
+        saved_search = create_saved_search(
+            filters={"price_eur__lte": "2500"}, user_id=tenant.id
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            apartment_obj = create_apartment(
+                data=similar_apartment_data("3000", "100", "Warsaw"), owner=user.id
+            )
+        ExchangeRate.objects.filter(currency="EUR").update(eur_rate=Decimal("0.5"))
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            normalize_apartment_prices()
+        assert not SavedSearchMatch.objects.exists()
+
+        for callback in callbacks:
+            callback()
+        assert list(
+            SavedSearchMatch.objects.values_list("saved_search_id", "apartment_id")
+        ) == [(saved_search.id, apartment_obj.id)]
+
+    def test_update_apartment_only_deliver_apartment_to_newly_matching_searches(
+        self, user: User, tenant: User, django_capture_on_commit_callbacks
+    ):
+        cheap = create_saved_search(
+            filters={"price_eur__lte": "2500"}, user_id=tenant.id
+        )
+        large = create_saved_search(filters={"surface__gte": "150"}, user_id=tenant.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            apartment_obj = create_apartment(
+                data=similar_apartment_data("2000", "100", "Warsaw"), owner=user.id
+            )
+        # The tenant dismissed the apartment from the inbox.
+        SavedSearchMatch.objects.all().delete()
+
+        for data in [
+            {"deposit": Decimal("700")},
+            {"price": Decimal("2100")},
+            {"surface": Decimal("160")},
+        ]:
+            with django_capture_on_commit_callbacks(execute=True):
+                update_apartment(
+                    data=data, apartment_obj=get_apartment_details(apartment_obj.id)
+                )
+
+        assert list(SavedSearchMatch.objects.values_list("saved_search_id")) == [
+            (large.id,)
+        ]
+        assert not SavedSearchMatch.objects.filter(saved_search_id=cheap.id).exists()
+
+    def test_update_apartment_match_searches_once(
+        self, user: User, tenant: User, django_capture_on_commit_callbacks
+    ):
+        saved_search = create_saved_search(
+            filters={"price_eur__lte": "2500"}, user_id=tenant.id
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            apartment_obj = create_apartment(
+                data=similar_apartment_data("3000", "100", "Warsaw"), owner=user.id
+            )
+        assert not SavedSearchMatch.objects.exists()
+
+        for price in ["2400", "2300"]:
+            with django_capture_on_commit_callbacks(execute=True):
+                update_apartment(
+                    data={"price": Decimal(price)},
+                    apartment_obj=get_apartment_details(apartment_obj.id),
+                )
+
+        assert list(
+            SavedSearchMatch.objects.values_list("saved_search_id", "apartment_id")
+        ) == [(saved_search.id, apartment_obj.id)]
+
+
+@pytest.mark.django_db
+class TestArchiveApartments:
+    def test_archive_unavailable_apartments_move_old_unavailable_apartments_only(
+        self, apartment: Apartment, user: User
+    ):
+        ApartmentImage.objects.create(
+            image="images/test.jpg", apartment=apartment, is_main=True
+        )
+        Visit.objects.create(apartment=apartment, user=user, date_time=timezone.now())
+        recent = create_apartment(
+            data=similar_apartment_data("2000", "100", "Warsaw"), owner=user.id
+        )
+        Apartment.objects.update(
+            is_available=False, updated_at=timezone.now() - timedelta(days=91)
+        )
+        Apartment.objects.filter(id=recent.id).update(updated_at=timezone.now())
+
+        archived = archive_unavailable_apartments(batch_size=1)
+
+        assert archived == 1
+        assert list(Apartment.objects.values_list("id", flat=True)) == [recent.id]
+        assert not Address.objects.filter(id=apartment.address_id).exists()
+        assert not ApartmentImage.objects.exists()
+        assert not Visit.objects.exists()
+        archived_obj = ArchivedApartment.objects.get()
+        assert archived_obj.id == apartment.id
+        assert archived_obj.owner_id == user.id
+        assert archived_obj.address["city"] == "testcity"
+        assert archived_obj.images[0]["image"] == "images/test.jpg"
+        assert archived_obj.visits[0]["user_id"] == user.id
+
+    def test_get_apartment_details_find_archived_apartment(self, apartment: Apartment):
+        image = ApartmentImage.objects.create(
+            image="images/test.jpg", apartment=apartment, is_main=True
+        )
+        Apartment.objects.filter(id=apartment.id).update(
+            is_available=False, updated_at=timezone.now() - timedelta(days=91)
+        )
+        live = get_apartment_details(apartment_id=apartment.id)
+
+        archive_unavailable_apartments()
+        archived = get_apartment_details(apartment_id=apartment.id)
+
+        assert archived.id == live.id
+        assert archived.price == live.price
+        assert archived.address.postal_code == live.address.postal_code
+        assert archived.images == [image]
+        assert get_apartment_version(apartment_id=apartment.id) == live.version
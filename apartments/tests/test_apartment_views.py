@@ -1,9 +1,41 @@
+import base64
+import csv
+import importlib
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, reverse
+from django.utils.translation import gettext_lazy
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
-from apartments.models import Apartment, Address
+import api_urls
+from apartments.archive import archive_unavailable_apartments
+from apartments.models import Apartment, Address, SimilarApartment
+from apartments.serializers import BULK_CREATE_MAX_APARTMENTS
+from apartments.services import create_apartment, update_apartment
+from apartments.views import AsyncApartmentDetailView, AsyncApartmentView
+from images.models import ApartmentImage
+from images.services import update_apartment_image_obj
+from livehere import settings as livehere_settings, urls as livehere_urls
+from livehere.db_router import PRIMARY_STICKY_COOKIE
+from livehere.renderers import ORJSONRenderer
+from visits.models import Visit
+from visits.views import AsyncTenantVisitView
 
 User = get_user_model()
 
@@ -65,6 +97,621 @@ class TestApartmentViewResponses:
         assert response.status_code == status.HTTP_200_OK
 
 
+def create_apartments_with_main_image(owner: User, count: int) -> None:
+    for i in range(count):
+        address_obj = Address.objects.create(
+            street="teststreet",
+            city="testcity",
+            province="testprovince",
+            postal_code="11-111",
+            country="Poland",
+        )
+        apartment_obj = Apartment.objects.create(
+            price="1000",
+            deposit="500",
+            is_available=True,
+            description="description",
+            address_id=address_obj.id,
+            owner_id=owner.id,
+            is_furnished=True,
+            surface="100",
+        )
+        image_obj = ApartmentImage.objects.create(
+            image=f"images/test_{i}.jpg", apartment_id=apartment_obj.id
+        )
+        update_apartment_image_obj(image_obj=image_obj, apartment_id=apartment_obj.id)
+
+
+@pytest.mark.django_db
+class TestApartmentListQueries:
+    @pytest.mark.parametrize("url", ["get_apartments", "get_owner_advertisements"])
+    def test_apartment_list_query_count_does_not_grow_with_page_size(
+        self, url: str, api_client: APIClient, authenticated_user: User
+    ):
+        create_apartments_with_main_image(owner=authenticated_user, count=2)
+        with CaptureQueriesContext(connection) as small_page:
+            response = api_client.get(reverse(url))
+        assert len(response.data["results"]) == 2
+        # Counted now: the next request resets the connection's query log.
+        small_page_queries = len(small_page)
+
+        create_apartments_with_main_image(owner=authenticated_user, count=8)
+        with CaptureQueriesContext(connection) as full_page:
+            response = api_client.get(reverse(url))
+        assert len(response.data["results"]) == 10
+
+        assert len(full_page) == small_page_queries
+        assert all(
+            result["main_image"].startswith("/api/media/images/test_")
+            for result in response.data["results"]
+        )
+
+
+@pytest.mark.django_db
+class TestApartmentListRenditions:
+    @pytest.mark.parametrize("url", ["get_apartments", "get_owner_advertisements"])
+    def test_apartment_list_size_param_return_rendition_of_main_image(
+        self, url: str, api_client: APIClient, authenticated_user: User
+    ):
+        create_apartments_with_main_image(owner=authenticated_user, count=2)
+        image_obj = ApartmentImage.objects.order_by("image").first()
+        image_obj.renditions = {"thumb": "images/renditions/test_0_thumb.jpg"}
+        image_obj.save()
+        update_apartment_image_obj(
+            image_obj=image_obj, apartment_id=image_obj.apartment_id
+        )
+
+        response = api_client.get(reverse(url), {"size": "thumb"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(result["main_image"] for result in response.data["results"]) == [
+            "/api/media/images/renditions/test_0_thumb.jpg",
+            "/api/media/images/test_1.jpg",
+        ]
+
+    def test_apartment_list_return_400_for_unknown_size(self, api_client: APIClient):
+        response = api_client.get(reverse("get_apartments"), {"size": "huge"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"size": ["Unknown size: huge."]}
+
+    def test_apartment_detail_size_param_return_renditions_of_images(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        ApartmentImage.objects.create(
+            image="images/test_0.jpg",
+            renditions={"thumb": "images/renditions/test_0_thumb.jpg"},
+            apartment_id=apartment.id,
+        )
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+
+        original = api_client.get(url)
+        thumb = api_client.get(url, {"size": "thumb"})
+
+        assert original.data["images"][0]["image"] == "/api/media/images/test_0.jpg"
+        assert thumb.status_code == status.HTTP_200_OK
+        assert (
+            thumb.data["images"][0]["image"]
+            == "/api/media/images/renditions/test_0_thumb.jpg"
+        )
+
+    def test_apartment_detail_return_400_for_unknown_size(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+
+        response = api_client.get(url, {"size": "huge"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == {"size": ["Unknown size: huge."]}
+
+
+@pytest.mark.django_db
+class TestApartmentSparseFieldsets:
+    @pytest.mark.parametrize("url", ["get_apartments", "get_owner_advertisements"])
+    def test_apartment_list_fields_param_trim_response_and_selected_columns(
+        self, url: str, api_client: APIClient, apartment: Apartment
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(
+                reverse(url),
+                {"fields": "id,price,address.latitude,address.longitude"},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == [
+            {
+                "id": str(apartment.id),
+                "price": "1000.00",
+                "address": {"latitude": None, "longitude": None},
+            }
+        ]
+        page_query = queries[-1]["sql"]
+        assert "description" not in page_query
+        assert "city" not in page_query
+
+    def test_apartment_list_fields_param_without_address_skip_join(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("get_apartments"), {"fields": "id"})
+
+        assert response.data["results"] == [{"id": str(apartment.id)}]
+        assert "apartments_address" not in queries[-1]["sql"]
+
+    def test_apartment_detail_fields_param_trim_cached_payload(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+        api_client.get(url)
+
+        response = api_client.get(url, {"fields": "price,address.city"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"price": "1000.00", "address": {"city": "testcity"}}
+
+    @pytest.mark.parametrize("fields", ["id,unknown", "price.amount", "address.nope"])
+    def test_apartment_list_return_400_for_unknown_fields(
+        self, fields: str, api_client: APIClient
+    ):
+        response = api_client.get(reverse("get_apartments"), {"fields": fields})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestApartmentListCursorPagination:
+    def test_apartment_view_cursor_pages_cover_all_apartments_in_price_order(
+        self, api_client: APIClient, authenticated_user: User
+    ):
+        for i in range(25):
+            address_obj = Address.objects.create(
+                street="teststreet",
+                city="testcity",
+                province="testprovince",
+                postal_code="11-111",
+                country="Poland",
+            )
+            Apartment.objects.create(
+                price=str(1000 + (i % 5) * 100),
+                deposit="500",
+                is_available=True,
+                description="description",
+                address_id=address_obj.id,
+                owner_id=authenticated_user.id,
+                is_furnished=True,
+                surface="100",
+            )
+        expected_ids = [
+            str(apartment_id)
+            for apartment_id in Apartment.objects.order_by("price", "id").values_list(
+                "id", flat=True
+            )
+        ]
+
+        response = api_client.get(reverse("get_apartments"), {"cursor": ""})
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+        pages = [response.data]
+        while pages[-1]["next"]:
+            pages.append(api_client.get(pages[-1]["next"]).data)
+
+        assert [len(page["results"]) for page in pages] == [10, 10, 5]
+        assert [
+            result["id"] for page in pages for result in page["results"]
+        ] == expected_ids
+
+        previous_page = api_client.get(pages[-1]["previous"]).data
+        assert previous_page["results"] == pages[1]["results"]
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "invalid",
+            base64.urlsafe_b64encode(b'{"p":["abc","x"],"r":0}').decode(),
+            base64.urlsafe_b64encode(b'{"p":[null,null],"r":0}').decode(),
+            base64.urlsafe_b64encode(b'{"p":[1,2],"r":0}').decode(),
+            base64.urlsafe_b64encode(b'{"p":["1"],"r":0}').decode(),
+        ],
+    )
+    def test_apartment_view_return_404_for_invalid_cursor(
+        self, cursor: str, api_client: APIClient
+    ):
+        response = api_client.get(reverse("get_apartments"), {"cursor": cursor})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestApartmentListGeoFilters:
+    @pytest.fixture
+    def apartments_in_cities(self, authenticated_user: User) -> dict[str, Apartment]:
+        apartments = {}
+        for city in ["Warszawa", "Kraków"]:
+            address_obj = Address.objects.create(
+                street="teststreet",
+                city=city,
+                province="testprovince",
+                postal_code="11-111",
+                country="Poland",
+            )
+            apartments[city] = Apartment.objects.create(
+                price="1000",
+                deposit="500",
+                is_available=True,
+                description="description",
+                address_id=address_obj.id,
+                owner_id=authenticated_user.id,
+                is_furnished=True,
+                surface="100",
+            )
+        call_command("geocode_addresses")
+        return apartments
+
+    def test_apartment_view_near_filter_return_apartments_within_radius(
+        self, api_client: APIClient, apartments_in_cities: dict[str, Apartment]
+    ):
+        response = api_client.get(
+            reverse("get_apartments"), {"near": "52.25,21.0", "radius": "3"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["id"] for result in response.data["results"]] == [
+            str(apartments_in_cities["Warszawa"].id)
+        ]
+
+    def test_apartment_view_bbox_filter_return_apartments_inside_box(
+        self, api_client: APIClient, apartments_in_cities: dict[str, Apartment]
+    ):
+        response = api_client.get(
+            reverse("get_apartments"), {"bbox": "19.5,49.5,20.5,50.5"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["id"] for result in response.data["results"]] == [
+            str(apartments_in_cities["Kraków"].id)
+        ]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"near": "52.25"},
+            {"near": "nan,nan"},
+            {"near": "inf,1"},
+            {"near": "91,21"},
+            {"bbox": "10,10,5,5"},
+            {"bbox": "-181,0,0,0"},
+        ],
+    )
+    def test_apartment_view_return_400_for_malformed_coordinates(
+        self, params: dict, api_client: APIClient
+    ):
+        response = api_client.get(reverse("get_apartments"), params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def search_apartment_data(description: str, city: str, street: str) -> dict:
+    return {
+        "surface": "100.00",
+        "price": "1000.00",
+        "currency": "PLN",
+        "deposit": "500.00",
+        "is_available": True,
+        "description": description,
+        "address": {
+            "country": "Poland",
+            "street": street,
+            "city": city,
+            "province": "testprovince",
+            "postal_code": "11-111",
+        },
+    }
+
+
+@pytest.mark.django_db
+class TestApartmentListTextSearch:
+    def test_apartment_view_q_filter_match_description_and_location(
+        self, api_client: APIClient, authenticated_user: User
+    ):
+        apartment_obj = create_apartment(
+            data=search_apartment_data("description", "testcity", "teststreet"),
+            owner=authenticated_user.id,
+        )
+        create_apartment(
+            data=search_apartment_data("sunny balcony", "othercity", "otherstreet"),
+            owner=authenticated_user.id,
+        )
+
+        response = api_client.get(reverse("get_apartments"), {"q": "testcity descr"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["id"] for result in response.data["results"]] == [
+            str(apartment_obj.id)
+        ]
+
+    def test_apartment_view_q_filter_match_rows_updated_outside_services(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        Apartment.objects.filter(id=apartment.id).update(description="sunny balcony")
+        Address.objects.filter(id=apartment.address_id).update(city="othercity")
+
+        response = api_client.get(reverse("get_apartments"), {"q": "othercity sunny"})
+
+        assert [result["id"] for result in response.data["results"]] == [
+            str(apartment.id)
+        ]
+
+
+@pytest.mark.django_db
+class TestApartmentListPriceEurFilters:
+    def test_apartment_view_filter_and_order_by_price_in_eur(
+        self, api_client: APIClient, authenticated_user: User
+    ):
+        apartment_ids = {}
+        for currency, price in [("PLN", "8000"), ("EUR", "1500"), ("GBP", "1000")]:
+            address_obj = Address.objects.create(
+                street="teststreet",
+                city="testcity",
+                province="testprovince",
+                postal_code="11-111",
+                country="Poland",
+            )
+            apartment_ids[currency] = str(
+                Apartment.objects.create(
+                    price=price,
+                    currency=currency,
+                    deposit="500",
+                    description="description",
+                    address_id=address_obj.id,
+                    owner_id=authenticated_user.id,
+                    surface="100",
+                ).id
+            )
+        call_command("normalize_prices")
+
+        response = api_client.get(
+            reverse("get_apartments"),
+            {"price_eur__gte": "1200", "ordering": "-price_eur"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["id"] for result in response.data["results"]] == [
+            apartment_ids["PLN"],
+            apartment_ids["EUR"],
+        ]
+
+    @pytest.mark.parametrize("ordering", ["price_eur", "-price_eur"])
+    def test_apartment_view_order_by_price_in_eur_put_unconverted_prices_last(
+        self, ordering: str, api_client: APIClient, authenticated_user: User
+    ):
+        apartment_ids = []
+        for price_eur in [None, "1000", "1000"]:
+            address_obj = Address.objects.create(
+                street="teststreet",
+                city="testcity",
+                province="testprovince",
+                postal_code="11-111",
+                country="Poland",
+            )
+            apartment_ids.append(
+                str(
+                    Apartment.objects.create(
+                        price="1000",
+                        price_eur=price_eur,
+                        deposit="500",
+                        description="description",
+                        address_id=address_obj.id,
+                        owner_id=authenticated_user.id,
+                        surface="100",
+                    ).id
+                )
+            )
+
+        response = api_client.get(reverse("get_apartments"), {"ordering": ordering})
+
+        assert [result["id"] for result in response.data["results"]] == sorted(
+            apartment_ids[1:]
+        ) + [apartment_ids[0]]
+
+
+@pytest.mark.django_db
+class TestApartmentFacetView:
+    def test_apartment_facet_view_counts_follow_created_updated_and_deleted_apartments(
+        self, api_client: APIClient, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                reverse("bulk_create_owner_advertisements"),
+                data=bulk_apartment_payload(3),
+                format="json",
+            )
+        apartments = list(Apartment.objects.order_by("price"))
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(
+                reverse(
+                    "get_owner_advertisement_details",
+                    kwargs={"advertisement_id": apartments[0].id},
+                ),
+                data={"address": {"city": "Krakow"}, "is_furnished": False},
+                format="json",
+            )
+        api_client.delete(
+            reverse(
+                "get_owner_advertisement_details",
+                kwargs={"advertisement_id": apartments[2].id},
+            )
+        )
+
+        response = api_client.get(reverse("get_apartment_facets"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "country": [{"value": "Poland", "count": 2}],
+            "city": [
+                {"value": "Krakow", "count": 1},
+                {"value": "Warszawa", "count": 1},
+            ],
+            "currency": [{"value": "EUR", "count": 2}],
+            "is_furnished": [
+                {"value": "false", "count": 1},
+                {"value": "true", "count": 1},
+            ],
+            "price_bucket": [{"value": "2000-3000", "count": 2}],
+        }
+        live_response = api_client.get(
+            reverse("get_apartment_facets"), {"price__gte": "0"}
+        )
+        assert live_response.data == response.data
+
+    def test_apartment_facet_view_aggregate_live_for_filtered_requests(
+        self, api_client: APIClient
+    ):
+        api_client.post(
+            reverse("bulk_create_owner_advertisements"),
+            data=bulk_apartment_payload(3),
+            format="json",
+        )
+
+        response = api_client.get(
+            reverse("get_apartment_facets"), {"price__gte": "2001"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["city"] == [{"value": "Warszawa", "count": 2}]
+        assert response.data["price_bucket"] == [{"value": "2000-3000", "count": 2}]
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"country": "Poland"},
+            {"country": "Germany"},
+            {"currency": "PLN"},
+            {"country": "Poland", "radius": "5"},
+        ],
+    )
+    def test_apartment_facet_view_answer_broad_filters_from_maintained_counts(
+        self, params: dict, api_client: APIClient, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(
+                reverse("bulk_create_owner_advertisements"),
+                data=bulk_apartment_payload(3),
+                format="json",
+            )
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(
+                reverse(
+                    "get_owner_advertisement_details",
+                    kwargs={"advertisement_id": Apartment.objects.first().id},
+                ),
+                data={"address": {"country": "Germany"}, "currency": "PLN"},
+                format="json",
+            )
+        url = reverse("get_apartment_facets")
+
+        with CaptureQueriesContext(connection) as facet_request:
+            response = api_client.get(url, params)
+        # Read before the next request resets the connection's query log.
+        assert not any("GROUP BY" in query["sql"] for query in facet_request)
+        live_response = api_client.get(url, {**params, "price__gte": "0"})
+        call_command("rebuild_facets")
+        rebuilt_response = api_client.get(url, params)
+
+        assert response.data == live_response.data == rebuilt_response.data
+        assert response.data["city"]
+
+
+@pytest.mark.django_db
+class TestApartmentJsonRendering:
+    @pytest.mark.parametrize("url", ["get_apartments", "get_apartment_details"])
+    def test_orjson_renderer_output_match_json_renderer(
+        self, url: str, api_client: APIClient, apartment: Apartment
+    ):
+        kwargs = (
+            {"apartment_id": apartment.id} if url == "get_apartment_details" else {}
+        )
+        response = api_client.get(reverse(url, kwargs=kwargs))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == JSONRenderer().render(response.data)
+
+    def test_orjson_renderer_encode_non_native_values_like_json_renderer(self):
+        data = {
+            "price": Decimal("1000.50"),
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "date_time": datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc),
+            "label": gettext_lazy("Poland"),
+            "description": "line\u2028break",
+            1: ["a", None, True, 1.5],
+        }
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_orjson_parser_reject_invalid_json_with_400(self, api_client: APIClient):
+        response = api_client.post(
+            reverse("bulk_create_owner_advertisements"),
+            data=b"[{invalid",
+            content_type="application/json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestApartmentConditionalRequests:
+    def test_apartment_view_return_304_until_apartment_changes(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartments")
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        update_apartment(data={"price": Decimal("1200")}, apartment_obj=apartment)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_apartment_view_return_304_without_fetching_rows(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartments") + "?price__gte=500"
+        etag = api_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as conditional_request:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        apartment_queries = [
+            query["sql"]
+            for query in conditional_request
+            if "apartments_apartment" in query["sql"]
+        ]
+        assert len(apartment_queries) == 1
+        assert "MAX(" in apartment_queries[0]
+        assert '"apartments_apartment"."description"' not in apartment_queries[0]
+
+    def test_apartment_detail_view_return_304_without_loading_apartment(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+        etag = api_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as conditional_request:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not any(
+            "apartments_address" in query["sql"] for query in conditional_request
+        )
+
+        update_apartment(data={"deposit": Decimal("600")}, apartment_obj=apartment)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["deposit"] == "600.00"
+
+
 @pytest.mark.django_db
 class TestApartmentDetailViewResponses:
     def test_apartment_detail_view_return_403_for_anonymous_user(
@@ -85,6 +732,134 @@ class TestApartmentDetailViewResponses:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["id"] == apartment.id
 
+    def test_apartment_detail_view_serve_cached_payload_until_apartment_updated(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+        api_client.get(url)
+        with CaptureQueriesContext(connection) as cached_request:
+            api_client.get(url)
+        assert not any(
+            "apartments_address" in query["sql"] for query in cached_request
+        )
+
+        api_client.patch(
+            reverse(
+                "get_owner_advertisement_details",
+                kwargs={"advertisement_id": apartment.id},
+            ),
+            data={"deposit": "600"},
+            format="json",
+        )
+        response = api_client.get(url)
+
+        assert response.data["deposit"] == "600.00"
+
+    def test_apartment_detail_view_serve_new_payload_after_main_image_changed(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+        for i in range(2):
+            image_obj = ApartmentImage.objects.create(
+                image=f"images/test_{i}.jpg", apartment_id=apartment.id
+            )
+            update_apartment_image_obj(image_obj=image_obj, apartment_id=apartment.id)
+            response = api_client.get(url)
+
+            assert response.data["images"][0]["id"] == str(image_obj.id)
+
+
+@pytest.mark.django_db
+class TestApartmentDetailQueries:
+    @pytest.mark.parametrize(
+        "url, kwarg, expected_queries",
+        [
+            # session, user, version, apartment + address, images
+            ("get_apartment_details", "apartment_id", 5),
+            # session, user, apartment + address, images
+            ("get_owner_advertisement_details", "advertisement_id", 4),
+        ],
+    )
+    def test_apartment_detail_query_count_does_not_grow_with_images(
+        self,
+        url: str,
+        kwarg: str,
+        expected_queries: int,
+        api_client: APIClient,
+        apartment: Apartment,
+    ):
+        url = reverse(url, kwargs={kwarg: apartment.id})
+        for i in range(4):
+            ApartmentImage.objects.create(
+                image=f"images/test_{i}.jpg", apartment_id=apartment.id
+            )
+        main_image = ApartmentImage.objects.create(
+            image="images/test_main.jpg", apartment_id=apartment.id
+        )
+        update_apartment_image_obj(image_obj=main_image, apartment_id=apartment.id)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == expected_queries
+        assert len(response.data["images"]) == 5
+        assert response.data["images"][0]["id"] == str(main_image.id)
+
+    def test_apartment_advertisement_update_query_count_does_not_grow_with_images(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse(
+            "get_owner_advertisement_details",
+            kwargs={"advertisement_id": apartment.id},
+        )
+        ApartmentImage.objects.create(
+            image="images/test_0.jpg", apartment_id=apartment.id
+        )
+        with CaptureQueriesContext(connection) as one_image:
+            api_client.patch(url, data={"deposit": "600"}, format="json")
+        # Counted now: the next request resets the connection's query log.
+        one_image_queries = len(one_image)
+
+        for i in range(1, 4):
+            ApartmentImage.objects.create(
+                image=f"images/test_{i}.jpg", apartment_id=apartment.id
+            )
+        with CaptureQueriesContext(connection) as four_images:
+            response = api_client.patch(url, data={"deposit": "700"}, format="json")
+
+        assert len(response.data["images"]) == 4
+        assert len(four_images) == one_image_queries
+
+
+@pytest.mark.django_db
+class TestSimilarApartmentView:
+    def test_similar_apartment_view_return_neighbours_in_rank_order(
+        self, api_client: APIClient, authenticated_user: User
+    ):
+        create_apartments_with_main_image(owner=authenticated_user, count=4)
+        apartments = list(Apartment.objects.order_by("id"))
+        for rank, similar in enumerate(apartments[:0:-1]):
+            SimilarApartment.objects.create(
+                apartment=apartments[0], similar=similar, rank=rank, distance=rank
+            )
+        url = reverse(
+            "get_similar_apartments", kwargs={"apartment_id": apartments[0].id}
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["id"] for result in response.json()] == [
+            str(apartment.id) for apartment in apartments[:0:-1]
+        ]
+        apartment_queries = [
+            query for query in queries if "apartments_apartment" in query["sql"]
+        ]
+        assert len(apartment_queries) == 1
+
 
 @pytest.mark.django_db
 class TestApartmentAdvertisementViewResponses:
@@ -127,6 +902,165 @@ class TestApartmentAdvertisementViewResponses:
         assert response.status_code == status.HTTP_201_CREATED
 
 
+def bulk_apartment_payload(count: int) -> list[dict]:
+    return [
+        {
+            "surface": "100.00",
+            "price": str(2000 + i),
+            "currency": "EUR",
+            "deposit": "1000.00",
+            "description": f"apartment {i}",
+            "address": {
+                "country": "Poland",
+                "street": "teststreet",
+                "city": "Warszawa",
+                "province": "testprovince",
+                "postal_code": "22-222",
+            },
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestApartmentAdvertisementBulkViewResponses:
+    def test_apartment_advertisement_bulk_view_return_201_and_create_all_apartments(
+        self, api_client: APIClient, authenticated_user: User
+    ):
+        url = reverse("bulk_create_owner_advertisements")
+        response = api_client.post(url, data=bulk_apartment_payload(3), format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [result["price"] for result in response.data] == [
+            "2000.00",
+            "2001.00",
+            "2002.00",
+        ]
+        assert Apartment.objects.filter(owner_id=authenticated_user.id).count() == 3
+        assert Address.objects.filter(latitude=52.2297).count() == 3
+
+    def test_apartment_advertisement_bulk_view_return_400_and_create_nothing_if_item_invalid(
+        self, api_client: APIClient
+    ):
+        url = reverse("bulk_create_owner_advertisements")
+        data = bulk_apartment_payload(2)
+        data[1]["currency"] = "XXX"
+        response = api_client.post(url, data=data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "currency" in response.data[1]
+        assert Apartment.objects.count() == 0
+
+    def test_apartment_advertisement_bulk_view_return_400_if_too_many_items(
+        self, api_client: APIClient
+    ):
+        url = reverse("bulk_create_owner_advertisements")
+        data = bulk_apartment_payload(BULK_CREATE_MAX_APARTMENTS + 1)
+        response = api_client.post(url, data=data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Apartment.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestApartmentAdvertisementExportResponses:
+    def test_advertisement_export_stream_owner_apartments_as_ndjson(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        other_owner = User.objects.create_user(username="otheruser")
+        create_apartments_with_main_image(owner=other_owner, count=1)
+
+        response = api_client.get(reverse("export_owner_advertisements"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = b"".join(response.streaming_content).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {
+                "id": str(apartment.id),
+                "surface": "100.00",
+                "is_furnished": True,
+                "price": "1000.00",
+                "currency": apartment.currency,
+                "price_eur": None,
+                "deposit": "500.00",
+                "is_available": True,
+                "description": "description",
+                "address": {
+                    "country": "testcountry",
+                    "street": "teststreet",
+                    "city": "testcity",
+                    "province": "testprovince",
+                    "postal_code": "11-111",
+                    "latitude": None,
+                    "longitude": None,
+                },
+                "updated_at": apartment.updated_at.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+        ]
+
+    def test_advertisement_visits_export_stream_csv(
+        self, api_client: APIClient, apartment: Apartment, authenticated_user: User
+    ):
+        visit = Visit.objects.create(
+            apartment=apartment,
+            user=authenticated_user,
+            date_time=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        )
+
+        response = api_client.get(
+            reverse("export_owner_advertisements_visits"), {"export_format": "csv"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Disposition"] == 'attachment; filename="visits.csv"'
+        content = b"".join(response.streaming_content).decode()
+        assert list(csv.reader(io.StringIO(content))) == [
+            ["id", "apartment", "date_time", "state"],
+            [str(visit.id), str(apartment.id), "2024-01-02T03:04:05", "PENDING"],
+        ]
+
+    def test_advertisement_visits_export_stream_asynchronously_under_asgi(
+        self, apartment: Apartment, authenticated_user: User
+    ):
+        visit = Visit.objects.create(
+            apartment=apartment,
+            user=authenticated_user,
+            date_time=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        )
+        client = AsyncClient()
+        client.force_login(authenticated_user)
+
+        async def export() -> tuple[bool, bytes]:
+            response = await client.get(
+                reverse("export_owner_advertisements_visits"),
+                {"export_format": "csv"},
+            )
+            content = b"".join([chunk async for chunk in response.streaming_content])
+            return response.is_async, content
+
+        is_async, content = async_to_sync(export)()
+
+        assert is_async
+        assert list(csv.reader(io.StringIO(content.decode())))[1] == [
+            str(visit.id),
+            str(apartment.id),
+            "2024-01-02T03:04:05",
+            "PENDING",
+        ]
+
+    def test_advertisement_export_return_400_for_unknown_format(
+        self, api_client: APIClient
+    ):
+        response = api_client.get(
+            reverse("export_owner_advertisements"), {"export_format": "xml"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.django_db
 class TestApartmentAdvertisementDetailViewResponses:
     def test_apartment_detail_view_return_403_for_anonymous_user(
@@ -188,6 +1122,27 @@ class TestApartmentAdvertisementDetailViewResponses:
 
         assert result.status_code == status.HTTP_200_OK
 
+    def test_apartment_detail_view_return_412_for_stale_if_match(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        url = reverse(
+            "get_owner_advertisement_details",
+            kwargs={"advertisement_id": apartment.id},
+        )
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.patch(
+            url, data={"deposit": "600"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+        response = api_client.patch(
+            url, data={"deposit": "700"}, format="json", HTTP_IF_MATCH=etag
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Apartment.objects.get(id=apartment.id).deposit == Decimal("600")
+
     def test_apartment_detail_view_return_204_if_apartment_deleted(
         self, apartment: Apartment, api_client: APIClient
     ):
@@ -197,3 +1152,291 @@ class TestApartmentAdvertisementDetailViewResponses:
         )
 
         assert result.status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.django_db
+class TestSavedSearchViewResponses:
+    def test_saved_search_view_return_400_for_unknown_or_invalid_filters(
+        self, api_client: APIClient
+    ):
+        url = reverse("get_saved_searches")
+        unknown = api_client.post(url, data={"filters": {"rooms": "2"}}, format="json")
+        invalid = api_client.post(
+            url, data={"filters": {"price_eur__lte": "cheap"}}, format="json"
+        )
+
+        assert unknown.status_code == status.HTTP_400_BAD_REQUEST
+        assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_saved_search_inbox_list_apartments_matching_saved_search(
+        self, api_client: APIClient, django_capture_on_commit_callbacks
+    ):
+        response = api_client.post(
+            reverse("get_saved_searches"),
+            data={"filters": {"price_eur__lte": "2500", "ordering": "price_eur"}},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["filters"] == {"price_eur__lte": "2500"}
+
+        owner = User.objects.create_user(username="owner", password="testpassword123")
+        owner_client = APIClient()
+        owner_client.force_login(owner)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = owner_client.post(
+                reverse("bulk_create_owner_advertisements"),
+                data=bulk_apartment_payload(3),
+                format="json",
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = api_client.get(reverse("get_saved_search_inbox"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        assert {
+            result["apartment"]["price"] for result in response.data["results"]
+        } == {"2000.00", "2001.00", "2002.00"}
+
+
+def copy_to_replica(*models) -> None:
+    """Stand in for replication by copying the primary's rows to the replica."""
+    for model in models:
+        model.objects.using("replica").bulk_create(model.objects.using("default"))
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestApartmentReplicaRouting:
+    @pytest.fixture(autouse=True)
+    def route_reads_to_replica(self, settings, api_client: APIClient):
+        settings.REPLICA_DATABASES = ["replica"]
+        copy_to_replica(User, Session)
+
+    def test_apartment_view_read_from_replica(
+        self, api_client: APIClient, apartment: Apartment
+    ):
+        response = api_client.get(reverse("get_apartments"))
+        assert response.data["results"] == []
+
+        copy_to_replica(Address, Apartment)
+        response = api_client.get(reverse("get_apartments"))
+        assert [result["id"] for result in response.data["results"]] == [
+            str(apartment.id)
+        ]
+
+    def test_apartment_view_read_from_primary_within_sticky_window_after_write(
+        self, api_client: APIClient
+    ):
+        response = api_client.post(
+            reverse("get_owner_advertisements"),
+            data=bulk_apartment_payload(1)[0],
+            format="json",
+        )
+        # Created on the primary and read back in the same request.
+        assert response.status_code == status.HTTP_201_CREATED
+        assert PRIMARY_STICKY_COOKIE in response.cookies
+        assert not Apartment.objects.using("replica").exists()
+
+        response = api_client.get(reverse("get_apartments"))
+        assert len(response.data["results"]) == 1
+
+        del api_client.cookies[PRIMARY_STICKY_COOKIE]
+        response = api_client.get(reverse("get_apartments"))
+        assert response.data["results"] == []
+
+
+def reload_urlconf() -> None:
+    importlib.reload(api_urls)
+    importlib.reload(livehere_urls)
+    clear_url_caches()
+
+
+@pytest.mark.django_db(databases=["default", "replica"])
+class TestAsyncReadViewsUrlconf:
+    @pytest.fixture(autouse=True)
+    def async_read_views(self, settings, monkeypatch, authenticated_user: User):
+        # api_urls picks the views when imported, from livehere.settings.
+        monkeypatch.setattr(livehere_settings, "ASYNC_READ_VIEWS", True)
+        reload_urlconf()
+        settings.REPLICA_DATABASES = ["replica"]
+        yield
+        monkeypatch.undo()
+        reload_urlconf()
+
+    @pytest.fixture
+    def async_client(self, authenticated_user: User) -> AsyncClient:
+        client = AsyncClient()
+        client.force_login(authenticated_user)
+        copy_to_replica(User, Session)
+        return client
+
+    def test_async_apartment_view_read_from_replica_through_middleware(
+        self, async_client: AsyncClient, apartment: Apartment
+    ):
+        url = reverse("get_apartments")
+        response = async_to_sync(async_client.get)(url)
+        assert response.resolver_match.func.view_class is AsyncApartmentView
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == []
+
+        copy_to_replica(Address, Apartment)
+        response = async_to_sync(async_client.get)(url)
+        assert [result["id"] for result in response.json()["results"]] == [
+            str(apartment.id)
+        ]
+
+    def test_async_apartment_detail_view_read_from_primary_within_sticky_window(
+        self, async_client: AsyncClient, apartment: Apartment
+    ):
+        url = reverse("get_apartment_details", kwargs={"apartment_id": apartment.id})
+        async_client.cookies[PRIMARY_STICKY_COOKIE] = "1"
+
+        response = async_to_sync(async_client.get)(url)
+
+        assert response.resolver_match.func.view_class is AsyncApartmentDetailView
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == str(apartment.id)
+
+
+def get_async_response(
+    view_class: type, user: User, path: str, headers: dict | None = None, **kwargs
+) -> HttpResponse:
+    request = AsyncRequestFactory().get(path, headers=headers)
+
+    async def auser() -> User:
+        return user
+
+    request.auser = auser
+    response = async_to_sync(view_class.as_view())(request, **kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    @pytest.mark.parametrize(
+        "query", ["", "?page=2", "?cursor=", "?fields=id,price", "?price__gte=x"]
+    )
+    def test_async_apartment_view_return_same_response_as_sync_view(
+        self, query: str, api_client: APIClient, authenticated_user: User
+    ):
+        create_apartments_with_main_image(owner=authenticated_user, count=12)
+        path = reverse("get_apartments") + query
+
+        expected = api_client.get(path)
+        response = get_async_response(AsyncApartmentView, authenticated_user, path)
+
+        assert response.status_code == expected.status_code
+        assert response.content == expected.content
+        assert response.get("ETag") == expected.get("ETag")
+
+    def test_async_apartment_view_return_304_for_matching_etag(
+        self, authenticated_user: User, apartment: Apartment
+    ):
+        path = reverse("get_apartments")
+        response = get_async_response(AsyncApartmentView, authenticated_user, path)
+
+        not_modified = get_async_response(
+            AsyncApartmentView,
+            authenticated_user,
+            path,
+            headers={"If-None-Match": response["ETag"]},
+        )
+
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_async_apartment_view_return_403_for_anonymous_user(self):
+        response = get_async_response(
+            AsyncApartmentView, AnonymousUser(), reverse("get_apartments")
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_async_apartment_detail_view_return_same_response_as_sync_view(
+        self, api_client: APIClient, authenticated_user: User, apartment: Apartment
+    ):
+        ApartmentImage.objects.create(
+            image="images/test_0.jpg", apartment_id=apartment.id
+        )
+        path = reverse("get_apartment_details", args=[apartment.id])
+
+        expected = api_client.get(path)
+        cache.clear()
+        response = get_async_response(
+            AsyncApartmentDetailView,
+            authenticated_user,
+            path,
+            apartment_id=apartment.id,
+        )
+        cached = get_async_response(
+            AsyncApartmentDetailView,
+            authenticated_user,
+            path,
+            apartment_id=apartment.id,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content == cached.content
+        assert response["ETag"] == expected["ETag"]
+
+    def test_async_apartment_detail_view_return_404_for_unknown_apartment(
+        self, authenticated_user: User
+    ):
+        apartment_id = uuid.uuid4()
+        response = get_async_response(
+            AsyncApartmentDetailView,
+            authenticated_user,
+            reverse("get_apartment_details", args=[apartment_id]),
+            apartment_id=apartment_id,
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_async_tenant_visit_view_return_same_response_as_sync_view(
+        self, api_client: APIClient, authenticated_user: User, apartment: Apartment
+    ):
+        for day in range(1, 4):
+            Visit.objects.create(
+                apartment=apartment,
+                user=authenticated_user,
+                date_time=datetime(2024, 1, day, 12, tzinfo=timezone.utc),
+            )
+        path = reverse("get_tenant_apartment_visits") + "?cursor="
+
+        expected = api_client.get(path)
+        response = get_async_response(AsyncTenantVisitView, authenticated_user, path)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content
+
+
+@pytest.mark.django_db
+class TestArchivedApartmentDetailView:
+    def test_apartment_detail_view_serve_archived_apartment(
+        self, api_client: APIClient, authenticated_user: User, apartment: Apartment
+    ):
+        ApartmentImage.objects.create(
+            image="images/test_0.jpg", apartment_id=apartment.id, is_main=True
+        )
+        Apartment.objects.filter(id=apartment.id).update(
+            is_available=False,
+            updated_at=datetime.now(timezone.utc) - timedelta(days=365),
+        )
+        path = reverse("get_apartment_details", args=[apartment.id])
+        expected = api_client.get(path)
+
+        call_command("archive_apartments", days=90)
+        response = api_client.get(path)
+        cache.clear()
+        async_response = get_async_response(
+            AsyncApartmentDetailView,
+            authenticated_user,
+            path,
+            apartment_id=apartment.id,
+        )
+
+        assert not Apartment.objects.exists()
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == expected.content == async_response.content
+        assert response["ETag"] == expected["ETag"]
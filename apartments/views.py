@@ -1,15 +1,54 @@
+import uuid
 from typing import Type
 
 from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework import status, generics
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.request import Request
-from apartments.models import Apartment
+from apartments.cache import (
+    aget_apartment_detail_payload,
+    get_apartment_detail_payload,
+)
+from apartments.facets import (
+    SCOPE_FACETS,
+    count_facets_live,
+    get_facet_counts,
+    get_facet_scope,
+)
+from apartments.filters import DEPENDENT_FILTERS, ApartmentFilter
+from apartments.models import Apartment, SavedSearch
+from livehere.async_views import AsyncAPIView
+from livehere.conditional import AsyncConditionalListMixin, ConditionalListMixin
+from livehere.db_router import use_primary
+from livehere.exports import ExportView
+from livehere.fieldsets import SparseFieldsetMixin, select_fields
+from livehere.pagination import KeysetPagination
+from livehere.parsers import ORJSONParser
+from livehere.renderers import ORJSONRenderer
+from livehere.renditions import ImageRenditionMixin
+from livehere.rows import AsyncValuesListMixin, ValuesListMixin
 from apartments.serializers import (
     ApartmentOutputSerializer,
     ApartmentInputSerializer,
     ApartmentDetailOutputSerializer,
+    ApartmentOutputRowSerializer,
+    ApartmentExportRowSerializer,
+    BULK_CREATE_MAX_APARTMENTS,
+    SavedSearchInputSerializer,
+    SavedSearchOutputSerializer,
+    SavedSearchMatchOutputSerializer,
+)
+from apartments.saved_searches import (
+    list_saved_searches,
+    get_saved_search,
+    create_saved_search,
+    list_saved_search_matches,
 )
 from apartments.services import (
     list_apartments,
@@ -18,32 +57,153 @@ from apartments.services import (
     create_apartment,
     update_apartment,
     get_apartment_advertisement_details,
+    delete_apartment,
+    get_apartment_version,
+    bulk_create_apartments,
+    list_similar_apartments,
+    aget_apartment_details,
+    aget_apartment_version,
 )
 
 
-class ApartmentView(generics.ListAPIView):
+def _get_apartment_etag(apartment_id: uuid.UUID, version: int) -> str:
+    return quote_etag(f"{apartment_id}-{version}")
+
+
+class ApartmentView(
+    SparseFieldsetMixin,
+    ImageRenditionMixin,
+    ConditionalListMixin,
+    ValuesListMixin,
+    generics.ListAPIView,
+):
     serializer_class = ApartmentOutputSerializer
+    row_serializer_class = ApartmentOutputRowSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("price", "id")
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ApartmentFilter
+
+    def get_queryset(self) -> QuerySet:
+        return self.prune_queryset(list_apartments())
+
+
+class ApartmentFacetView(generics.GenericAPIView):
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = {
-        "price": ["gte", "lte"],
-        "surface": ["gte", "lte"],
-        "is_available": ["exact"],
-    }
+    filterset_class = ApartmentFilter
 
     def get_queryset(self) -> QuerySet:
         return list_apartments()
 
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        apartments = self.filter_queryset(self.get_queryset())
+        filters = {
+            name: request.query_params[name]
+            for name in self.filterset_class.base_filters
+            if name != "ordering" and request.query_params.get(name)
+        }
+        filters = {
+            name: value
+            for name, value in filters.items()
+            if DEPENDENT_FILTERS.get(name, name) in filters
+        }
+        if not filters:
+            return Response(get_facet_counts())
+        # Broad filters are answered from the maintained counts; only
+        # selective ones (ranges, location, text) aggregate live.
+        [(name, value), *others] = filters.items()
+        if not others and name in SCOPE_FACETS:
+            return Response(get_facet_counts(scope=get_facet_scope(name, value)))
+        return Response(count_facets_live(apartments))
 
-class ApartmentDetailView(generics.RetrieveAPIView):
+
+class ApartmentDetailView(
+    SparseFieldsetMixin, ImageRenditionMixin, generics.RetrieveAPIView
+):
     serializer_class = ApartmentDetailOutputSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     lookup_field = "apartment_id"
 
     def get_object(self) -> Apartment:
         apartment_id = self.kwargs["apartment_id"]
         return get_apartment_details(apartment_id)
 
+    def retrieve(self, request: Request, *args, **kwargs) -> Response | HttpResponse:
+        apartment_id = self.kwargs["apartment_id"]
+        selected_fields = self.get_selected_fields()
+        size = self.get_rendition_size()
+        version = get_apartment_version(apartment_id=apartment_id)
+        etag = _get_apartment_etag(apartment_id=apartment_id, version=version)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        payload = get_apartment_detail_payload(
+            apartment_id=apartment_id,
+            version=version,
+            build=self._build_detail_payload,
+            size=size,
+        )
+        return Response(select_fields(payload, selected_fields), headers={"ETag": etag})
+
+    def _build_detail_payload(self) -> dict:
+        # The payload is shared through the cache, so it must not come from a
+        # replica that has not caught up with the write that bumped the version.
+        with use_primary():
+            return self.get_serializer(self.get_object(), fields=None).data
+
+
+class AsyncApartmentView(
+    AsyncConditionalListMixin, AsyncValuesListMixin, AsyncAPIView, ApartmentView
+):
+    pass
+
+
+class AsyncApartmentDetailView(AsyncAPIView, ApartmentDetailView):
+    async def get(self, request: Request, *args, **kwargs) -> Response | HttpResponse:
+        apartment_id = self.kwargs["apartment_id"]
+        selected_fields = self.get_selected_fields()
+        size = self.get_rendition_size()
+        version = await aget_apartment_version(apartment_id=apartment_id)
+        etag = _get_apartment_etag(apartment_id=apartment_id, version=version)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        payload = await aget_apartment_detail_payload(
+            apartment_id=apartment_id,
+            version=version,
+            build=self._abuild_detail_payload,
+            size=size,
+        )
+        return Response(select_fields(payload, selected_fields), headers={"ETag": etag})
+
+    async def _abuild_detail_payload(self) -> dict:
+        with use_primary():
+            apartment_obj = await aget_apartment_details(self.kwargs["apartment_id"])
+        return self.get_serializer(apartment_obj, fields=None).data
+
+
+class SimilarApartmentView(ImageRenditionMixin, ValuesListMixin, generics.ListAPIView):
+    serializer_class = ApartmentOutputSerializer
+    row_serializer_class = ApartmentOutputRowSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = None
+    filter_backends = []
+
+    def get_queryset(self) -> QuerySet:
+        return list_similar_apartments(apartment_id=self.kwargs["apartment_id"])
+
+
+class ApartmentAdvertisementView(
+    SparseFieldsetMixin,
+    ImageRenditionMixin,
+    ValuesListMixin,
+    generics.ListCreateAPIView,
+):
+    row_serializer_class = ApartmentOutputRowSerializer
 
-class ApartmentAdvertisementView(generics.ListCreateAPIView):
     def get_serializer_class(
         self,
     ) -> Type[ApartmentOutputSerializer | ApartmentInputSerializer]:
@@ -54,7 +214,7 @@ class ApartmentAdvertisementView(generics.ListCreateAPIView):
         )
 
     def get_queryset(self) -> QuerySet:
-        return list_owner_apartments(owner_id=self.request.user.id)
+        return self.prune_queryset(list_owner_apartments(owner_id=self.request.user.id))
 
     def create(self, request: Request, *args, **kwargs) -> Response:
         serializer = self.get_serializer(data=request.data)
@@ -62,11 +222,45 @@ class ApartmentAdvertisementView(generics.ListCreateAPIView):
         apartment_obj = create_apartment(
             data=serializer.validated_data, owner=self.request.user.id
         )
+        apartment_obj = get_apartment_advertisement_details(
+            apartment_id=apartment_obj.id, owner_id=self.request.user.id
+        )
         output_serializer = ApartmentDetailOutputSerializer(apartment_obj)
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class ApartmentAdvertisementDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ApartmentAdvertisementBulkView(generics.CreateAPIView):
+    serializer_class = ApartmentInputSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    parser_classes = [ORJSONParser, FormParser, MultiPartParser]
+
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=BULK_CREATE_MAX_APARTMENTS,
+        )
+        serializer.is_valid(raise_exception=True)
+        apartments = bulk_create_apartments(
+            data=serializer.validated_data, owner=self.request.user.id
+        )
+        output_serializer = ApartmentOutputSerializer(apartments, many=True)
+        return Response(output_serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ApartmentAdvertisementExportView(ExportView):
+    row_serializer_class = ApartmentExportRowSerializer
+    export_ordering = ("id",)
+    export_filename = "advertisements"
+
+    def get_queryset(self) -> QuerySet:
+        return list_owner_apartments(owner_id=self.request.user.id)
+
+
+class ApartmentAdvertisementDetailView(
+    SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     lookup_field = "advertisement_id"
 
     def get_serializer_class(
@@ -85,12 +279,76 @@ class ApartmentAdvertisementDetailView(generics.RetrieveUpdateDestroyAPIView):
             apartment_id=apartment_id, owner_id=owner_id
         )
 
-    def update(self, request: Request, *args, **kwargs) -> Response:
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        apartment_obj = self.get_object()
+        serializer = self.get_serializer(apartment_obj)
+        etag = _get_apartment_etag(
+            apartment_id=apartment_obj.id, version=apartment_obj.version
+        )
+        return Response(serializer.data, headers={"ETag": etag})
+
+    def update(self, request: Request, *args, **kwargs) -> Response | HttpResponse:
         apartment_obj = self.get_object()
+        etag = _get_apartment_etag(
+            apartment_id=apartment_obj.id, version=apartment_obj.version
+        )
+        precondition_failed = get_conditional_response(request, etag=etag)
+        if precondition_failed is not None:
+            return precondition_failed
+
         serializer = self.get_serializer(
             instance=apartment_obj, data=request.data, partial=True
         )
         serializer.is_valid(raise_exception=True)
         update_apartment(data=serializer.validated_data, apartment_obj=apartment_obj)
         output_serializer = ApartmentDetailOutputSerializer(apartment_obj)
-        return Response(output_serializer.data, status=status.HTTP_200_OK)
+        etag = _get_apartment_etag(
+            apartment_id=apartment_obj.id, version=apartment_obj.version
+        )
+        return Response(
+            output_serializer.data, status=status.HTTP_200_OK, headers={"ETag": etag}
+        )
+
+    def perform_destroy(self, instance: Apartment) -> None:
+        delete_apartment(apartment_obj=instance)
+
+
+class SavedSearchView(generics.ListCreateAPIView):
+    def get_serializer_class(
+        self,
+    ) -> Type[SavedSearchOutputSerializer | SavedSearchInputSerializer]:
+        return (
+            SavedSearchOutputSerializer
+            if self.request.method == "GET"
+            else SavedSearchInputSerializer
+        )
+
+    def get_queryset(self) -> QuerySet:
+        return list_saved_searches(user_id=self.request.user.id)
+
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        saved_search_obj = create_saved_search(
+            filters=serializer.validated_data["filters"], user_id=self.request.user.id
+        )
+        output_serializer = SavedSearchOutputSerializer(saved_search_obj)
+        return Response(output_serializer.data, status=status.HTTP_201_CREATED)
+
+
+class SavedSearchDetailView(generics.RetrieveDestroyAPIView):
+    serializer_class = SavedSearchOutputSerializer
+    lookup_field = "saved_search_id"
+
+    def get_object(self) -> SavedSearch:
+        return get_saved_search(
+            saved_search_id=self.kwargs["saved_search_id"],
+            user_id=self.request.user.id,
+        )
+
+
+class SavedSearchInboxView(ImageRenditionMixin, generics.ListAPIView):
+    serializer_class = SavedSearchMatchOutputSerializer
+
+    def get_queryset(self) -> QuerySet:
+        return list_saved_search_matches(user_id=self.request.user.id)
@@ -1,47 +1,119 @@
+from typing import Callable
+
 from django.conf.urls.static import static
 from django.urls import path, include
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenRefreshView, TokenObtainPairView
 
 from apartments.views import (
     ApartmentView,
+    ApartmentFacetView,
     ApartmentDetailView,
     ApartmentAdvertisementView,
     ApartmentAdvertisementDetailView,
+    ApartmentAdvertisementBulkView,
+    ApartmentAdvertisementExportView,
+    SimilarApartmentView,
+    SavedSearchView,
+    SavedSearchDetailView,
+    SavedSearchInboxView,
+    AsyncApartmentView,
+    AsyncApartmentDetailView,
 )
 from images.views import AdvertisementImageView, AdvertisementImageDetailView
-from visits.views import CreateVisitView, OwnerVisitView, TenantVisitView
+from visits.views import (
+    CreateVisitView,
+    OwnerVisitView,
+    TenantVisitView,
+    OwnerVisitExportView,
+    AsyncTenantVisitView,
+)
 from livehere import settings
 
+
+def _read_view(sync_view: type[APIView], async_view: type[APIView]) -> Callable:
+    """
+    ``async_view`` when ``settings.ASYNC_READ_VIEWS`` is on, else ``sync_view``.
+    Both serve the same responses.
+    """
+    view = async_view if settings.ASYNC_READ_VIEWS else sync_view
+    return view.as_view()
+
+
 urlpatterns = [
     path("api-auth/", include("rest_framework.urls")),
     path("auth/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("apartments/", ApartmentView.as_view(), name="get_apartments"),
+    path(
+        "apartments/",
+        _read_view(ApartmentView, AsyncApartmentView),
+        name="get_apartments",
+    ),
+    path(
+        "apartments/facets/",
+        ApartmentFacetView.as_view(),
+        name="get_apartment_facets",
+    ),
     path(
         "me/visits/",
-        TenantVisitView.as_view(),
+        _read_view(TenantVisitView, AsyncTenantVisitView),
         name="get_tenant_apartment_visits",
     ),
     path(
         "apartments/<uuid:apartment_id>/",
-        ApartmentDetailView.as_view(),
+        _read_view(ApartmentDetailView, AsyncApartmentDetailView),
         name="get_apartment_details",
     ),
+    path(
+        "apartments/<uuid:apartment_id>/similar/",
+        SimilarApartmentView.as_view(),
+        name="get_similar_apartments",
+    ),
     path(
         "apartments/<uuid:apartment_id>/visit/",
         CreateVisitView.as_view(),
         name="post_apartment_visit",
     ),
+    path(
+        "me/saved-searches/",
+        SavedSearchView.as_view(),
+        name="get_saved_searches",
+    ),
+    path(
+        "me/saved-searches/inbox/",
+        SavedSearchInboxView.as_view(),
+        name="get_saved_search_inbox",
+    ),
+    path(
+        "me/saved-searches/<int:saved_search_id>/",
+        SavedSearchDetailView.as_view(),
+        name="get_saved_search_details",
+    ),
     path(
         "me/advertisements/",
         ApartmentAdvertisementView.as_view(),
         name="get_owner_advertisements",
     ),
+    path(
+        "me/advertisements/bulk/",
+        ApartmentAdvertisementBulkView.as_view(),
+        name="bulk_create_owner_advertisements",
+    ),
+    path(
+        "me/advertisements/export/",
+        ApartmentAdvertisementExportView.as_view(),
+        name="export_owner_advertisements",
+    ),
     path(
         "me/advertisements/visits/",
         OwnerVisitView.as_view(),
         name="get_owner_advertisements_visits",
     ),
+    path(
+        "me/advertisements/visits/export/",
+        OwnerVisitExportView.as_view(),
+        name="export_owner_advertisements_visits",
+    ),
     path(
         "me/advertisements/<uuid:advertisement_id>/",
         ApartmentAdvertisementDetailView.as_view(),
@@ -0,0 +1,299 @@
+"""
+Load test the hot read endpoints under WSGI and under ASGI.
+
+    python -m benchmarks.asgi_load --clients 500 --duration 10
+
+The same seeded database is served by gunicorn with threads (the sync views)
+and by uvicorn (the async views), one worker process each, with DEBUG off.
+Every client keeps one connection open and requests the apartment list, an
+apartment detail and the tenant visit list in turn. Memory per connection is
+the growth of the server's resident memory while all clients are connected,
+divided by the number of clients; it is read from /proc and so needs Linux.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from benchmarks.utils import (
+    benchmark_database,
+    seed_apartments,
+    seed_visits,
+    setup_django,
+)
+
+HOST = "127.0.0.1"
+
+
+@dataclass
+class LoadStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--apartments", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    with benchmark_database():
+        seed_apartments(args.apartments)
+        seed_visits(args.apartments, tenants=10)
+        session_key, paths = _prepare_requests()
+        env = {
+            **os.environ,
+            "DB_NAME": connection.settings_dict["NAME"],
+            "DEBUG": "",
+            "ALLOWED_HOSTS": HOST,
+        }
+        servers = [
+            (
+                "wsgi",
+                [
+                    *("gunicorn", "livehere.wsgi:application"),
+                    *("--bind", f"{HOST}:{args.port}", "--workers", "1"),
+                    *("--worker-class", "gthread", "--threads", str(args.threads)),
+                    *("--backlog", "2048", "--log-level", "warning"),
+                ],
+                {"ASYNC_READ_VIEWS": "0"},
+            ),
+            (
+                "asgi",
+                [
+                    *("uvicorn", "livehere.asgi:application"),
+                    *("--host", HOST, "--port", str(args.port), "--workers", "1"),
+                    *("--backlog", "2048", "--log-level", "warning"),
+                    "--no-access-log",
+                ],
+                {"ASYNC_READ_VIEWS": "1"},
+            ),
+        ]
+        # Close the seeding connection; the servers open their own.
+        connection.close()
+        for name, command, server_env in servers:
+            result = _run_server_load(
+                command, {**env, **server_env}, args, session_key, paths
+            )
+            _print_result(name, args.clients, *result)
+
+
+def _prepare_requests() -> tuple[str, list[str]]:
+    from django.contrib.auth import (
+        BACKEND_SESSION_KEY,
+        HASH_SESSION_KEY,
+        SESSION_KEY,
+    )
+    from django.contrib.auth.models import User
+    from django.contrib.sessions.backends.db import SessionStore
+
+    from apartments.models import Apartment
+    from visits.models import Visit
+
+    user = User.objects.create_user(username="benchmark-client")
+    Visit.objects.filter(user__username="benchmark-tenant-0").update(user=user)
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+
+    apartment_id = Apartment.objects.filter(is_available=True).values_list(
+        "id", flat=True
+    )[0]
+    paths = [
+        "/api/apartments/?cursor=",
+        f"/api/apartments/{apartment_id}/",
+        "/api/me/visits/?cursor=",
+    ]
+    return session.session_key, paths
+
+
+def _run_server_load(
+    command: list[str],
+    env: dict,
+    args: argparse.Namespace,
+    session_key: str,
+    paths: list[str],
+) -> tuple[LoadStats, float, int, int]:
+    server = subprocess.Popen(command, env=env, start_new_session=True)
+    try:
+        _wait_for_port(args.port)
+        requests = [
+            (
+                f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+                f"Cookie: sessionid={session_key}\r\n\r\n"
+            ).encode()
+            for path in paths
+        ]
+        # Warm up imports, caches and database connections before measuring.
+        asyncio.run(_load(args.port, requests, clients=4, duration=1, pid=None))
+        idle_rss = _get_tree_rss(server.pid)
+        stats, elapsed, peak_rss = asyncio.run(
+            _load(
+                args.port,
+                requests,
+                clients=args.clients,
+                duration=args.duration,
+                pid=server.pid,
+            )
+        )
+        return stats, elapsed, idle_rss, peak_rss
+    finally:
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+
+async def _load(
+    port: int, requests: list[bytes], clients: int, duration: float, pid: int | None
+) -> tuple[LoadStats, float, int]:
+    stats = LoadStats()
+    peak_rss = [0]
+    start = time.monotonic()
+    deadline = start + duration
+    sampler = asyncio.create_task(_sample_rss(pid, peak_rss)) if pid else None
+    await asyncio.gather(
+        *(_client(port, requests, offset, deadline, stats) for offset in range(clients))
+    )
+    elapsed = time.monotonic() - start
+    if sampler is not None:
+        sampler.cancel()
+    return stats, elapsed, peak_rss[0]
+
+
+async def _client(
+    port: int, requests: list[bytes], offset: int, deadline: float, stats: LoadStats
+) -> None:
+    reader = writer = None
+    index = offset
+    while time.monotonic() < deadline:
+        if writer is None:
+            try:
+                reader, writer = await asyncio.open_connection(HOST, port)
+            except OSError:
+                stats.errors += 1
+                await asyncio.sleep(0.05)
+                continue
+        start = time.perf_counter()
+        try:
+            writer.write(requests[index % len(requests)])
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            stats.errors += 1
+            writer.close()
+            writer = None
+            continue
+        stats.latencies.append(time.perf_counter() - start)
+        stats.statuses[status] += 1
+        index += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    status = int(status_line.split(" ", 2)[1])
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("connection") != "close"
+
+
+async def _sample_rss(pid: int, peak_rss: list[int]) -> None:
+    while True:
+        peak_rss[0] = max(peak_rss[0], _get_tree_rss(pid))
+        await asyncio.sleep(0.2)
+
+
+def _get_tree_rss(pid: int) -> int:
+    """Resident memory in bytes of ``pid`` and all of its descendants."""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as stat:
+                    parents[int(entry)] = int(stat.read().rsplit(")", 1)[1].split()[1])
+            except OSError:
+                continue
+    tree, pending = set(), [pid]
+    while pending:
+        current = pending.pop()
+        tree.add(current)
+        pending.extend(child for child, parent in parents.items() if parent == current)
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    rss = 0
+    for process in tree:
+        try:
+            with open(f"/proc/{process}/statm") as statm:
+                rss += int(statm.read().split()[1]) * page_size
+        except OSError:
+            continue
+    return rss
+
+
+def _wait_for_port(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    sys.exit(f"Server did not start listening on port {port}")
+
+
+def _print_result(
+    name: str,
+    clients: int,
+    stats: LoadStats,
+    elapsed: float,
+    idle_rss: int,
+    peak_rss: int,
+) -> None:
+    latencies = sorted(stats.latencies) or [0.0]
+    p99 = latencies[int(len(latencies) * 0.99) - 1 if len(latencies) > 1 else 0]
+    per_connection = max(peak_rss - idle_rss, 0) / clients
+    failures = sum(count for status, count in stats.statuses.items() if status != 200)
+    print(
+        f"{name}  {len(stats.latencies) / elapsed:8.1f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f"  p99 {p99 * 1000:7.1f} ms"
+        f"  rss {idle_rss / 2**20:6.1f} -> {peak_rss / 2**20:6.1f} MiB"
+        f"  {per_connection / 1024:6.1f} KiB/connection"
+        f"  non-200 {failures}  errors {stats.errors}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Print EXPLAIN plans of the apartment and visit list queries without and with
+the indexes declared on Apartment and Visit.
+
+    python -m benchmarks.explain_indexes --apartments 1000000 --visits 1000000
+"""
+
+import argparse
+from decimal import Decimal
+
+from benchmarks.utils import (
+    benchmark_database,
+    seed_apartments,
+    seed_visits,
+    setup_django,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apartments", type=int, default=1000000)
+    parser.add_argument("--visits", type=int, default=1000000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.db import connection
+
+    from apartments.models import Apartment
+    from apartments.services import list_apartments
+    from visits.models import Visit
+    from visits.services import (
+        get_owner_apartments_visits,
+        get_tenant_apartments_visits,
+    )
+
+    def analyze() -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def explain_all() -> None:
+        owner = User.objects.get(username="benchmark-owner")
+        tenant = User.objects.filter(username__startswith="benchmark-tenant-").first()
+        queries = {
+            "apartments by price": list_apartments()
+            .filter(price__gte=Decimal("2000"), price__lte=Decimal("2500"))
+            .order_by("price", "id")[:10],
+            "apartments by surface": list_apartments().filter(
+                surface__gte=Decimal("50"), surface__lte=Decimal("55")
+            )[:10],
+            "tenant visits": get_tenant_apartments_visits(tenant_id=tenant.id).order_by(
+                "date_time", "id"
+            )[:10],
+            "owner visits": get_owner_apartments_visits(owner_id=owner.id).order_by(
+                "date_time", "id"
+            )[:10],
+        }
+        for name, queryset in queries.items():
+            print(f"--- {name}")
+            print(queryset.explain())
+
+    with benchmark_database():
+        seed_apartments(args.apartments)
+        seed_visits(args.visits)
+        indexed_models = [Apartment, Visit]
+
+        with connection.schema_editor() as schema_editor:
+            for model in indexed_models:
+                for index in model._meta.indexes:
+                    schema_editor.remove_index(model, index)
+        analyze()
+        print("===== before")
+        explain_all()
+
+        with connection.schema_editor() as schema_editor:
+            for model in indexed_models:
+                for index in model._meta.indexes:
+                    schema_editor.add_index(model, index)
+        analyze()
+        print("===== after")
+        explain_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare page 1 with page 10 000 of ApartmentView in page number and cursor mode.
+
+    python -m benchmarks.pagination --apartments 130000
+"""
+
+import argparse
+import base64
+import json
+
+from benchmarks.utils import benchmark_database, best_of, seed_apartments, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apartments", type=int, default=130000)
+    parser.add_argument("--page", type=int, default=10000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from apartments.services import list_apartments
+    from apartments.views import ApartmentView
+
+    with benchmark_database():
+        seed_apartments(args.apartments)
+        user = User.objects.get(username="benchmark-owner")
+        view = ApartmentView.as_view()
+        factory = APIRequestFactory()
+        url = reverse("get_apartments")
+        page_size = ApartmentView.pagination_class.page_size
+
+        def fetch(params: dict) -> None:
+            request = factory.get(url, params)
+            force_authenticate(request, user=user)
+            response = view(request)
+            assert response.status_code == 200, response.data
+            response.render()
+
+        offset = (args.page - 1) * page_size
+        price, apartment_id = (
+            list_apartments()
+            .order_by("price", "id")
+            .values_list("price", "id")[offset - 1]
+        )
+        payload = json.dumps({"p": [str(price), str(apartment_id)], "r": 0})
+        deep_cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+
+        cases = [
+            ("page number, page 1", {"page": 1}),
+            (f"page number, page {args.page}", {"page": args.page}),
+            ("cursor, page 1", {"cursor": ""}),
+            (f"cursor, page {args.page}", {"cursor": deep_cursor}),
+        ]
+        for name, params in cases:
+            print(f"{name:<32} {best_of(lambda: fetch(params)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare DRF's JSONRenderer/JSONParser with the orjson-backed ones.
+
+    python -m benchmarks.renderers --rows 100
+"""
+
+import argparse
+import io
+
+from benchmarks.utils import (
+    benchmark_database,
+    best_of,
+    seed_apartments,
+    seed_visits,
+    setup_django,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from apartments.serializers import (
+        ApartmentDetailOutputSerializer,
+        ApartmentInputSerializer,
+        ApartmentOutputSerializer,
+    )
+    from apartments.services import get_apartment_details, list_apartments
+    from livehere.parsers import ORJSONParser
+    from livehere.renderers import ORJSONRenderer
+    from visits.models import Visit
+    from visits.serializers import VisitOutputSerializer
+
+    with benchmark_database():
+        seed_apartments(args.rows * 2)
+        seed_visits(args.rows, tenants=10)
+        apartments = list(list_apartments().order_by("price", "id")[: args.rows])
+        payloads = [
+            ("apartment page", ApartmentOutputSerializer(apartments, many=True).data),
+            (
+                "apartment detail",
+                ApartmentDetailOutputSerializer(
+                    get_apartment_details(apartments[0].id)
+                ).data,
+            ),
+            (
+                "visit page",
+                VisitOutputSerializer(
+                    Visit.objects.order_by("date_time", "id")[: args.rows], many=True
+                ).data,
+            ),
+        ]
+        bulk_payload = ApartmentInputSerializer(apartments, many=True).data
+
+    for name, data in payloads:
+        json_bytes = JSONRenderer().render(data)
+        assert ORJSONRenderer().render(data) == json_bytes
+        json_ms = best_of(lambda: JSONRenderer().render(data), repeat=20)
+        orjson_ms = best_of(lambda: ORJSONRenderer().render(data), repeat=20)
+        print(
+            f"render {name:<18} {len(json_bytes):>8} B  json {json_ms:7.3f} ms"
+            f"  orjson {orjson_ms:7.3f} ms  x{json_ms / orjson_ms:5.1f}"
+        )
+
+    body = JSONRenderer().render(bulk_payload)
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(body)
+    )
+    json_ms = best_of(lambda: JSONParser().parse(io.BytesIO(body)), repeat=20)
+    orjson_ms = best_of(lambda: ORJSONParser().parse(io.BytesIO(body)), repeat=20)
+    print(
+        f"parse  {'bulk create':<18} {len(body):>8} B  json {json_ms:7.3f} ms"
+        f"  orjson {orjson_ms:7.3f} ms  x{json_ms / orjson_ms:5.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare ModelSerializer rendering with the values()-based row serializers.
+
+    python -m benchmarks.serializers --rows 10 100 1000
+"""
+
+import argparse
+
+from benchmarks.utils import (
+    benchmark_database,
+    best_of,
+    seed_apartments,
+    seed_visits,
+    setup_django,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from apartments.serializers import (
+        ApartmentOutputRowSerializer,
+        ApartmentOutputSerializer,
+    )
+    from apartments.services import list_apartments
+    from visits.models import Visit
+    from visits.serializers import VisitOutputRowSerializer, VisitOutputSerializer
+
+    renderer = JSONRenderer()
+    cases = [
+        (
+            "apartments",
+            list_apartments().order_by("price", "id"),
+            ApartmentOutputSerializer,
+            ApartmentOutputRowSerializer,
+        ),
+        (
+            "visits",
+            Visit.objects.order_by("date_time", "id"),
+            VisitOutputSerializer,
+            VisitOutputRowSerializer,
+        ),
+    ]
+
+    with benchmark_database():
+        seed_apartments(max(args.rows) * 2)
+        seed_visits(max(args.rows), tenants=10)
+
+        for name, queryset, serializer_class, row_serializer_class in cases:
+            row_serializer = row_serializer_class()
+            for rows in args.rows:
+
+                def render_models() -> bytes:
+                    page = list(queryset[:rows])
+                    return renderer.render(serializer_class(page, many=True).data)
+
+                def render_rows() -> bytes:
+                    page = list(queryset.values(*row_serializer.lookups)[:rows])
+                    return renderer.render(row_serializer.serialize(page))
+
+                assert render_models() == render_rows()
+                model_ms = best_of(render_models)
+                row_ms = best_of(render_rows)
+                print(
+                    f"{name:<10} {rows:>5} rows  serializer {model_ms:8.2f} ms"
+                    f"  rows {row_ms:8.2f} ms  x{model_ms / row_ms:5.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
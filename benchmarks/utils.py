@@ -0,0 +1,108 @@
+import os
+import random
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Callable, Iterator
+
+import django
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "livehere.settings")
+    django.setup()
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """Run the benchmark against a throwaway copy of the configured database."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_apartments(count: int, batch_size: int = 10000) -> None:
+    from django.contrib.auth.models import User
+
+    from apartments.choices import COUNTRY_CHOICES, CURRENCY_CHOICES
+    from apartments.models import Address, Apartment
+
+    owner, _ = User.objects.get_or_create(username="benchmark-owner")
+    countries = [country for country, _ in COUNTRY_CHOICES]
+    currencies = [currency for currency, _ in CURRENCY_CHOICES]
+    rng = random.Random(0)
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        addresses = Address.objects.bulk_create(
+            Address(
+                country=rng.choice(countries),
+                street=f"Street {start + i}",
+                city=f"City {rng.randrange(500)}",
+                province=f"Province {rng.randrange(50)}",
+                postal_code=f"{rng.randrange(100000):05d}",
+            )
+            for i in range(size)
+        )
+        Apartment.objects.bulk_create(
+            Apartment(
+                surface=Decimal(rng.randrange(2000, 20000)) / 100,
+                price=Decimal(rng.randrange(100000, 1000000)) / 100,
+                currency=rng.choice(currencies),
+                deposit=Decimal(rng.randrange(5000, 99999)) / 100,
+                is_available=rng.random() < 0.8,
+                description="Benchmark apartment " * 10,
+                is_furnished=rng.random() < 0.5,
+                owner=owner,
+                address=address,
+            )
+            for address in addresses
+        )
+
+
+def seed_visits(count: int, tenants: int = 1000, batch_size: int = 10000) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from django.contrib.auth.models import User
+
+    from apartments.models import Apartment
+    from visits.models import Visit
+
+    User.objects.bulk_create(
+        User(username=f"benchmark-tenant-{i}") for i in range(tenants)
+    )
+    user_ids = list(
+        User.objects.filter(username__startswith="benchmark-tenant-").values_list(
+            "id", flat=True
+        )
+    )
+    apartment_ids = list(Apartment.objects.values_list("id", flat=True)[:100000])
+    start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(0)
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        Visit.objects.bulk_create(
+            Visit(
+                apartment_id=rng.choice(apartment_ids),
+                user_id=rng.choice(user_ids),
+                date_time=start_date + timedelta(minutes=rng.randrange(525600)),
+            )
+            for _ in range(size)
+        )
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the fastest of ``repeat`` runs of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from images.services import backfill_apartment_images_metadata
+
+
+class Command(BaseCommand):
+    help = (
+        "Record the size, format and hash of images uploaded before they were "
+        "read at upload. Safe to interrupt and run again."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of worker processes, the number of CPUs by default.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        updated = failed = 0
+        for batch_updated, batch_failed in backfill_apartment_images_metadata(
+            batch_size=options["batch_size"], workers=options["workers"]
+        ):
+            updated += batch_updated
+            failed += len(batch_failed)
+            for image_id, error in batch_failed:
+                self.stderr.write(f"Skipped image {image_id}: {error}")
+            self.stdout.write(f"Updated {updated} images, {failed} failed so far.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled {updated} images, {failed} failed.")
+        )
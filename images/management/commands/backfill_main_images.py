@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from apartments.models import Apartment
+from images.services import backfill_apartments_main_image
+
+
+class Command(BaseCommand):
+    help = "Copy the main ApartmentImage of every apartment into Apartment.main_image."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        apartment_ids = Apartment.objects.order_by("id").values_list("id", flat=True)
+        updated = 0
+        batch = []
+        for apartment_id in apartment_ids.iterator(chunk_size=batch_size):
+            batch.append(apartment_id)
+            if len(batch) == batch_size:
+                updated += backfill_apartments_main_image(apartment_ids=batch)
+                batch = []
+        if batch:
+            updated += backfill_apartments_main_image(apartment_ids=batch)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} apartments."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandParser
+from rest_framework.exceptions import ValidationError
+
+from images.models import ApartmentImage
+from images.services import create_apartment_image_obj_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate the renditions of images uploaded before they existed."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options) -> None:
+        images = ApartmentImage.objects.filter(renditions={}).order_by("id")
+        created = failed = 0
+        for image_obj in images.iterator(chunk_size=options["batch_size"]):
+            try:
+                create_apartment_image_obj_renditions(image_obj=image_obj)
+            except (ValidationError, OSError) as exc:
+                failed += 1
+                self.stderr.write(f"Skipped image {image_obj.id}: {exc}")
+                continue
+            created += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created renditions of {created} images, {failed} failed."
+            )
+        )
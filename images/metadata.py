@@ -0,0 +1,54 @@
+import hashlib
+import uuid
+from typing import IO
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import Storage
+from PIL import Image as PILImage
+from rest_framework.exceptions import ValidationError
+
+IMAGE_METADATA_FIELDS = ("width", "height", "file_size", "format", "content_hash")
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def read_image_metadata(image_file: IO[bytes]) -> dict:
+    """
+    The IMAGE_METADATA_FIELDS of ``image_file``: its pixel size and format
+    from the image header, its byte size and its SHA-256 hex digest.
+    """
+    image_file.seek(0)
+    digest = hashlib.sha256()
+    file_size = 0
+    while chunk := image_file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+        file_size += len(chunk)
+    image_file.seek(0)
+    try:
+        with PILImage.open(image_file) as img:
+            width, height = img.size
+            image_format = img.format
+    except (PILImage.UnidentifiedImageError, OSError):
+        raise ValidationError("Invalid image file.")
+    return {
+        "width": width,
+        "height": height,
+        "file_size": file_size,
+        "format": image_format,
+        "content_hash": digest.hexdigest(),
+    }
+
+
+def read_stored_image_metadata(
+    image_id: uuid.UUID, name: str, storage: Storage
+) -> tuple[uuid.UUID, dict | None, str | None]:
+    """
+    ``read_image_metadata`` of a stored file, returning the error instead of
+    raising it, so it can run in a worker process.
+    """
+    try:
+        with storage.open(name, "rb") as image_file:
+            return image_id, read_image_metadata(image_file), None
+    except ValidationError as exc:
+        return image_id, None, str(exc.detail[0])
+    except (OSError, SuspiciousFileOperation) as exc:
+        return image_id, None, str(exc)
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("images", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartmentimage",
+            name="renditions",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-18 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("images", "0002_apartmentimage_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartmentimage",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="apartmentimage",
+            name="file_size",
+            field=models.PositiveBigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="apartmentimage",
+            name="format",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name="apartmentimage",
+            name="height",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="apartmentimage",
+            name="width",
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+    ]
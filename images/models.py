@@ -11,5 +11,13 @@ class ApartmentImage(models.Model):
         upload_to="images/",
         validators=[FileExtensionValidator(allowed_extensions=["jpg", "png"])],
     )
+    # Rendition name -> file name, see images.renditions.
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    # Read from the file at upload, see images.metadata.
+    width = models.PositiveIntegerField(null=True, editable=False)
+    height = models.PositiveIntegerField(null=True, editable=False)
+    file_size = models.PositiveBigIntegerField(null=True, editable=False)
+    format = models.CharField(max_length=16, blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
     is_main = models.BooleanField(default=False)
     apartment = models.ForeignKey(Apartment, on_delete=models.CASCADE, null=True)
@@ -0,0 +1,50 @@
+import io
+import uuid
+from typing import IO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from PIL import Image as PILImage, ImageOps
+from rest_framework.exceptions import ValidationError
+
+RENDITIONS_DIR = "images/renditions"
+
+
+def create_image_renditions(
+    image_file: IO[bytes], image_id: uuid.UUID, storage: Storage
+) -> dict[str, str]:
+    """
+    Save every ``settings.IMAGE_RENDITIONS`` size of ``image_file`` as a JPEG
+    and return their file names by rendition name.
+
+    The image is decoded once. JPEGs are decoded in draft mode, which lets
+    libjpeg scale by 1/2 to 1/8 while decoding, to the smallest size still
+    covering the largest rendition; each smaller rendition is then resized
+    from the one above it. Renditions are never larger than the original.
+    """
+    sizes = sorted(settings.IMAGE_RENDITIONS.items(), key=lambda item: -item[1])
+    image_file.seek(0)
+    try:
+        with PILImage.open(image_file) as img:
+            largest = sizes[0][1]
+            img.draft("RGB", (largest, largest))
+            img = ImageOps.exif_transpose(img).convert("RGB")
+    except (PILImage.UnidentifiedImageError, OSError):
+        raise ValidationError("Invalid image file.")
+
+    renditions = {}
+    for name, side in sizes:
+        img.thumbnail((side, side), PILImage.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(
+            buffer,
+            format="JPEG",
+            quality=settings.IMAGE_RENDITION_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+        renditions[name] = storage.save(
+            f"{RENDITIONS_DIR}/{image_id}_{name}.jpg", ContentFile(buffer.getvalue())
+        )
+    return renditions
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from images.models import ApartmentImage
 from images.services import get_image_resolution
+from livehere.fieldsets import SparseFieldsetSerializerMixin
+from livehere.renditions import get_rendition_url
 
 
 class ApartmentImageOutputSerializer(serializers.ModelSerializer):
@@ -17,7 +19,9 @@ class ApartmentImageOutputSerializer(serializers.ModelSerializer):
         return None
 
 
-class ApartmentImageOutputSimpleSerializer(serializers.ModelSerializer):
+class ApartmentImageOutputSimpleSerializer(
+    SparseFieldsetSerializerMixin, serializers.ModelSerializer
+):
     image = serializers.SerializerMethodField()
 
     class Meta:
@@ -26,26 +30,36 @@ class ApartmentImageOutputSimpleSerializer(serializers.ModelSerializer):
         many = True
 
     def get_image(self, instance):
-        if instance.image:
-            return instance.image.url
-        return None
+        return get_rendition_url(
+            instance.image, instance.renditions, self.context.get("size")
+        )
 
 
 class ApartmentImageDetailOutputSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     resolution = serializers.SerializerMethodField()
 
     class Meta:
         model = ApartmentImage
-        fields = ["id", "image", "is_main", "resolution"]
+        fields = ["id", "image", "is_main", "renditions", "resolution"]
 
     def get_image(self, instance):
         if instance.image:
             return instance.image.url
         return None
 
+    def get_renditions(self, instance):
+        return {
+            size: instance.image.storage.url(name)
+            for size, name in instance.renditions.items()
+        }
+
     def get_resolution(self, obj):
-        return get_image_resolution(image=obj)
+        if obj.width is None:
+            # Not backfilled yet, see the backfill_image_metadata command.
+            return get_image_resolution(image=obj)
+        return f"width: {obj.width} height: {obj.height}"
 
 
 class ApartmentImageDetailInputSerializer(serializers.Serializer):
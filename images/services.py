@@ -1,10 +1,22 @@
 from PIL import Image as PILImage
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterator
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.db.models import QuerySet
+from django.db import transaction
+from django.db.models import F, QuerySet, OuterRef, Subquery
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
+from apartments.models import Apartment
+from images.metadata import (
+    IMAGE_METADATA_FIELDS,
+    read_image_metadata,
+    read_stored_image_metadata,
+)
 from images.models import ApartmentImage
+from images.renditions import create_image_renditions
 from images.validators import validate_image_format
 
 
@@ -12,8 +24,43 @@ def create_apartment_image_obj(
     image: InMemoryUploadedFile, advertisement_id: int
 ) -> ApartmentImage:
     validate_image_format(uploaded_image=image)
-    image.name = f"{uuid.uuid4()}_adv_id: {advertisement_id}.jpg"
-    return ApartmentImage.objects.create(image=image, apartment_id=advertisement_id)
+    metadata = read_image_metadata(image_file=image)
+    image_id = uuid.uuid4()
+    storage = ApartmentImage._meta.get_field("image").storage
+    renditions = create_image_renditions(
+        image_file=image, image_id=image_id, storage=storage
+    )
+    image.name = f"{image_id}_adv_id: {advertisement_id}.jpg"
+    image_obj = ApartmentImage(
+        id=image_id,
+        image=image,
+        renditions=renditions,
+        apartment_id=advertisement_id,
+        **metadata,
+    )
+    try:
+        with transaction.atomic():
+            image_obj.save(force_insert=True)
+            _refresh_apartment_main_image(apartment_id=advertisement_id)
+    except Exception:
+        # The renditions and the original are stored before the row is
+        # inserted; a failed insert must not leave them behind.
+        for name in [*renditions.values(), image_obj.image.name]:
+            storage.delete(name)
+        raise
+    return image_obj
+
+
+def create_apartment_image_obj_renditions(image_obj: ApartmentImage) -> None:
+    with image_obj.image.open("rb") as image_file:
+        image_obj.renditions = create_image_renditions(
+            image_file=image_file,
+            image_id=image_obj.id,
+            storage=image_obj.image.storage,
+        )
+    image_obj.save(update_fields=["renditions"])
+    if image_obj.is_main:
+        _refresh_apartment_main_image(apartment_id=image_obj.apartment_id)
 
 
 def get_apartment_image_details(
@@ -30,16 +77,74 @@ def delete_apartment_image_obj(image_id: uuid.UUID, apartment_id: int) -> None:
         ApartmentImage, id=image_id, apartment_id=apartment_id
     )
     image_obj.delete()
+    _refresh_apartment_main_image(apartment_id=apartment_id)
 
 
 def _get_main_image(apartment_id: int) -> QuerySet:
     return ApartmentImage.objects.filter(apartment_id=apartment_id, is_main=True)
 
 
+@transaction.atomic
 def update_apartment_image_obj(image_obj: ApartmentImage, apartment_id: int) -> None:
     ApartmentImage.objects.filter(apartment_id=apartment_id).update(is_main=False)
     image_obj.is_main = True
     image_obj.save()
+    _refresh_apartment_main_image(apartment_id=apartment_id)
+
+
+def _refresh_apartment_main_image(apartment_id: int) -> None:
+    main_image = _get_main_image(apartment_id=apartment_id)
+    Apartment.objects.filter(id=apartment_id).update(
+        main_image=Subquery(main_image.values("image")[:1]),
+        main_image_renditions=Subquery(main_image.values("renditions")[:1]),
+        version=F("version") + 1,
+        updated_at=timezone.now(),
+    )
+
+
+def backfill_apartments_main_image(apartment_ids: list[uuid.UUID]) -> int:
+    main_image = ApartmentImage.objects.filter(
+        apartment_id=OuterRef("pk"), is_main=True
+    )
+    return Apartment.objects.filter(id__in=apartment_ids).update(
+        main_image=Subquery(main_image.values("image")[:1]),
+        main_image_renditions=Subquery(main_image.values("renditions")[:1]),
+    )
+
+
+def backfill_apartment_images_metadata(
+    batch_size: int = 100, workers: int | None = None
+) -> Iterator[tuple[int, list[tuple[uuid.UUID, str]]]]:
+    """
+    Record the metadata of images uploaded before it was read at upload.
+
+    Files are read in a process pool, a batch at a time, and each batch is
+    saved before the next one is read. Yields the number of images updated
+    and the ``(id, error)`` of unreadable ones per batch. Images still missing
+    metadata are what remains to do, so an interrupted backfill resumes where
+    it stopped when run again.
+    """
+    images = ApartmentImage.objects.filter(width__isnull=True).order_by("id")
+    read_metadata = partial(
+        read_stored_image_metadata,
+        storage=ApartmentImage._meta.get_field("image").storage,
+    )
+    last_id = None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = images if last_id is None else images.filter(id__gt=last_id)
+            batch = list(batch.values_list("id", "image")[:batch_size])
+            if not batch:
+                return
+            last_id = batch[-1][0]
+            updated, failed = [], []
+            for image_id, metadata, error in executor.map(read_metadata, *zip(*batch)):
+                if metadata is None:
+                    failed.append((image_id, error))
+                else:
+                    updated.append(ApartmentImage(id=image_id, **metadata))
+            ApartmentImage.objects.bulk_update(updated, IMAGE_METADATA_FIELDS)
+            yield len(updated), failed
 
 
 def get_image_resolution(image: ApartmentImage) -> str:
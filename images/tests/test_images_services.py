@@ -1,9 +1,16 @@
+import hashlib
 import os
+import shutil
+import uuid
 import pytest
 from _pytest.fixtures import SubRequest
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError
+from PIL import Image as PILImage
 from apartments.models import Address, Apartment
+from images import services as images_services
 from images.models import ApartmentImage
 from images.services import (
     create_apartment_image_obj,
@@ -94,6 +101,8 @@ class TestImagesServices:
         )
         assert ApartmentImage.objects.count() == 1
         os.remove(f"images/{created_apartment_image.image.name}")
+        for name in created_apartment_image.renditions.values():
+            os.remove(f"images/{name}")
 
     def test_get_image_details_return_apartment_image_obj(
         self, db_image: ApartmentImage
@@ -130,3 +139,138 @@ class TestImagesServices:
         assert db_image.is_main is True
         db_image_main.refresh_from_db()
         assert db_image_main.is_main is False
+
+    def test_update_apartment_image_obj_store_main_image_on_apartment(
+        self, db_image_main: ApartmentImage, db_image: ApartmentImage
+    ):
+        update_apartment_image_obj(
+            image_obj=db_image, apartment_id=db_image.apartment_id
+        )
+        apartment = Apartment.objects.get(id=db_image.apartment_id)
+        assert apartment.main_image.name == db_image.image.name
+
+    def test_delete_apartment_image_obj_clear_main_image_on_apartment(
+        self, db_image: ApartmentImage
+    ):
+        update_apartment_image_obj(
+            image_obj=db_image, apartment_id=db_image.apartment_id
+        )
+        delete_apartment_image_obj(
+            image_id=db_image.id, apartment_id=db_image.apartment_id
+        )
+        apartment = Apartment.objects.get(id=db_image.apartment_id)
+        assert not apartment.main_image
+
+    def test_backfill_main_images_command_store_main_image_on_apartment(
+        self, db_image_main: ApartmentImage
+    ):
+        call_command("backfill_main_images")
+        apartment = Apartment.objects.get(id=db_image_main.apartment_id)
+        assert apartment.main_image.name == db_image_main.image.name
+
+    @pytest.mark.parametrize("in_memory_image", ["valid_image.jpg"], indirect=True)
+    def test_create_image_obj_store_renditions_on_image_and_apartment(
+        self,
+        in_memory_image: SimpleUploadedFile,
+        apartment: Apartment,
+        settings,
+        tmp_path,
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        image_obj = create_apartment_image_obj(
+            image=in_memory_image, advertisement_id=apartment.id
+        )
+        update_apartment_image_obj(image_obj=image_obj, apartment_id=apartment.id)
+
+        assert set(image_obj.renditions) == set(settings.IMAGE_RENDITIONS)
+        for size, side in settings.IMAGE_RENDITIONS.items():
+            with PILImage.open(tmp_path / image_obj.renditions[size]) as rendition:
+                assert rendition.format == "JPEG"
+                assert max(rendition.size) == side
+        apartment.refresh_from_db()
+        assert apartment.main_image_renditions == image_obj.renditions
+        assert (image_obj.width, image_obj.height) == (1600, 1288)
+        assert image_obj.format == "JPEG"
+        assert image_obj.file_size == in_memory_image.size
+        assert len(image_obj.content_hash) == 64
+
+    @pytest.mark.parametrize("in_memory_image", ["valid_image.jpg"], indirect=True)
+    def test_create_image_obj_delete_stored_files_if_insert_fails(
+        self,
+        in_memory_image: SimpleUploadedFile,
+        db_image: ApartmentImage,
+        apartment: Apartment,
+        settings,
+        tmp_path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        # A taken id makes the image insert fail after the files are stored.
+        monkeypatch.setattr(uuid, "uuid4", lambda: db_image.id)
+
+        with pytest.raises(IntegrityError):
+            create_apartment_image_obj(
+                image=in_memory_image, advertisement_id=apartment.id
+            )
+
+        assert list(tmp_path.rglob("*.jpg")) == []
+        assert ApartmentImage.objects.count() == 1
+        assert Apartment.objects.get(id=apartment.id).version == apartment.version
+
+    @pytest.mark.parametrize("in_memory_image", ["valid_image.jpg"], indirect=True)
+    def test_create_image_obj_roll_back_image_if_main_image_refresh_fails(
+        self,
+        in_memory_image: SimpleUploadedFile,
+        apartment: Apartment,
+        settings,
+        tmp_path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        settings.MEDIA_ROOT = tmp_path
+
+        def fail(apartment_id: uuid.UUID) -> None:
+            raise DatabaseError("refresh failed")
+
+        monkeypatch.setattr(images_services, "_refresh_apartment_main_image", fail)
+
+        with pytest.raises(DatabaseError):
+            create_apartment_image_obj(
+                image=in_memory_image, advertisement_id=apartment.id
+            )
+
+        assert list(tmp_path.rglob("*.jpg")) == []
+        assert not ApartmentImage.objects.exists()
+
+    def test_create_image_renditions_command_fill_missing_renditions(
+        self, db_image_main: ApartmentImage, settings, tmp_path
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        shutil.copy(db_image_main.image.name, tmp_path / "valid_image.jpg")
+        db_image_main.image = "valid_image.jpg"
+        db_image_main.save()
+
+        call_command("create_image_renditions")
+
+        db_image_main.refresh_from_db()
+        apartment = Apartment.objects.get(id=db_image_main.apartment_id)
+        assert set(db_image_main.renditions) == set(settings.IMAGE_RENDITIONS)
+        assert apartment.main_image_renditions == db_image_main.renditions
+
+    def test_backfill_image_metadata_command_fill_missing_metadata_only(
+        self, db_image: ApartmentImage, db_image_main: ApartmentImage
+    ):
+        ApartmentImage.objects.filter(id=db_image_main.id).update(
+            width=1, height=1, format="PNG"
+        )
+
+        call_command("backfill_image_metadata", workers=1)
+
+        db_image.refresh_from_db()
+        db_image_main.refresh_from_db()
+        with open(db_image.image.name, "rb") as image_file:
+            content = image_file.read()
+        assert (db_image.width, db_image.height) == (1600, 1288)
+        assert db_image.format == "JPEG"
+        assert db_image.file_size == len(content)
+        assert db_image.content_hash == hashlib.sha256(content).hexdigest()
+        assert (db_image_main.width, db_image_main.format) == (1, "PNG")
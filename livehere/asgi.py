@@ -12,5 +12,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "livehere.settings")
+os.environ.setdefault("ASGI", "1")
 
 application = get_asgi_application()
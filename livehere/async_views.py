@@ -0,0 +1,71 @@
+import asyncio
+import inspect
+import weakref
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines using the async ORM.
+
+    Authentication, permissions, content negotiation, exception handling and
+    rendering are DRF's own. Only the user is loaded up front with
+    ``request.auser()``, so the synchronous authentication classes find it
+    already resolved instead of querying the database. Handlers such as the
+    inherited ``options()`` may stay synchronous. At most
+    ``settings.ASYNC_VIEW_CONCURRENCY`` requests are handled at once per event
+    loop; the others wait as coroutines.
+    """
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        async with _get_concurrency_limit():
+            return await self._dispatch(request, *args, **kwargs)
+
+    async def _dispatch(
+        self, request: HttpRequest, *args, **kwargs
+    ) -> HttpResponseBase:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request: Request, *args, **kwargs) -> None:
+        django_request = request._request
+        if hasattr(django_request, "auser"):
+            django_request.user = await django_request.auser()
+        self.initial(request, *args, **kwargs)
+
+
+_concurrency_limits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_concurrency_limit() -> asyncio.Semaphore:
+    # Every ORM call of an async view still runs in a worker thread with its
+    # own database connection. Capping the handlers running at once bounds
+    # those; the requests waiting here only cost a coroutine on the event loop.
+    loop = asyncio.get_running_loop()
+    if loop not in _concurrency_limits:
+        _concurrency_limits[loop] = asyncio.Semaphore(settings.ASYNC_VIEW_CONCURRENCY)
+    return _concurrency_limits[loop]
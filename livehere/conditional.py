@@ -0,0 +1,72 @@
+import hashlib
+
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def get_queryset_etag(queryset: QuerySet, request: Request) -> str:
+    """
+    Build an ETag for a list response from the rows' ``updated_at`` column.
+
+    Only the row count and the latest ``updated_at`` of the filtered queryset
+    are read, so a 304 is answered without fetching or serializing any row.
+    """
+    summary = queryset.order_by().aggregate(**_get_summary_aggregates())
+    return _build_etag(summary, request)
+
+
+async def aget_queryset_etag(queryset: QuerySet, request: Request) -> str:
+    summary = await queryset.order_by().aaggregate(**_get_summary_aggregates())
+    return _build_etag(summary, request)
+
+
+def _get_summary_aggregates() -> dict:
+    return {"count": Count("pk"), "last_updated": Max("updated_at")}
+
+
+def _build_etag(summary: dict, request: Request) -> str:
+    fingerprint = ":".join(
+        [
+            str(summary["count"]),
+            str(summary["last_updated"]),
+            str(request.user.pk),
+            request.get_full_path(),
+            request.accepted_media_type,
+        ]
+    )
+    return quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+
+
+class ConditionalListMixin:
+    """
+    Answer ``If-None-Match`` list requests with 304 when no row changed,
+    before the page is queried, serialized or rendered.
+    """
+
+    def list(self, request: Request, *args, **kwargs) -> Response | HttpResponse:
+        etag = get_queryset_etag(self.filter_queryset(self.get_queryset()), request)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+
+
+class AsyncConditionalListMixin:
+    """ConditionalListMixin for views listing through ``alist()``."""
+
+    async def alist(self, request: Request, *args, **kwargs) -> Response | HttpResponse:
+        etag = await aget_queryset_etag(
+            self.filter_queryset(self.get_queryset()), request
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = await super().alist(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
@@ -0,0 +1,107 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+PRIMARY_STICKY_COOKIE = "primary_sticky"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads to one of ``settings.REPLICA_DATABASES`` and writes to the primary.
+
+    Replicas are only used while ReplicaRoutingMiddleware allows it, so
+    management commands and other code outside a request keep reading from the
+    primary. The first write of a request switches its remaining reads back to
+    the primary, which then sees its own writes.
+    """
+
+    def db_for_read(self, model: type[Model], **hints) -> str:
+        replicas = settings.REPLICA_DATABASES
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: type[Model], **hints) -> str:
+        _read_from_replica.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> bool:
+        # Replicas hold copies of the primary's rows.
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from replicas.
+
+    Unsafe requests stay on the primary. A successful one also sets a cookie
+    that keeps the client on the primary for ``settings.PRIMARY_STICKY_SECONDS``,
+    so it does not read data older than its own write from a lagging replica.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_from_replica.set(self._may_read_from_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        return self._process_response(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = _read_from_replica.set(self._may_read_from_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+        return self._process_response(request, response)
+
+    def _may_read_from_replica(self, request: HttpRequest) -> bool:
+        return (
+            request.method in SAFE_METHODS
+            and PRIMARY_STICKY_COOKIE not in request.COOKIES
+        )
+
+    def _process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            sticky_seconds = settings.PRIMARY_STICKY_SECONDS
+            if sticky_seconds:
+                response.set_cookie(
+                    PRIMARY_STICKY_COOKIE,
+                    "1",
+                    max_age=sticky_seconds,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        return response
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Read from the primary inside the block, e.g. to fill a shared cache."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
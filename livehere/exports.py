@@ -0,0 +1,130 @@
+import csv
+import io
+from typing import AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from livehere.renderers import ORJSONRenderer
+from livehere.rows import RowSerializer
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BATCH_ROWS = 500
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class ExportView(APIView):
+    """
+    Stream every row of ``get_queryset()`` as NDJSON or CSV.
+
+    Rows are read with ``values().iterator(chunk_size=...)``, which uses a
+    server-side cursor on PostgreSQL, serialized by ``row_serializer_class``
+    and written out in small batches, so memory use does not depend on the
+    size of the export. Pick the format with ``?export_format=csv``.
+
+    Under ASGI the batches are produced by an async iterator, each one read in
+    the request's sync thread, since Django loads a sync iterator fully into
+    memory before streaming it to an ASGI server.
+
+    Subclasses set ``row_serializer_class`` and ``export_filename`` and
+    implement ``get_queryset()``.
+    """
+
+    row_serializer_class: type[RowSerializer]
+    export_ordering: tuple[str, ...] = ("pk",)
+    export_filename: str
+    export_format_query_param = "export_format"
+    chunk_size = EXPORT_CHUNK_SIZE
+
+    def get_queryset(self) -> QuerySet:
+        raise ImproperlyConfigured(
+            f"{self.__class__.__name__} is missing a get_queryset() implementation."
+        )
+
+    def perform_content_negotiation(self, request: Request, force: bool = False):
+        # The export bypasses the renderers, so any Accept header is fine.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request: Request, *args, **kwargs) -> StreamingHttpResponse:
+        export_format = request.query_params.get(
+            self.export_format_query_param, "ndjson"
+        )
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationError(
+                {
+                    self.export_format_query_param: [
+                        f"Choose one of: {', '.join(EXPORT_CONTENT_TYPES)}."
+                    ]
+                }
+            )
+
+        row_serializer = self.row_serializer_class()
+        rows = (
+            self.get_queryset()
+            .order_by(*self.export_ordering)
+            .values(*row_serializer.lookups)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        stream = (
+            stream_csv(rows, row_serializer)
+            if export_format == "csv"
+            else stream_ndjson(rows, row_serializer)
+        )
+        if isinstance(request._request, ASGIRequest):
+            stream = _aiterate(stream)
+        response = StreamingHttpResponse(
+            stream, content_type=EXPORT_CONTENT_TYPES[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.export_filename}.{export_format}"'
+        )
+        return response
+
+
+def stream_ndjson(
+    rows: Iterable[dict], row_serializer: RowSerializer
+) -> Iterator[bytes]:
+    renderer = ORJSONRenderer()
+    batch = []
+    for row in rows:
+        batch.append(renderer.render(row_serializer.to_representation(row)))
+        if len(batch) == EXPORT_BATCH_ROWS:
+            yield b"\n".join(batch) + b"\n"
+            batch.clear()
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+def stream_csv(rows: Iterable[dict], row_serializer: RowSerializer) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(row_serializer.columns)
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row_serializer.to_flat_row(row))
+        if index % EXPORT_BATCH_ROWS == 0:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+async def _aiterate(stream: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # Thread-sensitive, so every batch is read on the connection, and the
+    # server-side cursor, the sync view opened.
+    next_batch = sync_to_async(next, thread_sensitive=True)
+    while (batch := await next_batch(stream, None)) is not None:
+        yield batch
+
+
+def _drain(buffer: io.StringIO) -> bytes:
+    data = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
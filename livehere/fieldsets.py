@@ -0,0 +1,152 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FieldSelection = dict[str, "FieldSelection | None"]
+
+
+def parse_fields(value: str) -> FieldSelection:
+    """
+    Parse ``id,price,address.latitude`` into ``{"id": None, "price": None,
+    "address": {"latitude": None}}``, where ``None`` selects the whole field.
+    """
+    selection = {}
+    for path in filter(None, (path.strip() for path in value.split(","))):
+        *parents, name = path.split(".")
+        node = selection
+        for parent in parents:
+            if parent in node and node[parent] is None:
+                break
+            node = node.setdefault(parent, {})
+        else:
+            node[name] = None
+    return selection
+
+
+def select_fields(data: dict | list, selection: FieldSelection | None) -> dict | list:
+    """Trim already serialized ``data`` down to ``selection``."""
+    if selection is None:
+        return data
+    if isinstance(data, list):
+        return [select_fields(item, selection) for item in data]
+    return {
+        name: select_fields(value, selection[name])
+        for name, value in data.items()
+        if name in selection
+    }
+
+
+class SparseFieldsetSerializerMixin:
+    """Serialize only the fields selected through the ``fields`` argument."""
+
+    def __init__(self, *args, fields: FieldSelection | None = None, **kwargs) -> None:
+        self.selected_fields = fields
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        fields = super().get_fields()
+        if self.selected_fields is None:
+            return fields
+        fields = {
+            name: field
+            for name, field in fields.items()
+            if name in self.selected_fields
+        }
+        for name, field in fields.items():
+            nested = _get_nested_serializer(field)
+            if isinstance(nested, SparseFieldsetSerializerMixin):
+                nested.selected_fields = self.selected_fields[name]
+        return fields
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients pick response fields with ``?fields=id,price,address.city``.
+
+    The selection trims the serializer and prunes the queryset with ``only()``
+    and ``select_related()``, so unselected columns are neither read from the
+    database nor sent over the network. Unknown fields are rejected with 400.
+    """
+
+    fields_query_param = "fields"
+
+    def get_selected_fields(self) -> FieldSelection | None:
+        if not hasattr(self, "_selected_fields"):
+            value = self.request.query_params.get(self.fields_query_param)
+            selection = parse_fields(value) if value else None
+            if selection is not None:
+                _validate_selection(self.get_serializer_class()(), selection)
+            self._selected_fields = selection
+        return self._selected_fields
+
+    def get_serializer(self, *args, **kwargs) -> serializers.BaseSerializer:
+        if issubclass(self.get_serializer_class(), SparseFieldsetSerializerMixin):
+            kwargs.setdefault("fields", self.get_selected_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def prune_queryset(self, queryset: QuerySet) -> QuerySet:
+        selection = self.get_selected_fields()
+        if selection is None:
+            return queryset
+        columns, relations = _get_selected_columns(
+            self.get_serializer_class()(), selection
+        )
+        columns.extend(getattr(self, "cursor_ordering", ()))
+        queryset = queryset.select_related(None)
+        if relations:
+            # select_related() without arguments would follow every foreign key.
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
+
+
+def _get_nested_serializer(field: serializers.Field) -> serializers.Field:
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    return field
+
+
+def _validate_selection(
+    serializer: serializers.Serializer, selection: FieldSelection, prefix: str = ""
+) -> None:
+    for name, nested_selection in selection.items():
+        field = serializer.fields.get(name)
+        if field is None:
+            raise ValidationError({"fields": [f"Unknown field: {prefix}{name}."]})
+        if nested_selection is None:
+            continue
+        nested = _get_nested_serializer(field)
+        if not isinstance(nested, serializers.Serializer):
+            raise ValidationError(
+                {"fields": [f"Field {prefix}{name} has no nested fields."]}
+            )
+        _validate_selection(nested, nested_selection, prefix=f"{prefix}{name}.")
+
+
+def _get_selected_columns(
+    serializer: serializers.ModelSerializer,
+    selection: FieldSelection | None,
+    prefix: str = "",
+) -> tuple[list[str], list[str]]:
+    model = serializer.Meta.model
+    columns, relations = [], []
+    for name, field in serializer.fields.items():
+        if selection is not None and name not in selection:
+            continue
+        source = name if field.source == "*" else field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, serializers.ModelSerializer):
+            nested_columns, nested_relations = _get_selected_columns(
+                field,
+                None if selection is None else selection[name],
+                prefix=f"{prefix}{source}__",
+            )
+            relations.append(f"{prefix}{source}")
+            relations.extend(nested_relations)
+            columns.extend(nested_columns)
+        elif model_field.concrete:
+            columns.append(f"{prefix}{source}")
+    return columns, relations
@@ -0,0 +1,37 @@
+from django.db.migrations.operations.base import Operation
+
+
+class PostgresOnly(Operation):
+    """
+    Apply the wrapped operation's database changes on PostgreSQL only.
+
+    The migration state is always updated, so models can declare
+    PostgreSQL-specific indexes and SQL that other backends skip.
+    """
+
+    def __init__(self, operation: Operation) -> None:
+        self.operation = operation
+
+    @property
+    def reversible(self) -> bool:
+        return self.operation.reversible
+
+    def state_forwards(self, app_label, state) -> None:
+        self.operation.state_forwards(app_label, state)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state) -> None:
+        if schema_editor.connection.vendor == "postgresql":
+            self.operation.database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ) -> None:
+        if schema_editor.connection.vendor == "postgresql":
+            self.operation.database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def describe(self) -> str:
+        return f"{self.operation.describe()} (PostgreSQL only)"
@@ -0,0 +1,174 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset mode.
+
+    Sending ``?cursor=`` switches to keyset pagination over the view's
+    ``cursor_ordering`` fields, e.g. ``("price", "id")``. Every page is then
+    fetched with a ``WHERE (price, id) > (...)`` seek instead of an ``OFFSET``
+    and no ``COUNT(*)`` is run, so page 10 000 costs the same as page 1.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView = None
+    ) -> list | None:
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        queryset, page_size = self._seek_queryset(queryset, request, view)
+        return self._get_cursor_page(list(queryset[: page_size + 1]), page_size)
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView = None
+    ) -> list | None:
+        """paginate_queryset for async views, reading rows with the async ORM."""
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if self.use_cursor:
+            queryset, page_size = self._seek_queryset(queryset, request, view)
+            results = [row async for row in queryset[: page_size + 1].aiterator()]
+            return self._get_cursor_page(results, page_size)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached property; fill it so page() does not
+        # run a synchronous COUNT(*).
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        self.page.object_list = [row async for row in self.page.object_list.aiterator()]
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+    def get_paginated_response(self, data: list) -> Response:
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self) -> str | None:
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self._encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self._encode_cursor(self.previous_position, reverse=True)
+
+    def _seek_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView
+    ) -> tuple[QuerySet, int]:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = view.cursor_ordering
+        self.position, self.reverse = self._decode_cursor(request, queryset)
+
+        order_by = [f"-{field}" if self.reverse else field for field in self.ordering]
+        queryset = queryset.order_by(*order_by)
+        if self.position is not None:
+            queryset = queryset.filter(self._seek_filter(self.position, self.reverse))
+        return queryset, self.get_page_size(request)
+
+    def _get_cursor_page(self, results: list, page_size: int) -> list:
+        position, reverse = self.position, self.reverse
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = self._get_position(results[-1])
+            if (has_more and reverse) or (position is not None and not reverse):
+                self.previous_position = self._get_position(results[0])
+        return results
+
+    def _seek_filter(self, position: list, reverse: bool) -> Q:
+        lookup = "lt" if reverse else "gt"
+        seek = Q()
+        for index in reversed(range(len(self.ordering))):
+            field = self.ordering[index]
+            equal = Q(**dict(zip(self.ordering[:index], position[:index])))
+            seek = (equal & Q(**{f"{field}__{lookup}": position[index]})) | seek
+        return seek
+
+    def _get_position(self, item: object) -> list:
+        if isinstance(item, dict):
+            return [str(item[field]) for field in self.ordering]
+        return [str(getattr(item, field)) for field in self.ordering]
+
+    def _encode_cursor(self, position: list, reverse: bool) -> str:
+        payload = json.dumps({"p": position, "r": int(reverse)})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def _decode_cursor(
+        self, request: Request, queryset: QuerySet
+    ) -> tuple[list | None, bool]:
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = payload["p"], bool(payload["r"])
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError("Wrong number of cursor positions.")
+            position = [
+                self._to_python(queryset, field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _to_python(self, queryset: QuerySet, field_name: str, value: object) -> object:
+        # Cursors come from the client; a position that is not a value of the
+        # ordering field is rejected here rather than failing in the query.
+        if not isinstance(value, str):
+            raise ValueError("Cursor positions are strings.")
+        value = queryset.model._meta.get_field(field_name).to_python(value)
+        if value is None:
+            raise ValueError("Cursor positions cannot be null.")
+        return value
@@ -0,0 +1,67 @@
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import FileField, Model
+from django.db.models.fields.files import FieldFile
+from rest_framework.exceptions import ValidationError
+
+
+def get_rendition_url(
+    image: FieldFile, renditions: dict[str, str] | None, size: str | None
+) -> str | None:
+    """
+    URL of the ``size`` rendition of ``image``, or of ``image`` itself when no
+    size is asked for or the rendition was never generated.
+    """
+    if not image:
+        return None
+    name = (renditions or {}).get(size) if size else None
+    return image.storage.url(name) if name else image.url
+
+
+def rendition_url(
+    model: type[Model], field_name: str, size: str
+) -> Callable[[str | None, dict | None], str | None]:
+    """
+    Row converter taking the file name and the renditions of a file field,
+    like ``get_rendition_url`` on the model instance.
+    """
+    field = model._meta.get_field(field_name)
+    if not isinstance(field, FileField):
+        raise ImproperlyConfigured(
+            f"{model.__name__}.{field_name} is not a file field."
+        )
+    storage = field.storage
+
+    def convert(name: str | None, renditions: dict | None) -> str | None:
+        if not name:
+            return None
+        return storage.url((renditions or {}).get(size) or name)
+
+    return convert
+
+
+class ImageRenditionMixin:
+    """
+    Let clients ask for smaller images with ``?size=thumb``.
+
+    The sizes are the keys of ``settings.IMAGE_RENDITIONS``; unknown ones are
+    rejected with 400. The size is passed to the serializer context and to
+    the row serializer of ``ValuesListMixin``.
+    """
+
+    size_query_param = "size"
+
+    def get_rendition_size(self) -> str | None:
+        if not hasattr(self, "_rendition_size"):
+            size = self.request.query_params.get(self.size_query_param) or None
+            if size is not None and size not in settings.IMAGE_RENDITIONS:
+                raise ValidationError({"size": [f"Unknown size: {size}."]})
+            self._rendition_size = size
+        return self._rendition_size
+
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        context["size"] = self.get_rendition_size()
+        return context
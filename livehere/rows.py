@@ -0,0 +1,305 @@
+import decimal
+from functools import lru_cache
+from typing import Callable
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import FileField, Model, QuerySet
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from livehere.fieldsets import FieldSelection
+from livehere.renditions import rendition_url
+
+Converter = Callable[..., object]
+# (output name, values() lookup(s), converter, nested plan). A converter of
+# several lookups is called with all their values, even when they are None.
+RowPlan = tuple[
+    tuple[str, str | tuple[str, ...] | None, Converter | None, "RowPlan | None"], ...
+]
+
+
+class RowSerializer:
+    """
+    Serialize ``QuerySet.values()`` rows like ``serializer_class`` would.
+
+    The fields of ``serializer_class`` are compiled once into ``values()``
+    lookups and plain converter functions, so a page is rendered without
+    model instances or per-field serializer dispatch while producing the
+    same JSON. Fields the compiler cannot derive, such as method fields,
+    are declared in ``converters`` as ``{name: (lookup, converter)}``.
+    Image fields with renditions are declared in ``rendition_fields`` as
+    ``{name: (file lookup, renditions lookup)}`` and render the rendition of
+    ``size`` when one is given.
+    """
+
+    serializer_class: type[serializers.ModelSerializer]
+    converters: dict[str, tuple[str, Converter | None]] = {}
+    rendition_fields: dict[str, tuple[str, str]] = {}
+
+    def __init__(
+        self, fields: FieldSelection | None = None, size: str | None = None
+    ) -> None:
+        self.plan = _compile_plan(type(self), _freeze_selection(fields), size)
+
+    @property
+    def lookups(self) -> list[str]:
+        return list(_get_lookups(self.plan))
+
+    @property
+    def columns(self) -> list[str]:
+        """Dotted output names of the leaf fields, e.g. ``address.city``."""
+        return list(_get_columns(self.plan))
+
+    def to_flat_row(self, row: dict) -> list:
+        return list(_build_flat_row(self.plan, row))
+
+    def to_representation(self, row: dict) -> dict:
+        return _build_row(self.plan, row)
+
+    def serialize(self, rows: QuerySet | list[dict]) -> list[dict]:
+        plan = self.plan
+        return [_build_row(plan, row) for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Render list responses through ``row_serializer_class`` and ``values()``.
+
+    Combines with ``SparseFieldsetMixin`` and the keyset pagination: selected
+    fields narrow the ``values()`` call, and cursor columns are always read.
+    """
+
+    row_serializer_class: type[RowSerializer]
+
+    def get_row_serializer(self) -> RowSerializer:
+        selection = size = None
+        if hasattr(self, "get_selected_fields"):
+            selection = self.get_selected_fields()
+        if hasattr(self, "get_rendition_size"):
+            size = self.get_rendition_size()
+        return self.row_serializer_class(fields=selection, size=size)
+
+    def get_values_queryset(self, row_serializer: RowSerializer) -> QuerySet:
+        lookups = dict.fromkeys(
+            [*row_serializer.lookups, *getattr(self, "cursor_ordering", ())]
+        )
+        return self.filter_queryset(self.get_queryset()).values(*lookups)
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        row_serializer = self.get_row_serializer()
+        queryset = self.get_values_queryset(row_serializer)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(row_serializer.serialize(page))
+        return Response(row_serializer.serialize(queryset))
+
+
+class AsyncValuesListMixin(ValuesListMixin):
+    """ValuesListMixin for AsyncAPIView subclasses, using the async ORM."""
+
+    async def get(self, request: Request, *args, **kwargs) -> Response:
+        return await self.alist(request, *args, **kwargs)
+
+    async def alist(self, request: Request, *args, **kwargs) -> Response:
+        row_serializer = self.get_row_serializer()
+        queryset = self.get_values_queryset(row_serializer)
+
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                return self.get_paginated_response(row_serializer.serialize(page))
+        rows = [row async for row in queryset.aiterator()]
+        return Response(row_serializer.serialize(rows))
+
+
+def file_url(model: type[Model], field_name: str) -> Converter:
+    """Converter returning the storage URL of a file field, like ``FieldFile.url``."""
+    field = model._meta.get_field(field_name)
+    if not isinstance(field, FileField):
+        raise ImproperlyConfigured(
+            f"{model.__name__}.{field_name} is not a file field."
+        )
+    storage = field.storage
+    return lambda name: storage.url(name) if name else None
+
+
+def _build_row(plan: RowPlan, row: dict) -> dict:
+    data = {}
+    for name, lookup, convert, nested in plan:
+        if nested is not None:
+            data[name] = _build_row(nested, row)
+            continue
+        if lookup.__class__ is tuple:
+            data[name] = convert(*[row[column] for column in lookup])
+            continue
+        value = row[lookup]
+        data[name] = value if value is None or convert is None else convert(value)
+    return data
+
+
+def _build_flat_row(plan: RowPlan, row: dict):
+    for _, lookup, convert, nested in plan:
+        if nested is not None:
+            yield from _build_flat_row(nested, row)
+            continue
+        if lookup.__class__ is tuple:
+            yield convert(*[row[column] for column in lookup])
+            continue
+        value = row[lookup]
+        yield value if value is None or convert is None else convert(value)
+
+
+def _get_columns(plan: RowPlan, prefix: str = ""):
+    for name, _, _, nested in plan:
+        if nested is not None:
+            yield from _get_columns(nested, prefix=f"{prefix}{name}.")
+        else:
+            yield f"{prefix}{name}"
+
+
+def _get_lookups(plan: RowPlan):
+    for _, lookup, _, nested in plan:
+        if nested is not None:
+            yield from _get_lookups(nested)
+        elif lookup.__class__ is tuple:
+            yield from lookup
+        else:
+            yield lookup
+
+
+def _freeze_selection(selection: FieldSelection | None) -> tuple | None:
+    if selection is None:
+        return None
+    return tuple(
+        sorted((name, _freeze_selection(nested)) for name, nested in selection.items())
+    )
+
+
+@lru_cache(maxsize=128)
+def _compile_plan(
+    row_serializer_class: type[RowSerializer],
+    selection: tuple | None,
+    size: str | None,
+):
+    converters = row_serializer_class.converters
+    if size is not None:
+        model = row_serializer_class.serializer_class.Meta.model
+        converters = {
+            **converters,
+            **{
+                name: (lookups, rendition_url(model, lookups[0], size))
+                for name, lookups in row_serializer_class.rendition_fields.items()
+            },
+        }
+    return _compile_serializer(
+        row_serializer_class.serializer_class(),
+        selection,
+        converters=converters,
+        prefix="",
+    )
+
+
+def _compile_serializer(
+    serializer: serializers.ModelSerializer,
+    selection: tuple | None,
+    converters: dict[str, tuple[str | tuple[str, ...], Converter | None]],
+    prefix: str,
+) -> RowPlan:
+    selected = None if selection is None else dict(selection)
+    plan = []
+    for name, field in serializer.fields.items():
+        if selected is not None and name not in selected:
+            continue
+        if not prefix and name in converters:
+            lookup, convert = converters[name]
+            plan.append((name, lookup, convert, None))
+        elif isinstance(field, serializers.ModelSerializer):
+            relation = serializer.Meta.model._meta.get_field(field.source)
+            if relation.null:
+                raise ImproperlyConfigured(
+                    f"Cannot compile nullable nested relation {prefix}{name}."
+                )
+            nested_plan = _compile_serializer(
+                field,
+                None if selected is None else selected[name],
+                converters={},
+                prefix=f"{prefix}{field.source}__",
+            )
+            plan.append((name, None, None, nested_plan))
+        else:
+            plan.append((name, f"{prefix}{field.source}", _compile_field(field), None))
+    return tuple(plan)
+
+
+def _compile_field(field: serializers.Field) -> Converter | None:
+    if field.source == "*" or "." in field.source:
+        raise ImproperlyConfigured(f"Cannot compile field {field.field_name!r}.")
+    if isinstance(field, serializers.DecimalField):
+        return _compile_decimal(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _compile_datetime(field)
+    if isinstance(field, serializers.UUIDField):
+        if field.uuid_format == "hex_verbose":
+            return str
+        return lambda value: getattr(value, field.uuid_format)
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            raise ImproperlyConfigured(f"Cannot compile field {field.field_name!r}.")
+        return None
+    if isinstance(field, serializers.ChoiceField):
+        choices = field.choice_strings_to_values
+        return lambda value: choices.get(str(value), value)
+    if isinstance(field, (serializers.BooleanField, serializers.CharField)):
+        return None
+    if isinstance(field, serializers.IntegerField):
+        return int
+    if isinstance(field, serializers.FloatField):
+        return float
+    raise ImproperlyConfigured(f"Cannot compile field {field.field_name!r}.")
+
+
+def _compile_decimal(field: serializers.DecimalField) -> Converter:
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    if field.localize:
+        raise ImproperlyConfigured(f"Cannot compile field {field.field_name!r}.")
+    if field.decimal_places is None:
+        exponent = context = None
+    else:
+        exponent = decimal.Decimal(".1") ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+
+    def convert(value: decimal.Decimal) -> decimal.Decimal | str:
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        if exponent is not None:
+            value = value.quantize(exponent, rounding=field.rounding, context=context)
+        return "{:f}".format(value) if coerce_to_string else value
+
+    return convert
+
+
+def _compile_datetime(field: serializers.DateTimeField) -> Converter:
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None:
+        return None
+
+    def convert(value):
+        if isinstance(value, str):
+            return value
+        value = field.enforce_timezone(value)
+        if output_format.lower() == ISO_8601:
+            value = value.isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+        return value.strftime(output_format)
+
+    return convert
@@ -25,8 +25,15 @@ SECRET_KEY = os.environ["SECRET_KEY"]
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = bool(os.environ.get("DEBUG", default=1))
-
-ALLOWED_HOSTS = []
+# Set by livehere.asgi.
+ASGI = bool(int(os.environ.get("ASGI", 0)))
+# The debug toolbar middleware is sync only: under ASGI it would make Django
+# run every request, async views included, on a worker thread.
+DEBUG_TOOLBAR = DEBUG and not ASGI
+
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+]
 
 
 # Application definition
@@ -38,7 +45,6 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "django_filters",
     "rest_framework",
     "rest_framework_simplejwt",
@@ -49,15 +55,22 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "livehere.db_router.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.auth.middleware.AuthenticationMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
 ROOT_URLCONF = "livehere.urls"
 
 TEMPLATES = [
@@ -90,8 +103,52 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["DB_HOST"],
         "PORT": os.environ["DB_PORT"],
-    }
+    },
+    # A streaming replica of "default". Without DB_REPLICA_HOST it is never
+    # routed to; the test runner still creates it as a second, empty database.
+    "replica": {
+        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "NAME": os.environ["DB_NAME"],
+        "USER": os.environ.get("DB_REPLICA_USER", os.environ["DB_USER"]),
+        "PASSWORD": os.environ.get(
+            "DB_REPLICA_PASSWORD", os.environ["POSTGRES_PASSWORD"]
+        ),
+        "HOST": os.environ.get("DB_REPLICA_HOST", os.environ["DB_HOST"]),
+        "PORT": os.environ.get("DB_REPLICA_PORT", os.environ["DB_PORT"]),
+        "TEST": {"NAME": f"test_{os.environ['DB_NAME']}_replica"},
+    },
 }
+DATABASE_ROUTERS = ["livehere.db_router.PrimaryReplicaRouter"]
+REPLICA_DATABASES = ["replica"] if os.environ.get("DB_REPLICA_HOST") else []
+# How long a client keeps reading from the primary after it wrote something.
+PRIMARY_STICKY_SECONDS = int(os.environ.get("PRIMARY_STICKY_SECONDS", 10))
+
+# Serve the hot read endpoints with their async views. Off by default: under
+# WSGI every async view runs in its own event loop, and under ASGI the load
+# benchmark has not shown them to be faster than the sync views yet.
+ASYNC_READ_VIEWS = bool(int(os.environ.get("ASYNC_READ_VIEWS", 0)))
+# Async view handlers allowed to run at once in one process, which bounds the
+# ORM worker threads and database connections they hold.
+ASYNC_VIEW_CONCURRENCY = int(os.environ.get("ASYNC_VIEW_CONCURRENCY", 32))
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+APARTMENT_DETAIL_CACHE_TIMEOUT = 60 * 15
 
 
 # Password validation
@@ -163,6 +220,10 @@ WHITELISTED_IMAGE_TYPES = {
     "png": "image/png",
 }
 
+# Rendition name -> longest side in pixels, generated for every uploaded image.
+IMAGE_RENDITIONS = {"thumb": 200, "card": 480, "full": 1280}
+IMAGE_RENDITION_QUALITY = 85
+
 # SIMPLE_JWT = {
 #     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=999),
 #     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -24,5 +24,7 @@ from livehere import settings
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api_urls")),
-    path("__debug__/", include("debug_toolbar.urls")),
 ] + static("/api/media/", document_root=settings.MEDIA_ROOT)
+
+if settings.DEBUG_TOOLBAR:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from visits.partitions import (
+    VISIT_PARTITION_MONTHS_AHEAD,
+    create_visit_partitions,
+    is_visit_table_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = "Create the monthly Visit partitions of the coming months."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=VISIT_PARTITION_MONTHS_AHEAD,
+            help="Number of months after the current one to create partitions for.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not is_visit_table_partitioned():
+            self.stdout.write("Visits are stored in a single table, nothing to do.")
+            return
+        created = create_visit_partitions(months_ahead=options["months"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {len(created)} partitions: {created}.")
+        )
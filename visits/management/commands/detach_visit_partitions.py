@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from visits.partitions import detach_visit_partitions, is_visit_table_partitioned
+
+
+class Command(BaseCommand):
+    help = "Detach the monthly Visit partitions of the months before a date."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "before",
+            type=date.fromisoformat,
+            help="Detach the partitions of the months before this date's month.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop the detached partitions instead of keeping their tables.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not is_visit_table_partitioned():
+            self.stdout.write("Visits are stored in a single table, nothing to do.")
+            return
+        detached = detach_visit_partitions(
+            before=options["before"], drop=options["drop"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Detached {len(detached)} partitions: {detached}.")
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0006_apartment_apartment_avail_price_idx_and_more"),
+        ("visits", "0002_alter_visit_apartment"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                fields=["user", "date_time", "id"], name="visit_user_date_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                fields=["apartment", "date_time", "id"],
+                name="visit_apartment_date_time_idx",
+            ),
+        ),
+    ]
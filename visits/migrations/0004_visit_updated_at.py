@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("visits", "0003_visit_visit_user_date_time_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="visit",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
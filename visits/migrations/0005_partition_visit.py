@@ -0,0 +1,107 @@
+from django.db import migrations
+
+from livehere.migration_operations import PostgresOnly
+
+# PostgreSQL requires the partition key in the primary key, so the table's key
+# becomes (id, date_time) and nothing enforces that id alone is unique; see
+# the Visit docstring. The constraints and indexes keep the names Django gave
+# them, so later migrations of these fields find them as Django expects.
+VISIT_CONSTRAINTS_SQL = """
+    CONSTRAINT visits_visit_apartment_id_aec8933e_fk_apartments_apartment_id
+        FOREIGN KEY (apartment_id) REFERENCES apartments_apartment (id)
+        DEFERRABLE INITIALLY DEFERRED,
+    CONSTRAINT visits_visit_user_id_8778758b_fk_auth_user_id
+        FOREIGN KEY (user_id) REFERENCES auth_user (id)
+        DEFERRABLE INITIALLY DEFERRED
+"""
+
+VISIT_INDEXES_SQL = """
+CREATE INDEX visits_visit_apartment_id_aec8933e ON visits_visit (apartment_id);
+CREATE INDEX visits_visit_user_id_8778758b ON visits_visit (user_id);
+CREATE INDEX visit_user_date_time_idx
+    ON visits_visit (user_id, date_time, id);
+CREATE INDEX visit_apartment_date_time_idx
+    ON visits_visit (apartment_id, date_time, id);
+"""
+
+DROP_VISIT_INDEXES_SQL = """
+DROP INDEX visits_visit_apartment_id_aec8933e;
+DROP INDEX visits_visit_user_id_8778758b;
+DROP INDEX visit_user_date_time_idx;
+DROP INDEX visit_apartment_date_time_idx;
+"""
+
+PARTITION_VISIT_SQL = f"""
+ALTER TABLE visits_visit RENAME TO visits_visit_unpartitioned;
+ALTER TABLE visits_visit_unpartitioned
+    RENAME CONSTRAINT visits_visit_pkey TO visits_visit_unpartitioned_pkey;
+{DROP_VISIT_INDEXES_SQL}
+CREATE TABLE visits_visit (
+    id uuid NOT NULL,
+    apartment_id uuid NULL,
+    user_id integer NOT NULL,
+    date_time timestamp with time zone NOT NULL,
+    state varchar NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    CONSTRAINT visits_visit_pkey PRIMARY KEY (id, date_time),{VISIT_CONSTRAINTS_SQL}) PARTITION BY RANGE (date_time);
+{VISIT_INDEXES_SQL}CREATE TABLE visits_visit_default PARTITION OF visits_visit DEFAULT;
+
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', least(min(date_time), now()) AT TIME ZONE 'UTC'),
+            date_trunc('month', greatest(max(date_time), now()) AT TIME ZONE 'UTC')
+                + interval '3 months',
+            interval '1 month'
+        )
+        FROM visits_visit_unpartitioned
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF visits_visit FOR VALUES FROM (%L) TO (%L)',
+            'visits_visit_p' || to_char(month, 'YYYY_MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END
+$$;
+
+INSERT INTO visits_visit (id, apartment_id, user_id, date_time, state, updated_at)
+SELECT id, apartment_id, user_id, date_time, state, updated_at
+FROM visits_visit_unpartitioned;
+DROP TABLE visits_visit_unpartitioned;
+"""
+
+UNPARTITION_VISIT_SQL = f"""
+ALTER TABLE visits_visit RENAME TO visits_visit_partitioned;
+ALTER TABLE visits_visit_partitioned
+    RENAME CONSTRAINT visits_visit_pkey TO visits_visit_partitioned_pkey;
+{DROP_VISIT_INDEXES_SQL}
+CREATE TABLE visits_visit (
+    id uuid NOT NULL,
+    apartment_id uuid NULL,
+    user_id integer NOT NULL,
+    date_time timestamp with time zone NOT NULL,
+    state varchar NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    CONSTRAINT visits_visit_pkey PRIMARY KEY (id),{VISIT_CONSTRAINTS_SQL});
+{VISIT_INDEXES_SQL}
+INSERT INTO visits_visit (id, apartment_id, user_id, date_time, state, updated_at)
+SELECT id, apartment_id, user_id, date_time, state, updated_at
+FROM visits_visit_partitioned;
+DROP TABLE visits_visit_partitioned;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("visits", "0004_visit_updated_at"),
+    ]
+
+    operations = [
+        PostgresOnly(migrations.RunSQL(PARTITION_VISIT_SQL, UNPARTITION_VISIT_SQL)),
+    ]
@@ -6,8 +6,30 @@ from visits.choices import VISIT_STATES
 
 
 class Visit(models.Model):
+    """
+    On PostgreSQL the table is range partitioned by month of ``date_time``,
+    see visits.partitions; queries filtering on it only scan those months.
+
+    The partition key must be part of the table's primary key, which is
+    therefore ``(id, date_time)``: the database does not enforce that ``id``
+    alone is unique. Django still treats ``id`` as the primary key, and only
+    the random UUID default keeps it unique, so ids must never be reused.
+    """
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4)
     apartment = models.ForeignKey(Apartment, on_delete=models.CASCADE, null=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     date_time = models.DateTimeField()
     state = models.CharField(choices=VISIT_STATES, default="PENDING")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "date_time", "id"], name="visit_user_date_time_idx"
+            ),
+            models.Index(
+                fields=["apartment", "date_time", "id"],
+                name="visit_apartment_date_time_idx",
+            ),
+        ]
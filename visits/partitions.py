@@ -0,0 +1,125 @@
+from datetime import date, datetime, timezone
+
+from django.db import connection, transaction
+
+VISIT_TABLE = "visits_visit"
+VISIT_PARTITION_PREFIX = f"{VISIT_TABLE}_p"
+VISIT_DEFAULT_PARTITION = f"{VISIT_TABLE}_default"
+VISIT_PARTITION_MONTHS_AHEAD = 3
+
+
+def is_visit_table_partitioned() -> bool:
+    """
+    Whether Visit is stored in range partitions, which migration 0005 only
+    sets up on PostgreSQL.
+    """
+    return connection.vendor == "postgresql"
+
+
+def list_visit_partitions() -> list[str]:
+    """Names of the monthly partitions attached to the Visit table, oldest first."""
+    if not is_visit_table_partitioned():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s AND child.relname LIKE %s
+            ORDER BY child.relname
+            """,
+            [VISIT_TABLE, VISIT_PARTITION_PREFIX.replace("_", "\\_") + "%"],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_visit_partitions(
+    months_ahead: int = VISIT_PARTITION_MONTHS_AHEAD, start: date | None = None
+) -> list[str]:
+    """
+    Create the monthly partitions from ``start``'s month, the current month by
+    default, to ``months_ahead`` months later. Existing ones are left alone.
+
+    Each month is created in its own transaction, or savepoint when called in
+    one, so an error only loses that month. Visits of a month that reached the
+    default partition before the month was created are moved into it.
+    """
+    if not is_visit_table_partitioned():
+        return []
+    month = _get_month(start or datetime.now(timezone.utc).date())
+    existing = set(list_visit_partitions())
+    created = []
+    for _ in range(months_ahead + 1):
+        next_month = _add_month(month)
+        name = get_visit_partition_name(month)
+        if name not in existing:
+            _create_visit_partition(name, _get_bound(month), _get_bound(next_month))
+            created.append(name)
+        month = next_month
+    return created
+
+
+def detach_visit_partitions(before: date, drop: bool = False) -> list[str]:
+    """
+    Detach the monthly partitions of the months before ``before``'s month.
+
+    Detaching only changes the catalog, whatever the partition's size; the
+    visits stay in a standalone table of the same name unless ``drop`` is set.
+    """
+    if not is_visit_table_partitioned():
+        return []
+    last_name = get_visit_partition_name(_get_month(before))
+    detached = [name for name in list_visit_partitions() if name < last_name]
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name in detached:
+            cursor.execute(
+                f"ALTER TABLE {connection.ops.quote_name(VISIT_TABLE)} "
+                f"DETACH PARTITION {connection.ops.quote_name(name)}"
+            )
+            if drop:
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+    return detached
+
+
+def _create_visit_partition(name: str, start: datetime, end: datetime) -> None:
+    # PostgreSQL refuses to create a partition while the default partition
+    # holds rows of its range, so those rows are parked in a temporary table
+    # and inserted back once the partition exists.
+    table = connection.ops.quote_name(VISIT_TABLE)
+    default = connection.ops.quote_name(VISIT_DEFAULT_PARTITION)
+    moved = connection.ops.quote_name(f"{name}_moved")
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMPORARY TABLE {moved} (LIKE {table})")
+        cursor.execute(
+            f"WITH rows AS (DELETE FROM {default} "
+            "WHERE date_time >= %s AND date_time < %s RETURNING *) "
+            f"INSERT INTO {moved} SELECT * FROM rows",
+            [start, end],
+        )
+        cursor.execute(
+            f"CREATE TABLE {connection.ops.quote_name(name)} PARTITION OF {table} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+        cursor.execute(f"INSERT INTO {table} SELECT * FROM {moved}")
+        cursor.execute(f"DROP TABLE {moved}")
+
+
+def get_visit_partition_name(month: date) -> str:
+    return f"{VISIT_PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def _get_month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _add_month(month: date) -> date:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def _get_bound(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
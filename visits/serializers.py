@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from livehere.rows import RowSerializer
 from visits.models import Visit
 from visits.validators import validate_apartment_visit_date
 
@@ -12,3 +13,7 @@ class VisitOutputSerializer(serializers.ModelSerializer):
         model = Visit
         fields = ["id", "apartment", "date_time", "state"]
         read_only = True
+
+
+class VisitOutputRowSerializer(RowSerializer):
+    serializer_class = VisitOutputSerializer
@@ -0,0 +1,141 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import ProgrammingError, connection
+
+from visits.models import Visit
+from visits.partitions import (
+    VISIT_DEFAULT_PARTITION,
+    create_visit_partitions,
+    detach_visit_partitions,
+    get_visit_partition_name,
+    list_visit_partitions,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user() -> User:
+    user = User.objects.create(username="testuser123", password="testpassword123")
+    return user
+
+
+def create_visit(user: User, date_time: datetime) -> Visit:
+    return Visit.objects.create(user=user, date_time=date_time)
+
+
+def get_visit_partition(visit: Visit) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text FROM visits_visit WHERE id = %s",
+            [visit.id],
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestCreateVisitPartitions:
+    def test_create_visit_partitions_create_missing_months_only(self):
+        created = create_visit_partitions(months_ahead=2, start=date(2040, 11, 15))
+
+        assert created == [
+            "visits_visit_p2040_11",
+            "visits_visit_p2040_12",
+            "visits_visit_p2041_01",
+        ]
+        assert set(created) <= set(list_visit_partitions())
+        assert create_visit_partitions(months_ahead=2, start=date(2040, 11, 1)) == []
+
+    def test_create_visit_partitions_route_visits_to_their_month(self, user: User):
+        create_visit_partitions(months_ahead=0, start=date(2040, 1, 1))
+
+        visit = create_visit(user, datetime(2040, 1, 31, 23, 59, tzinfo=timezone.utc))
+
+        assert get_visit_partition(visit) == "visits_visit_p2040_01"
+
+    def test_create_visit_partitions_move_visits_out_of_default_partition(
+        self, user: User
+    ):
+        visit = create_visit(user, datetime(2040, 3, 10, tzinfo=timezone.utc))
+        other = create_visit(user, datetime(2040, 4, 10, tzinfo=timezone.utc))
+        assert get_visit_partition(visit) == VISIT_DEFAULT_PARTITION
+
+        create_visit_partitions(months_ahead=0, start=date(2040, 3, 1))
+
+        assert get_visit_partition(visit) == "visits_visit_p2040_03"
+        assert get_visit_partition(other) == VISIT_DEFAULT_PARTITION
+        assert Visit.objects.filter(id__in=[visit.id, other.id]).count() == 2
+
+    def test_create_visit_partitions_keep_months_created_before_an_error(self):
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE visits_visit_p2040_06 (id integer)")
+
+        with pytest.raises(ProgrammingError):
+            create_visit_partitions(months_ahead=2, start=date(2040, 5, 1))
+
+        partitions = list_visit_partitions()
+        assert "visits_visit_p2040_05" in partitions
+        assert "visits_visit_p2040_06" not in partitions
+
+    def test_list_visit_partitions_match_prefix_literally(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE visits_visitxp2040_07 PARTITION OF visits_visit "
+                "FOR VALUES FROM ('2040-07-01') TO ('2040-08-01')"
+            )
+
+        assert "visits_visitxp2040_07" not in list_visit_partitions()
+
+    def test_create_visit_partitions_command_report_created_partitions(
+        self, capsys: pytest.CaptureFixture
+    ):
+        call_command("create_visit_partitions", months=0)
+
+        assert "Created" in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestDetachVisitPartitions:
+    def test_detach_visit_partitions_detach_months_before_date_only(self, user: User):
+        create_visit_partitions(months_ahead=2, start=date(2040, 1, 1))
+        old_visit = create_visit(user, datetime(2040, 1, 10, tzinfo=timezone.utc))
+        kept_visit = create_visit(user, datetime(2040, 3, 10, tzinfo=timezone.utc))
+
+        detached = detach_visit_partitions(before=date(2040, 3, 1))
+
+        assert "visits_visit_p2040_01" in detached
+        assert "visits_visit_p2040_02" in detached
+        assert "visits_visit_p2040_03" not in detached
+        assert set(detached).isdisjoint(list_visit_partitions())
+        assert list(Visit.objects.values_list("id", flat=True)) == [kept_visit.id]
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id FROM visits_visit_p2040_01")
+            assert cursor.fetchall() == [(old_visit.id,)]
+
+    def test_detach_visit_partitions_drop_detached_tables(self):
+        create_visit_partitions(months_ahead=0, start=date(2040, 1, 1))
+
+        detach_visit_partitions(before=date(2040, 2, 1), drop=True)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('visits_visit_p2040_01')")
+            assert cursor.fetchone() == (None,)
+
+
+@pytest.mark.django_db
+class TestVisitPartitionPruning:
+    def test_visit_query_on_date_range_scan_its_months_only(self):
+        create_visit_partitions(months_ahead=2, start=date(2040, 1, 1))
+
+        plan = Visit.objects.filter(
+            date_time__gte=datetime(2040, 2, 1, tzinfo=timezone.utc),
+            date_time__lt=datetime(2040, 3, 1, tzinfo=timezone.utc),
+        ).explain()
+
+        assert get_visit_partition_name(date(2040, 2, 1)) in plan
+        assert get_visit_partition_name(date(2040, 1, 1)) not in plan
+        assert get_visit_partition_name(date(2040, 3, 1)) not in plan
+        assert VISIT_DEFAULT_PARTITION not in plan
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from visits.models import Visit
+
+User = get_user_model()
+
+
+@pytest.fixture
+def authenticated_user() -> User:
+    user = User.objects.create_user(username="testuser123", password="testpassword123")
+    return user
+
+
+@pytest.fixture
+def api_client(authenticated_user: User) -> APIClient:
+    client = APIClient()
+    client.force_login(authenticated_user)
+    return client
+
+
+@pytest.fixture
+def visit(authenticated_user: User) -> Visit:
+    return Visit.objects.create(
+        user=authenticated_user,
+        date_time=datetime(2024, 1, 10, 12, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.django_db
+class TestTenantVisitViewConditionalRequests:
+    def test_tenant_visit_view_return_304_until_visit_changes(
+        self, api_client: APIClient, visit: Visit
+    ):
+        url = reverse("get_tenant_apartment_visits")
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        visit.state = "ACCEPTED"
+        visit.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
@@ -4,9 +4,20 @@ from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.response import Response
 from rest_framework import status, generics
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.request import Request
 from rest_framework.views import APIView
-from visits.serializers import VisitInputSerializer, VisitOutputSerializer
+from livehere.async_views import AsyncAPIView
+from livehere.conditional import AsyncConditionalListMixin, ConditionalListMixin
+from livehere.exports import ExportView
+from livehere.pagination import KeysetPagination
+from livehere.renderers import ORJSONRenderer
+from livehere.rows import AsyncValuesListMixin, ValuesListMixin
+from visits.serializers import (
+    VisitInputSerializer,
+    VisitOutputSerializer,
+    VisitOutputRowSerializer,
+)
 from visits.services import (
     create_apartment_visit,
     get_owner_apartments_visits,
@@ -28,8 +39,12 @@ class CreateVisitView(APIView):
         return Response(status=status.HTTP_201_CREATED)
 
 
-class OwnerVisitView(generics.ListAPIView):
+class OwnerVisitView(ValuesListMixin, generics.ListAPIView):
     serializer_class = VisitOutputSerializer
+    row_serializer_class = VisitOutputRowSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("date_time", "id")
     filter_backends = [DjangoFilterBackend]
     filterset_fields = {
         "date_time": ["gte", "lte"],
@@ -41,8 +56,12 @@ class OwnerVisitView(generics.ListAPIView):
         return get_owner_apartments_visits(owner_id=self.request.user.id)
 
 
-class TenantVisitView(generics.ListAPIView):
+class TenantVisitView(ConditionalListMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = VisitOutputSerializer
+    row_serializer_class = VisitOutputRowSerializer
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("date_time", "id")
     filter_backends = [DjangoFilterBackend]
     filterset_fields = {
         "date_time": ["gte", "lte"],
@@ -52,3 +71,18 @@ class TenantVisitView(generics.ListAPIView):
 
     def get_queryset(self):
         return get_tenant_apartments_visits(tenant_id=self.request.user.id)
+
+
+class AsyncTenantVisitView(
+    AsyncConditionalListMixin, AsyncValuesListMixin, AsyncAPIView, TenantVisitView
+):
+    pass
+
+
+class OwnerVisitExportView(ExportView):
+    row_serializer_class = VisitOutputRowSerializer
+    export_ordering = ("date_time", "id")
+    export_filename = "visits"
+
+    def get_queryset(self) -> QuerySet:
+        return get_owner_apartments_visits(owner_id=self.request.user.id)